@@ -0,0 +1,273 @@
+"""
+Alertas de prazo das tarefas do quadro Kanban.
+"""
+import heapq
+import queue
+import threading
+from datetime import datetime, timedelta
+
+from instrumentation import timed
+
+class TaskAlert: # Nova tarefa implementada para alerta de prazo
+    """
+    Representa a classe que gera o alerta em caso da tarefa(s) estar(em) a aproximar-se do deadline.
+
+    A verificação corre numa thread própria sobre o quadro em memória, para que quadros grandes
+    ou notificações lentas não bloqueiem a interface. O que tiver de ser mostrado pelo Tk
+    (por exemplo, o aviso quando a notificação nativa falha) é colocado na fila 'results'.
+
+    Pode vigiar vários quadros (add_board). Os prazos ficam num índice leve partilhado
+    ((quadro, id) -> prazo e título), que se mantém quando um quadro sai da memória
+    (detach_board) ou é só lido para recolher os prazos (index_tasks). O quadro indicado ao criar
+    o alerta fica sem nome ("") e deixa de ser vigiado quando é registado um quadro com nome.
+    """
+    INACTIVE_COLUMNS = ("Completo", "Arquivado")  # Tarefas nestas colunas não geram alertas
+
+    def __init__(self, board, days_before_alert=10, interval=3600): # Adiciona um novo parâmetro para definir os dias antes do alerta
+        self.board = board
+        self.days_before_alert = days_before_alert
+        self.interval = interval  # Tempo máximo (segundos) entre verificações
+        self.results = queue.Queue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker = None
+
+        # Fila de prioridade (data do próximo alerta, (quadro, id), prazo), mantida à medida que as tarefas mudam
+        self._lock = threading.Lock()
+        self._heap = []
+        self._boards = {}     # nome -> (quadro, observador) dos quadros vigiados em memória
+        self._deadlines = {}  # (quadro, id) -> prazo atualmente agendado (entradas do heap com outro prazo estão obsoletas)
+        self._titles = {}     # (quadro, id) -> título, para o aviso não depender do quadro estar em memória
+        self._delivered = {}  # (quadro, id) -> (prazo, último dia em que o alerta foi entregue)
+        self._names = set()   # Nomes dos quadros indexados (o nome só aparece no alerta se houver mais do que um)
+        self.rebuild()
+
+    def start(self):
+        """
+        Inicia a thread de verificação de prazos.
+        """
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="TaskAlert", daemon=True)
+            self._worker.start()
+
+    def request_check(self):
+        """
+        Pede uma verificação imediata (por exemplo, depois de um prazo ser alterado).
+        """
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.check_deadlines()
+            except Exception as e:
+                print(f"Erro na verificação: {e}") # Mensagem de erro || Usado para debug e testes
+            self._wake.wait(self.seconds_until_next_alert())
+            self._wake.clear()
+
+    # Adiciona um novo método para reconstruir o agendamento a partir do quadro
+    def rebuild(self, board=None):
+        """
+        Reconstrói a fila de alertas a partir de todas as tarefas do quadro (ao carregar um quadro).
+        """
+        self.remove_board("")  # Sem deixar o quadro anterior subscrito, nem os seus prazos no índice
+        if board is not None:
+            self.board = board
+        self.add_board("", self.board)
+
+    # Adiciona um novo método para vigiar os prazos de um quadro em memória
+    def add_board(self, name, board):
+        """
+        Passa a vigiar o quadro 'name', substituindo os prazos que estavam indexados para ele.
+        """
+        if name and "" in self._boards:
+            self.remove_board("")  # O quadro sem nome era só o quadro inicial
+        listener = lambda event: self.on_board_event(event, name)
+        with self._lock:
+            self._names.add(name)
+            previous = self._boards.pop(name, None)
+            if previous is not None:
+                previous[0].unsubscribe(previous[1])
+            board.subscribe(listener)
+            self._boards[name] = (board, listener)
+            self._index(name, board.tasks.values())
+        self.request_check()
+
+    # Adiciona um novo método para deixar de observar um quadro que sai da memória
+    def detach_board(self, name):
+        """
+        Deixa de observar o quadro, mas mantém os seus prazos no índice (continuam a gerar alertas).
+        """
+        with self._lock:
+            previous = self._boards.pop(name, None)
+        if previous is not None:
+            previous[0].unsubscribe(previous[1])
+
+    # Adiciona um novo método para esquecer os prazos de um quadro fechado
+    def remove_board(self, name):
+        self.detach_board(name)
+        with self._lock:
+            self._forget(name)
+            self._names.discard(name)
+
+    # Adiciona um novo método para indexar os prazos de um quadro que não está em memória
+    def index_tasks(self, name, tasks):
+        """
+        Indexa os prazos das tarefas lidas de um quadro que não está carregado.
+        Se entretanto o quadro foi carregado, os dados em memória prevalecem.
+        """
+        with self._lock:
+            if name in self._boards:
+                return
+            self._names.add(name)
+            self._index(name, tasks)
+        self.request_check()
+
+    def _index(self, name, tasks):
+        self._forget(name)
+        for task in tasks:
+            self._schedule(name, task, push=False)
+        heapq.heapify(self._heap)
+
+    def _forget(self, name):
+        self._heap = [entry for entry in self._heap if entry[1][0] != name]
+        heapq.heapify(self._heap)
+        for key in [key for key in self._deadlines if key[0] == name]:
+            del self._deadlines[key]
+        for key in [key for key in self._titles if key[0] == name]:
+            del self._titles[key]
+
+    # Adiciona um novo método para reagir às alterações do quadro
+    def on_board_event(self, event, board_name=""):
+        """
+        Mantém o agendamento atualizado quando uma tarefa é criada, editada, movida ou removida.
+        """
+        for event in event.flatten():
+            if event.kind == "remove":
+                self.untrack(event.task.id, board_name)
+            elif event.kind != "update" or "deadline" in event.changes or "title" in event.changes:
+                self.track(event.task, board_name)
+
+    # Adiciona um novo método para agendar (ou reagendar) o alerta de uma tarefa
+    def track(self, task, board_name=""):
+        """
+        Atualiza o agendamento de uma tarefa que foi criada, editada ou movida.
+        """
+        with self._lock:
+            self._schedule(board_name, task)
+        self.request_check()
+
+    # Adiciona um novo método para deixar de vigiar uma tarefa
+    def untrack(self, task_id, board_name=""):
+        """
+        Remove o agendamento de uma tarefa removida do quadro.
+        """
+        key = (board_name, task_id)
+        with self._lock:
+            self._deadlines.pop(key, None)
+            self._titles.pop(key, None)
+            self._delivered.pop(key, None)
+
+    def _schedule(self, board_name, task, push=True):
+        key = (board_name, task.id)
+        deadline_date = task.get_deadline_date() if task.status not in self.INACTIVE_COLUMNS else None
+        if deadline_date is None:
+            # Concluída ou sem prazo: se voltar a ter prazo, o alerta é entregue de novo
+            self._deadlines.pop(key, None)
+            self._titles.pop(key, None)
+            self._delivered.pop(key, None)
+            return
+        self._titles[key] = task.title
+        if self._deadlines.get(key) == deadline_date:
+            return  # Já está agendado com este prazo
+
+        alert_date = deadline_date - timedelta(days=self.days_before_alert)
+        delivered = self._delivered.get(key)
+        if delivered and delivered[0] == deadline_date:
+            alert_date = max(alert_date, delivered[1] + timedelta(days=1))  # Não repete o alerta já entregue hoje
+        if alert_date > deadline_date:
+            self._deadlines.pop(key, None)
+            return
+
+        self._deadlines[key] = deadline_date
+        entry = (alert_date, key, deadline_date)
+        if push:
+            heapq.heappush(self._heap, entry)
+        else:
+            self._heap.append(entry)
+
+    def seconds_until_next_alert(self):
+        """
+        Segundos até ao próximo limiar de alerta (limitado por 'interval').
+        """
+        with self._lock:
+            if not self._heap:
+                return self.interval
+            next_alert = datetime.combine(self._heap[0][0], datetime.min.time())
+        return min(max((next_alert - datetime.now()).total_seconds(), 0), self.interval)
+
+    # Adiciona um novo método para obter as tarefas próximas do prazo
+    def due_tasks(self, today=None):
+        """
+        Devolve (título, dias que faltam para o prazo, nome do quadro) das tarefas cujo alerta
+        é devido hoje. O nome do quadro é "" se só houver um quadro. Só são visitadas as entradas
+        do topo da fila que já passaram o limiar.
+        """
+        today = today or datetime.today().date()  # Converte para 'date' corretamente
+        due = []
+        with self._lock:
+            several = len(self._names) > 1
+            while self._heap and self._heap[0][0] <= today:
+                alert_date, key, deadline_date = heapq.heappop(self._heap)
+                if self._deadlines.get(key) != deadline_date:
+                    continue  # Entrada obsoleta: a tarefa foi editada, concluída ou removida
+                if deadline_date < today:
+                    self._deadlines.pop(key, None)
+                    continue
+                due.append((self._titles[key], (deadline_date - today).days, key[0] if several else ""))
+                self._delivered[key] = (deadline_date, today)
+                if deadline_date > today:
+                    heapq.heappush(self._heap, (today + timedelta(days=1), key, deadline_date))
+                else:
+                    self._deadlines.pop(key, None)
+        return due
+
+    # Adiciona um novo método para verificar os prazos das tarefas
+    @timed()
+    def check_deadlines(self):
+        """
+        Entrega os alertas das tarefas cujo limiar de prazo já foi atingido.
+        """
+        for title, days_remaining, board_name in self.due_tasks():
+            if board_name:
+                title = f"{title} ({board_name})"
+            print(f"🚨 ALERTA: '{title}' está prestes a vencer!")
+            self.show_alert(title, days_remaining)
+
+    # Adiciona um novo método para exibir o alerta
+    def show_alert(self, task_title, days_remaining):
+        """
+        Exibe um alerta informando quantos dias faltam para o prazo da tarefa.
+        """
+        message = f"A tarefa '{task_title}' está prestes a vencer! Faltam {days_remaining} dia(s)."
+
+        print(f"🔔 Tentando exibir notificação: {task_title} ({days_remaining} dias restantes)")
+
+        # Notificação nativa do Windows
+        try:
+            from plyer import notification # Biblioteca para notificações // pip install plyer (só é importada quando é preciso)
+            notification.notify(
+                title="Alerta de Prazo",
+                message=message,
+                app_name="Kanban Board",
+                timeout=10  # Duração da notificação em segundos
+            )
+            print("✅ Notificação enviada com sucesso.") # Confirmação de envio || Usado para debug e testes
+        except Exception as e:
+            print(f"❌ Erro ao exibir notificação: {e}") # Mensagem de erro || Usado para debug e testes
+            self.results.put(("Alerta de Prazo", message))  # O messagebox tem de ser mostrado pela thread do Tk
+        
@@ -0,0 +1,482 @@
+"""
+API HTTP/JSON local do quadro Kanban (asyncio), para scripts e automatismos.
+
+    GET    /tasks?status=&priority=&text=&limit=&offset=   Lista as tarefas
+    GET    /tasks/<id>                                      Uma tarefa
+    POST   /tasks                                           Cria uma tarefa (campos do JSON do quadro)
+    PATCH  /tasks/<id>                                      Altera Titulo, Descrição, Prioridade, deadline ou Estado
+    POST   /tasks/<id>/move    {"to": coluna, "before": id} Move (ou reordena) a tarefa
+    DELETE /tasks/<id>                                      Remove a tarefa
+    GET    /events                                          Alterações do quadro (server-sent events)
+
+Pode correr dentro da aplicação (main.py --api-port / --api-socket) ou sozinha, sem Tk:
+
+    python api.py --board kanban_board.json --port 8765
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+from board import Board
+from cli import check_priority, import_record, parse_date
+from metrics import FlowMetrics
+from search import tokenize
+from storage import BoardStorage, open_storage
+
+STATUS_TEXT = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+FIELD_NAMES = {"Titulo": "title", "Descrição": "description", "Prioridade": "priority", "deadline": "deadline"}
+
+class APIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class BoardAPI:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio, com uma ligação por cliente e sem bibliotecas externas.
+
+    O quadro só é lido e alterado na thread que o usa: 'dispatch' recebe uma função sem argumentos
+    e tem de a executar nessa thread (na aplicação, é a fila lida pelo ciclo do Tk). Sem 'dispatch',
+    o quadro pertence ao próprio ciclo do asyncio (modo sem interface). Os clientes de /events
+    recebem cada alteração do quadro como o registo gravado no journal (ver BoardStorage.record_for);
+    um cliente que não acompanhe (mais de MAX_QUEUED alterações por enviar) é desligado.
+    """
+    MAX_HEADER = 64 * 1024
+    MAX_BODY = 1024 * 1024
+    MAX_QUEUED = 1000
+    KEEPALIVE = 15  # Segundos entre comentários de keep-alive no /events
+    DEFAULT_LIMIT = 1000
+
+    def __init__(self, board, dispatch=None):
+        self.board = None
+        self.dispatch = dispatch
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.subscribers = set()  # asyncio.Queue de cada cliente de /events
+        self.set_board(board)
+
+    # Adiciona um novo método para passar a servir outro quadro (na thread do quadro)
+    def set_board(self, board):
+        if self.board is not None:
+            self.board.unsubscribe(self.on_board_event)
+        self.board = board
+        board.subscribe(self.on_board_event)
+
+    def on_board_event(self, event):
+        if not self.subscribers or self.loop is None:
+            return
+        data = json.dumps(BoardStorage.record_for(event), ensure_ascii=False)
+        self.loop.call_soon_threadsafe(self._broadcast, data)
+
+    def _broadcast(self, data):
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.put_nowait(data)
+            except asyncio.QueueFull:
+                self.subscribers.discard(subscriber)
+                subscriber.get_nowait()  # Liberta um lugar: o cliente já não vai receber todas as alterações
+                subscriber.put_nowait(None)  # Pede ao cliente lento para terminar
+
+    async def run_on_board(self, func):
+        """
+        Executa func() na thread do quadro e devolve o resultado.
+        """
+        if self.dispatch is None:
+            return func()
+        future = self.loop.create_future()
+
+        def run():
+            try:
+                result, error = func(), None
+            except Exception as e:
+                result, error = None, e
+            self.loop.call_soon_threadsafe(self._resolve, future, result, error)
+
+        self.dispatch(run)
+        return await future
+
+    @staticmethod
+    def _resolve(future, result, error):
+        if future.done():
+            return  # O cliente desligou-se entretanto
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    # Adiciona um novo método para iniciar o servidor no ciclo do asyncio atual
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, socket_path: str = None):
+        self.loop = asyncio.get_running_loop()
+        if socket_path:
+            self.server = await asyncio.start_unix_server(self.handle_client, socket_path)
+            print(f"🌐 API do quadro em {socket_path}")
+        else:
+            self.server = await asyncio.start_server(self.handle_client, host, port)
+            print(f"🌐 API do quadro em http://{host}:{self.server.sockets[0].getsockname()[1]}")
+
+    # Adiciona um novo método para correr o servidor numa thread separada (ao lado do Tk)
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 8765, socket_path: str = None):
+        started = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start(host, port, socket_path))
+            except Exception as e:
+                errors.append(e)
+                started.set()
+                return
+            started.set()
+            loop.run_forever()
+            loop.close()
+
+        self.thread = threading.Thread(target=run, name="BoardAPI", daemon=True)
+        self.thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+
+    def stop(self):
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        def shutdown():
+            if self.server is not None:
+                self.server.close()
+            for subscriber in list(self.subscribers):
+                subscriber.put_nowait(None)
+            self.loop.stop()
+
+        if self.thread is not None:
+            self.loop.call_soon_threadsafe(shutdown)
+            self.thread.join(timeout=2)
+        elif self.server is not None:
+            self.server.close()
+
+    async def handle_client(self, reader, writer):
+        """
+        Atende os pedidos de uma ligação (mantida aberta entre pedidos, como no HTTP/1.1).
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, 413, {"erro": "Cabeçalhos demasiado grandes"})
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if len(head) > self.MAX_HEADER:
+                    await self.send(writer, 413, {"erro": "Cabeçalhos demasiado grandes"})
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self.send(writer, 400, {"erro": "Pedido inválido"})
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.send(writer, 400, {"erro": "Content-Length inválido"})
+                    break
+                if length > self.MAX_BODY:
+                    await self.send(writer, 413, {"erro": "Pedido demasiado grande"})
+                    break
+                body = await reader.readexactly(length) if length else b""
+                url = urlsplit(target)
+                if method == "GET" and url.path == "/events":
+                    await self.stream_events(writer)
+                    break
+                try:
+                    status, payload = await self.route(method, url.path, parse_qs(url.query), body)
+                except APIError as e:
+                    status, payload = e.status, {"erro": str(e)}
+                except Exception as e:
+                    print(f"❌ Erro na API: {e}")
+                    status, payload = 500, {"erro": str(e)}
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self.send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, payload, keep_alive=False):
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    # Adiciona um novo método para enviar as alterações do quadro (server-sent events)
+    async def stream_events(self, writer):
+        subscriber = asyncio.Queue(self.MAX_QUEUED)
+        self.subscribers.add(subscriber)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+                         b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n")
+            await writer.drain()
+            while True:
+                try:
+                    data = await asyncio.wait_for(subscriber.get(), self.KEEPALIVE)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                else:
+                    if data is None:
+                        break
+                    writer.write(f"event: change\ndata: {data}\n\n".encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+
+    async def route(self, method, path, query, body):
+        parts = [part for part in path.split("/") if part]
+        if not parts or parts[0] != "tasks" or len(parts) > 3:
+            raise APIError(404, f"Caminho desconhecido: {path}")
+        data = self.parse_body(body) if method in ("POST", "PATCH") else None
+        if len(parts) == 1:
+            if method == "GET":
+                return 200, await self.run_on_board(lambda: self.list_tasks(query))
+            if method == "POST":
+                record = self.create_record(data)
+                return 201, await self.run_on_board(lambda: self.add_task(record))
+        elif len(parts) == 2:
+            task_id = parts[1]
+            if method == "GET":
+                return 200, await self.run_on_board(lambda: self.task_data(task_id))
+            if method == "PATCH":
+                fields, column_name = self.update_fields(data)
+                return 200, await self.run_on_board(lambda: self.update_task(task_id, fields, column_name))
+            if method == "DELETE":
+                await self.run_on_board(lambda: self.remove_task(task_id))
+                return 204, None
+        elif parts[2] == "move" and method == "POST":
+            if not isinstance(data.get("to"), str):
+                raise APIError(400, "Falta a coluna de destino ('to').")
+            if not isinstance(data.get("before"), (str, type(None))):
+                raise APIError(400, "O campo 'before' tem de ser o id de uma tarefa (ou null).")
+            return 200, await self.run_on_board(lambda: self.move_task(parts[1], data["to"], data.get("before")))
+        raise APIError(405, f"Método {method} não suportado em {path}")
+
+    @staticmethod
+    def parse_body(body):
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise APIError(400, "O corpo do pedido não é JSON válido.")
+        if not isinstance(data, dict):
+            raise APIError(400, "O corpo do pedido tem de ser um objeto JSON.")
+        return data
+
+    @staticmethod
+    def check_values(data):
+        """
+        Verifica os tipos e valores dos campos de uma tarefa recebida (antes de chegar ao quadro).
+        """
+        for key in ("Titulo", "Descrição", "deadline", "Estado", "id"):
+            if data.get(key) is not None and not isinstance(data[key], str):
+                raise APIError(400, f"O campo '{key}' tem de ser texto.")
+        if "Titulo" in data and not (data["Titulo"] or "").strip():
+            raise APIError(400, "O título ('Titulo') não pode ficar vazio.")
+        if data.get("Prioridade") is not None:
+            try:
+                check_priority(data["Prioridade"])
+            except ValueError as e:
+                raise APIError(400, str(e))
+
+    @staticmethod
+    def create_record(data):
+        BoardAPI.check_values(data)
+        try:
+            return import_record(data, "Para fazer")
+        except (ValueError, TypeError, AttributeError) as e:
+            raise APIError(400, str(e))
+
+    @staticmethod
+    def update_fields(data):
+        BoardAPI.check_values(data)
+        if "Prioridade" in data and data["Prioridade"] is None:
+            raise APIError(400, "A prioridade não pode ficar vazia.")
+        fields = {}
+        for key, value in data.items():
+            if key in FIELD_NAMES:
+                if key == "deadline" and value:
+                    try:
+                        value = parse_date(value)
+                    except (ValueError, TypeError, AttributeError) as e:
+                        raise APIError(400, str(e))
+                if key == "Descrição" and value is None:
+                    value = ""
+                fields[FIELD_NAMES[key]] = value
+            elif key != "Estado":
+                raise APIError(400, f"Campo desconhecido: {key}")
+        return fields, data.get("Estado")
+
+    # As funções seguintes correm na thread do quadro (ver run_on_board)
+
+    def list_tasks(self, query):
+        status = query.get("status", [None])[0]
+        priority = query.get("priority", [None])[0]
+        terms = tokenize(query.get("text", [""])[0])
+        try:
+            limit = int(query.get("limit", [self.DEFAULT_LIMIT])[0])
+            offset = int(query.get("offset", [0])[0])
+        except ValueError:
+            raise APIError(400, "'limit' e 'offset' têm de ser números.")
+        columns = [status] if status else list(self.board.columns)
+        found, skipped = [], 0
+        for column_name in columns:
+            if column_name not in self.board.columns:
+                raise APIError(400, f"Coluna desconhecida: {column_name}")
+            for task in self.board.columns[column_name].tasks:
+                if priority and task.priority != priority:
+                    continue
+                if terms:
+                    words = tokenize(f"{task.title} {task.description}")
+                    if not all(any(word.startswith(term) for word in words) for term in terms):
+                        continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                found.append(task.to_dict())
+                if len(found) >= limit:
+                    return found
+        return found
+
+    def get_task(self, task_id):
+        task = self.board.get_task(task_id)
+        if task is None:
+            raise APIError(404, f"Tarefa não encontrada: {task_id}")
+        return task
+
+    def task_data(self, task_id):
+        return self.get_task(task_id).to_dict()
+
+    def add_task(self, record):
+        task_id = record["task"]["id"]
+        if task_id in self.board.tasks:
+            raise APIError(400, f"Já existe uma tarefa com o id {task_id}")
+        BoardStorage.apply(self.board, record)
+        return self.task_data(task_id)
+
+    def update_task(self, task_id, fields, column_name):
+        self.get_task(task_id)
+        if column_name is not None and column_name not in self.board.columns:
+            raise APIError(400, f"Coluna desconhecida: {column_name}")
+        with self.board.batch():
+            self.board.update_task(task_id, **fields)
+            if column_name is not None and column_name != self.board.tasks[task_id].status:
+                self.board.move_task(task_id, column_name)
+        return self.task_data(task_id)
+
+    def move_task(self, task_id, column_name, before):
+        self.get_task(task_id)
+        if column_name not in self.board.columns:
+            raise APIError(400, f"Coluna desconhecida: {column_name}")
+        if before == task_id:
+            raise APIError(400, "'before' não pode ser a própria tarefa.")
+        if before is not None and before not in self.board.columns[column_name].tasks:
+            raise APIError(400, f"A tarefa '{before}' não está na coluna {column_name}.")
+        self.board.move_task(task_id, column_name, before)
+        return self.task_data(task_id)
+
+    def remove_task(self, task_id):
+        self.get_task(task_id)
+        self.board.remove_task(task_id)
+
+class HeadlessServer:
+    """
+    Serve um quadro sem interface gráfica: carrega-o, grava as alterações feitas pela API e aplica as
+    alterações gravadas por outras instâncias (ver BoardStorage.watch), tudo no ciclo do asyncio.
+    """
+    REMOTE_POLL = 0.5
+    METRICS_SAVE_INTERVAL = 60
+
+    def __init__(self, board_path: str):
+        self.storage = open_storage(board_path)
+        self.metrics = FlowMetrics.for_board(board_path)
+        self.board = self.load()
+        self.api = BoardAPI(self.board)
+
+    def load(self):
+        try:
+            board = self.storage.load()
+        except FileNotFoundError:
+            board = Board()
+        board.subscribe(self.auto_save)
+        self.metrics.attach(board)
+        self.storage.watch()
+        return board
+
+    def auto_save(self, event):
+        self.storage.append(BoardStorage.record_for(event), BoardStorage.undo_record_for(event))
+        if self.storage.should_compact():
+            self.storage.compact(self.board)
+
+    async def apply_remote_changes(self):
+        loop = asyncio.get_running_loop()
+        metrics_saved = loop.time()
+        while True:
+            await asyncio.sleep(self.REMOTE_POLL)
+            if loop.time() - metrics_saved >= self.METRICS_SAVE_INTERVAL:
+                self.metrics.save()
+                metrics_saved = loop.time()
+            if self.storage.needs_reload:
+                print("🔄 O quadro foi alterado por outra instância: a carregar de novo.")
+                self.board.unsubscribe(self.auto_save)
+                self.board = self.load()
+                self.api.set_board(self.board)
+            else:
+                self.storage.apply_remote(self.board)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, socket_path: str = None):
+        await self.api.start(host, port, socket_path)
+        poller = asyncio.ensure_future(self.apply_remote_changes())
+        try:
+            async with self.api.server:
+                await self.api.server.serve_forever()
+        finally:
+            poller.cancel()
+            self.close()
+
+    def close(self):
+        self.metrics.save()
+        self.storage.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP do quadro Kanban (sem interface gráfica)")
+    parser.add_argument("--board", default="kanban_board.json", help="Ficheiro do quadro (.json ou .db)")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço (por omissão, só a própria máquina)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", metavar="CAMINHO", help="Usa um socket Unix em vez de TCP")
+    args = parser.parse_args(argv)
+    server = HeadlessServer(args.board)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        server.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Arquivo frio das tarefas arquivadas do quadro Kanban.
+"""
+import gzip
+import json
+import os
+from datetime import date, timedelta
+
+from board import Task
+from search import tokenize
+
+class TaskArchive:
+    """
+    Ficheiro comprimido (gzip), só de acréscimo, com as tarefas retiradas do quadro.
+
+    As tarefas da coluna "Arquivado" há mais de 'archive_after' dias (e, opcionalmente, as da coluna
+    "Completo" há mais de 'completed_after' dias) saem do quadro e passam para este ficheiro, para que o
+    snapshot, a memória e a interface só tenham as tarefas em uso. O arquivo só é lido quando é
+    consultado (tasks, search).
+
+    Cada acréscimo é um membro gzip novo com uma linha JSON por tarefa:
+    {"task": ..., "column": ..., "archived": "2025-01-31"}. Uma tarefa reposta no quadro deixa uma
+    linha {"restored": id}, que a esconde das leituras seguintes. Um acréscimo interrompido
+    (membro incompleto no fim do ficheiro) é ignorado.
+    """
+    def __init__(self, path: str, archive_after: int = 7, completed_after: int = None):
+        self.path = path
+        self.archive_after = archive_after
+        self.completed_after = completed_after
+
+    # Adiciona um novo método para obter o arquivo associado ao ficheiro de um quadro
+    @classmethod
+    def for_board(cls, board_path: str, **options):
+        """
+        O arquivo de "quadro.json" (ou "quadro.db") é "quadro.archive.jsonl.gz".
+        """
+        return cls(os.path.splitext(board_path)[0] + ".archive.jsonl.gz", **options)
+
+    # Adiciona um novo método para escolher as tarefas a arquivar
+    def candidates(self, board, today: date = None) -> list:
+        """
+        Devolve as tarefas do quadro que já devem sair para o arquivo.
+        Na coluna "Arquivado", uma tarefa sem data de entrada conhecida (gravada antes de existir
+        'status_since') é considerada antiga; na coluna "Completo" só é arquivada com data conhecida.
+        """
+        today = today or date.today()
+        tasks = []
+        if self.archive_after is not None:
+            limit = today - timedelta(days=self.archive_after)
+            tasks.extend(task for task in board.columns["Arquivado"].tasks
+                         if task.status_since is None or task.status_since <= limit)
+        if self.completed_after is not None:
+            limit = today - timedelta(days=self.completed_after)
+            tasks.extend(task for task in board.columns["Completo"].tasks
+                         if task.status_since is not None and task.status_since <= limit)
+        return tasks
+
+    def _append_lines(self, items):
+        """
+        Acrescenta um membro gzip com uma linha JSON por item e força a escrita para o disco.
+        """
+        with open(self.path, "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as file:
+                for item in items:
+                    file.write((json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+
+    # Adiciona um novo método para acrescentar tarefas ao arquivo
+    def append(self, entries, today: date = None):
+        """
+        Acrescenta ao arquivo as tarefas indicadas, como pares (tarefa em dicionário, coluna).
+        Pode correr numa thread separada (não toca no quadro).
+        """
+        archived = (today or date.today()).isoformat()
+        self._append_lines({"task": data, "column": column_name, "archived": archived}
+                           for data, column_name in entries)
+
+    # Adiciona um novo método para marcar tarefas como repostas no quadro
+    def restore(self, task_ids):
+        """
+        Esconde do arquivo as tarefas indicadas (porque voltaram ao quadro ou nunca chegaram a sair dele).
+        """
+        self._append_lines({"restored": task_id} for task_id in task_ids)
+
+    def records(self):
+        """
+        Percorre as linhas do arquivo pela ordem em que foram escritas.
+        """
+        try:
+            file = gzip.open(self.path, "rt", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            try:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Linha cortada: o resto do membro está incompleto
+            except (EOFError, gzip.BadGzipFile, OSError):
+                print(f"⚠️ Acréscimo incompleto ignorado no arquivo: {self.path}")
+
+    # Adiciona um novo método para ler as tarefas que estão no arquivo
+    def entries(self) -> dict:
+        """
+        Devolve id -> registo de cada tarefa arquivada (sem as repostas), do arquivo mais antigo para o mais recente.
+        Se a mesma tarefa foi arquivada mais de uma vez (por exemplo, depois de uma interrupção), fica a última.
+        """
+        entries = {}
+        for record in self.records():
+            if "restored" in record:
+                entries.pop(record["restored"], None)
+            else:
+                task_id = record["task"]["id"]
+                entries.pop(task_id, None)
+                entries[task_id] = record
+        return entries
+
+    def tasks(self) -> list:
+        return [Task.from_dict(record["task"]) for record in self.entries().values()]
+
+    # Adiciona um novo método para pesquisar no arquivo
+    def search(self, text: str = "", limit: int = None) -> list:
+        """
+        Devolve os registos (os arquivados mais recentemente primeiro) cujo título ou descrição contêm
+        todas as palavras de 'text' como prefixo, no máximo 'limit'.
+        """
+        terms = tokenize(text)
+        found = []
+        for record in reversed(list(self.entries().values())):
+            if terms:
+                data = record["task"]
+                words = tokenize(f"{data['Titulo']} {data['Descrição']}")
+                if not all(any(word.startswith(term) for word in words) for term in terms):
+                    continue
+            found.append(record)
+            if limit is not None and len(found) >= limit:
+                break
+        return found
@@ -0,0 +1,286 @@
+"""
+Benchmarks do modelo, da persistência e dos alertas do quadro Kanban, sem interface gráfica.
+
+Mede, para cada tamanho de quadro: carregar (JSON e SQLite), guardar (snapshot, registo do
+journal, escrita SQLite), mover e remover tarefas, procurar por título e verificar prazos.
+Os resultados podem ser gravados em JSON e comparados com uma execução anterior.
+
+Uso:
+    python benchmarks/bench_board.py --sizes 1000 10000 100000 --output results.json
+    python benchmarks/bench_board.py --sizes 1000000 --only move search
+    python benchmarks/bench_board.py --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from alerts import TaskAlert
+from board import Board
+from search import TaskIndex
+from storage import BoardJournal, SQLiteStorage
+from synthetic import make_board
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """
+    Regista uma função de benchmark. A função recebe o contexto e devolve (função a medir, operações por chamada).
+    """
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+def measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+class Context:
+    """
+    Quadro sintético e ficheiros temporários partilhados pelos benchmarks de um tamanho.
+    """
+    def __init__(self, size, directory):
+        self.size = size
+        self.directory = directory
+        self.board = make_board(size)
+        self.ids = list(self.board.tasks)
+        self.rng = random.Random(size)
+        self.json_path = os.path.join(directory, f"board_{size}.json")
+        self.db_path = os.path.join(directory, f"board_{size}.db")
+        self.storages = []
+        self.open(BoardJournal(self.json_path)).save_board(self.board)
+        self.open(SQLiteStorage(self.db_path)).save_board(self.board)
+
+    def open(self, storage):
+        """
+        Regista um armazenamento para ser fechado no fim (termina a thread de gravação).
+        """
+        self.storages.append(storage)
+        return storage
+
+    def close(self):
+        for storage in self.storages:
+            storage.close()
+        self.storages.clear()
+
+@benchmark("to_dict")
+def bench_to_dict(context):
+    return context.board.to_dict, context.size
+
+@benchmark("from_dict")
+def bench_from_dict(context):
+    data = context.board.to_dict()
+    return lambda: Board.from_dict(data), context.size
+
+@benchmark("load_json")
+def bench_load_json(context):
+    def load():
+        storage = BoardJournal(context.json_path)
+        storage.load()
+        storage.close()
+    return load, context.size
+
+@benchmark("stream_json")
+def bench_stream_json(context):
+    def stream():
+        storage = BoardJournal(context.json_path)
+        board = Board()
+        for column_name, tasks, _ in storage.stream():
+            for task in tasks:
+                board.add_task(task, column_name)
+        storage.finish_stream(board)
+        storage.close()
+    return stream, context.size
+
+@benchmark("load_sqlite")
+def bench_load_sqlite(context):
+    def load():
+        storage = SQLiteStorage(context.db_path)
+        storage.load()
+        storage.close()
+    return load, context.size
+
+@benchmark("save_snapshot")
+def bench_save_snapshot(context):
+    path = os.path.join(context.directory, f"save_{context.size}.json")
+    storage = context.open(BoardJournal(path))
+    return lambda: storage.compact(context.board, background=False), context.size
+
+@benchmark("save_record")
+def bench_save_record(context):
+    """
+    Custo de gravar uma alteração (o que a interface faz a cada edição), incluindo a escrita em disco.
+    """
+    path = os.path.join(context.directory, f"record_{context.size}.json")
+    storage = context.open(BoardJournal(path, compact_every=10 ** 9))
+    storage.save_board(context.board)
+    operations = 100
+    task = context.board.get_task(context.ids[0])
+
+    def save():
+        for _ in range(operations):
+            storage.append({"op": "update", "id": task.id, "task": task.to_dict()})
+            storage.append({"op": "move", "id": task.id, "to": "Completo", "before": None})
+        storage.flush()
+    return save, 2 * operations
+
+@benchmark("save_sqlite")
+def bench_save_sqlite(context):
+    path = os.path.join(context.directory, f"save_{context.size}.db")
+    shutil.copy(context.db_path, path)
+    storage = context.open(SQLiteStorage(path))
+    operations = 100
+
+    def save():
+        for _ in range(operations):
+            task = context.board.get_task(context.rng.choice(context.ids))
+            storage.append({"op": "move", "id": task.id, "to": "Em Progresso", "before": None})
+        storage.flush()
+    return save, operations
+
+@benchmark("move")
+def bench_move(context):
+    board = context.board
+    columns = list(board.columns)
+    operations = 1000
+
+    def move():
+        for _ in range(operations):
+            task_id = context.rng.choice(context.ids)
+            to_column = context.rng.choice(columns)
+            # Insere numa posição aleatória da coluna de destino
+            target = board.columns[to_column].tasks
+            before = target[context.rng.randrange(len(target))].id if len(target) else None
+            board.move_task(task_id, to_column, before if before != task_id else None)
+    return move, operations
+
+@benchmark("remove")
+def bench_remove(context):
+    """
+    Column.remove_task seguido de reinserção, para o quadro manter o tamanho.
+    """
+    board = context.board
+    operations = 1000
+
+    def remove():
+        for _ in range(operations):
+            task = board.get_task(context.rng.choice(context.ids))
+            column = board.columns[task.status]
+            column.remove_task(task.id)
+            column.add_task(task)
+    return remove, operations
+
+@benchmark("search")
+def bench_search(context):
+    board = context.board
+
+    def search():
+        return [task for task in board.tasks.values() if "cliente" in task.title or "cliente" in task.description]
+    return search, context.size
+
+@benchmark("search_index_build")
+def bench_search_index_build(context):
+    index = TaskIndex(context.board)
+    return index.build, context.size
+
+@benchmark("search_index")
+def bench_search_index(context):
+    """
+    Pesquisa no índice já construído: texto, prefixo e texto com filtros.
+    """
+    index = TaskIndex(context.board)
+    index.build()
+
+    def search():
+        index.search("cliente")
+        index.search("rel")
+        index.search("cache api", priority="Alta", status="Para fazer")
+    return search, 3
+
+@benchmark("deadline_rebuild")
+def bench_deadline_rebuild(context):
+    alert = TaskAlert(context.board)
+    return alert.rebuild, context.size
+
+@benchmark("deadline_check")
+def bench_deadline_check(context):
+    alert = TaskAlert(context.board)
+
+    def check():
+        alert.rebuild()
+        return alert.due_tasks()
+    return check, context.size
+
+def run(sizes, names, repeat):
+    results = []
+    for size in sizes:
+        directory = tempfile.mkdtemp(prefix="kanban_bench_")
+        try:
+            print(f"\n== {size} tarefas ==")
+            context = Context(size, directory)
+            for name in names:
+                function, operations = BENCHMARKS[name](context)
+                timings = measure(function, repeat)
+                best, median = min(timings), statistics.median(timings)
+                results.append({
+                    "benchmark": name, "size": size, "operations": operations, "repeat": repeat,
+                    "best_s": best, "median_s": median, "per_operation_us": best / operations * 1e6,
+                })
+                print(f"{name:>18}: melhor {best * 1000:10.2f} ms  mediana {median * 1000:10.2f} ms  ({best / operations * 1e6:9.2f} µs/op)")
+                context.close()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+def compare(results, baseline_path):
+    """
+    Mostra a variação de cada benchmark em relação a uma execução anterior.
+    """
+    with open(baseline_path, "r") as file:
+        baseline = {(item["benchmark"], item["size"]): item for item in json.load(file)["results"]}
+    print(f"\n== Comparação com {baseline_path} ==")
+    for item in results:
+        previous = baseline.get((item["benchmark"], item["size"]))
+        if previous:
+            ratio = item["best_s"] / previous["best_s"]
+            flag = "  ⚠️ regressão" if ratio > 1.2 else ""
+            print(f"{item['benchmark']:>18} {item['size']:>9}: {ratio:6.2f}x{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do quadro Kanban (sem interface gráfica)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Corre só estes benchmarks")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Grava os resultados neste ficheiro JSON")
+    parser.add_argument("--compare", help="Compara com os resultados gravados neste ficheiro JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.only or list(BENCHMARKS), args.repeat)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }, file, indent=4)
+        print(f"\nResultados gravados em {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Gerador de quadros sintéticos para os benchmarks.
+"""
+import random
+from datetime import date, timedelta
+
+from board import Board, Task
+
+PRIORITIES = ["Baixo", "Médio", "Alta"]
+WORDS = [
+    "relatório", "cliente", "api", "base", "dados", "erro", "deploy", "teste", "revisão", "design",
+    "backend", "frontend", "sprint", "reunião", "documentação", "pagamento", "login", "cache", "fila", "índice",
+]
+
+# Distribuição das tarefas pelas colunas (o arquivo é normalmente a maior)
+COLUMN_WEIGHTS = {"Para fazer": 0.25, "Em Progresso": 0.1, "Completo": 0.15, "Arquivado": 0.5}
+
+def make_task(rng: random.Random, index: int, today: date) -> Task:
+    title = " ".join(rng.choice(WORDS) for _ in range(3)) + f" #{index}"
+    description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 25)))
+    deadline = None
+    if rng.random() < 0.6:
+        deadline = (today + timedelta(days=rng.randint(-30, 90))).strftime("%m/%d/%y")
+    return Task(title, description, rng.choice(PRIORITIES), deadline, task_id=f"{index:032x}")
+
+def make_board(task_count: int, seed: int = 42) -> Board:
+    """
+    Cria um quadro com 'task_count' tarefas distribuídas pelas colunas de forma reprodutível.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    board = Board()
+    columns = list(COLUMN_WEIGHTS)
+    weights = list(COLUMN_WEIGHTS.values())
+    for index in range(task_count):
+        board.add_task(make_task(rng, index, today), rng.choices(columns, weights)[0])
+    return board
@@ -0,0 +1,623 @@
+"""
+Modelo do quadro Kanban: tarefas, colunas e o quadro com os seus eventos de alteração.
+Este módulo não depende do Tkinter, para poder ser usado sem interface gráfica.
+"""
+import bisect
+import functools
+import itertools
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import date
+
+@functools.lru_cache(maxsize=4096)
+def parse_day(text: str) -> date:
+    """
+    Converte uma data ISO ("2025-01-31") num datetime.date, partilhando o objeto entre as tarefas.
+    """
+    return date.fromisoformat(text)
+
+def today() -> date:
+    """
+    Dia de hoje, com o mesmo objeto para todas as tarefas criadas ou movidas no mesmo dia (ver parse_day).
+    """
+    return parse_day(date.today().isoformat())
+
+class Task:
+    """
+    Representa uma tarefa no quadro Kanban.
+
+    Usa __slots__ para reduzir a memória por tarefa. A prioridade é internada (todas as tarefas
+    partilham a mesma string) e o prazo é guardado já convertido em datetime.date: a propriedade
+    'deadline' continua a aceitar e devolver o texto no formato "%m/%d/%y".
+    'status_since' é o dia em que a tarefa entrou na coluna atual (None se for desconhecido,
+    por exemplo em tarefas gravadas antes de este campo existir).
+    """
+    __slots__ = ("id", "title", "description", "status", "status_since", "_priority", "_deadline")
+
+    def __init__(self, title: str, description: str, priority: str = "Médio", deadline: str = None, task_id: str = None):
+        self.id = task_id or uuid.uuid4().hex  # Identificador estável e único da tarefa
+        self.title = title
+        self.description = description
+        self.status = "Para fazer"
+        self.status_since = today()
+        self.priority = priority
+        self._deadline = None
+        self.deadline = deadline
+
+    @property
+    def priority(self):
+        return self._priority
+
+    @priority.setter
+    def priority(self, value):
+        self._priority = sys.intern(value) if value else value
+
+    @property
+    def deadline(self):
+        """
+        Prazo no formato "%m/%d/%y" (ou None).
+        """
+        deadline_date = self._deadline
+        if deadline_date is None:
+            return None
+        return f"{deadline_date.month:02d}/{deadline_date.day:02d}/{deadline_date.year % 100:02d}"
+
+    @deadline.setter
+    def deadline(self, value):
+        if not value:
+            self._deadline = None
+        elif isinstance(value, date):
+            self._deadline = value
+        else:
+            self._deadline = self.parse_deadline(value)
+            if self._deadline is None:
+                print(f"⚠️ Erro ao processar a data da tarefa '{self.title}': {value}")
+
+    @staticmethod
+    def parse_deadline(text: str):
+        """
+        Converte um texto "%m/%d/%y" num datetime.date (None se for inválido).
+        """
+        try:
+            month, day, year = text.split("/")
+            year = int(year)
+            if year < 100:
+                year += 2000 if year < 69 else 1900  # Mesma regra que o %y do strptime
+            return date(year, int(month), int(day))
+        except ValueError:
+            return None
+
+    def __str__(self):
+        deadline_info = f" (Deadline: {self.deadline})" if self._deadline else ""
+        return f"{self.title} - {self.description} [Priority: {self.priority}]{deadline_info}"
+
+    def to_dict(self): # Adiciona um método para converter a tarefa em um dicionário
+        return {
+            "id": self.id,
+            "Titulo": self.title,
+            "Descrição": self.description,
+            "Estado": self.status,
+            "Prioridade": self._priority,
+            "deadline": self.deadline,
+            "Desde": self.status_since.isoformat() if self.status_since else None
+        }
+
+    @staticmethod
+    def from_dict(data):
+        task = Task(data["Titulo"], data["Descrição"], data["Prioridade"], data.get("deadline"), data.get("id"))
+        since = data.get("Desde")
+        task.status_since = parse_day(since) if since else None
+        return task
+    
+    def get_deadline_date(self):
+        """
+        Devolve o prazo como datetime.date (None se não tiver prazo).
+        """
+        return self._deadline
+
+class TaskSequence:
+    """
+    Sequência ordenada de tarefas com índice por id.
+
+    As tarefas são guardadas em blocos de tamanho limitado: procurar por id custa O(1)
+    e inserir, remover ou reordenar uma tarefa custa O(√n) em vez de percorrer a lista toda.
+    """
+    BLOCK_SIZE = 256
+
+    def __init__(self):
+        self._blocks = [[]]
+        self._tasks = {}     # id -> tarefa
+        self._block_of = {}  # id -> bloco onde a tarefa está guardada
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            return self._slice(start, stop)
+        if index < 0:
+            index += len(self)
+        block, offset = self._locate(index)
+        if block is None or offset >= len(block):
+            raise IndexError("índice fora da sequência")
+        return block[offset]
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def index(self, task_id) -> int:
+        """
+        Devolve a posição da tarefa na sequência.
+        """
+        block = self._block_of[task_id]
+        position = 0
+        for current in self._blocks:
+            if current is block:
+                break
+            position += len(current)
+        return position + block.index(self._tasks[task_id])
+
+    def next_id(self, task_id):
+        """
+        Devolve o id da tarefa seguinte na sequência (ou None se a tarefa for a última).
+        """
+        block = self._block_of[task_id]
+        offset = block.index(self._tasks[task_id]) + 1
+        if offset < len(block):
+            return block[offset].id
+        found = False
+        for current in self._blocks:
+            if found and current:
+                return current[0].id
+            found = found or current is block
+        return None
+
+    def insert(self, task, index: int = None):
+        """
+        Insere a tarefa na posição indicada (por omissão, no fim).
+        """
+        if index is None or index >= len(self):
+            block, offset = self._blocks[-1], len(self._blocks[-1])
+        else:
+            block, offset = self._locate(max(index, 0))
+        block.insert(offset, task)
+        self._tasks[task.id] = task
+        self._block_of[task.id] = block
+        if len(block) > 2 * self.BLOCK_SIZE:
+            self._split(block)
+
+    def remove(self, task_id):
+        """
+        Remove a tarefa pelo id e devolve-a (ou None se não existir).
+        """
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return None
+        block = self._block_of.pop(task_id)
+        block.remove(task)
+        if not block and len(self._blocks) > 1:
+            self._blocks = [current for current in self._blocks if current is not block]
+        return task
+
+    def move(self, task_id, index: int):
+        """
+        Reordena a tarefa para a posição indicada.
+        """
+        task = self.remove(task_id)
+        if task is not None:
+            self.insert(task, index)
+        return task
+
+    def _locate(self, index):
+        for block in self._blocks:
+            if index < len(block):
+                return block, index
+            index -= len(block)
+        return self._blocks[-1], len(self._blocks[-1]) + index
+
+    def _slice(self, start, stop):
+        result = []
+        if start >= stop:
+            return result
+        block_start = 0
+        for block in self._blocks:
+            block_end = block_start + len(block)
+            if block_end > start:
+                result.extend(block[max(start - block_start, 0):stop - block_start])
+                if block_end >= stop:
+                    break
+            block_start = block_end
+        return result
+
+    def _split(self, block):
+        half = len(block) // 2
+        new_block = block[half:]
+        del block[half:]
+        for task in new_block:
+            self._block_of[task.id] = new_block
+        position = next(i for i, current in enumerate(self._blocks) if current is block)
+        self._blocks.insert(position + 1, new_block)
+
+PRIORITY_RANK = {"Alta": 0, "Médio": 1, "Baixo": 2}
+
+def priority_rank(task) -> int:
+    return PRIORITY_RANK.get(task.priority, len(PRIORITY_RANK))
+
+# Ordenações das colunas: nome -> chave de cada tarefa (as tarefas sem prazo ficam depois das outras)
+SORT_KEYS = {
+    "Prioridade": lambda task: (priority_rank(task), task.get_deadline_date() or date.max),
+    "Prazo": lambda task: (task.get_deadline_date() or date.max, priority_rank(task)),
+}
+
+class SortedTasks:
+    """
+    Tarefas ordenadas por uma chave (ver SORT_KEYS), mantidas em ordem à medida que mudam.
+
+    Como na TaskSequence, as tarefas ficam em blocos de tamanho limitado, cada um ordenado, com a
+    maior entrada de cada bloco numa lista à parte: encontrar a posição de uma tarefa custa
+    O(log n) (bisect) e inserir, remover ou reposicionar uma tarefa custa O(√n) no pior caso,
+    em vez de reordenar a coluna. Tarefas com a mesma chave mantêm a ordem pela qual entraram.
+    """
+    BLOCK_SIZE = 256
+
+    def __init__(self, key, tasks=()):
+        self.key = key
+        self._order = itertools.count()
+        self._entries = {}  # id -> (chave, ordem de entrada, tarefa)
+        entries = sorted(self._entry(task) for task in tasks)
+        self._blocks = [entries[i:i + self.BLOCK_SIZE] for i in range(0, len(entries), self.BLOCK_SIZE)] or [[]]
+        self._maxes = [block[-1] for block in self._blocks if block]
+
+    def _entry(self, task, order=None):
+        entry = (self.key(task), next(self._order) if order is None else order, task)
+        self._entries[task.id] = entry
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, task_id):
+        return task_id in self._entries
+
+    def __iter__(self):
+        for block in self._blocks:
+            for entry in block:
+                yield entry[2]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            result = []
+            block_start = 0
+            for block in self._blocks:
+                block_end = block_start + len(block)
+                if block_end > start and start < stop:
+                    result.extend(entry[2] for entry in block[max(start - block_start, 0):stop - block_start])
+                if block_end >= stop:
+                    break
+                block_start = block_end
+            return result
+        if index < 0:
+            index += len(self)
+        for block in self._blocks:
+            if 0 <= index < len(block):
+                return block[index][2]
+            index -= len(block)
+        raise IndexError("índice fora da sequência")
+
+    def add(self, task, order=None):
+        """
+        Insere a tarefa na posição dada pela chave.
+        """
+        entry = self._entry(task, order)
+        if not self._maxes:
+            self._blocks[0].append(entry)
+            self._maxes.append(entry)
+            return
+        position = min(bisect.bisect_left(self._maxes, entry), len(self._maxes) - 1)
+        block = self._blocks[position]
+        bisect.insort(block, entry)
+        self._maxes[position] = block[-1]
+        if len(block) > 2 * self.BLOCK_SIZE:
+            half = len(block) // 2
+            self._blocks.insert(position + 1, block[half:])
+            del block[half:]
+            self._maxes.insert(position, block[-1])
+
+    def discard(self, task_id):
+        """
+        Retira a tarefa (se estiver na sequência) e devolve a sua ordem de entrada.
+        """
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return None
+        position = bisect.bisect_left(self._maxes, entry[:2])
+        block = self._blocks[position]
+        del block[bisect.bisect_left(block, entry[:2])]
+        if block:
+            self._maxes[position] = block[-1]
+        elif len(self._blocks) > 1:
+            del self._blocks[position]
+            del self._maxes[position]
+        else:
+            self._maxes = []
+        return entry[1]
+
+    def update(self, task) -> bool:
+        """
+        Reposiciona a tarefa se a sua chave mudou (por exemplo, depois de mudar a prioridade).
+        Devolve True se a tarefa mudou de posição.
+        """
+        entry = self._entries.get(task.id)
+        if entry is None or entry[0] == self.key(task):
+            return False
+        self.add(task, self.discard(task.id))
+        return True
+
+class Column:
+    """
+    Representa a coluna no quadro Kanban.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.tasks = TaskSequence()
+
+    # Adiciona um método para adicionar uma tarefa à coluna, opcionalmente antes de outra tarefa
+    def add_task(self, task: Task, before: str = None):
+        task.status = self.name
+        index = self.tasks.index(before) if before in self.tasks else None
+        self.tasks.insert(task, index)
+
+    # Adiciona um método para remover uma tarefa da coluna
+    def remove_task(self, task_id: str) -> Task:
+        return self.tasks.remove(task_id)
+
+    # Adiciona um método para obter uma tarefa da coluna pelo id
+    def get_task(self, task_id: str) -> Task:
+        return self.tasks.get(task_id)
+
+class BoardEvent:
+    """
+    Representa uma alteração no quadro, enviada aos observadores do Board.
+
+    - kind: "add", "move", "update", "remove" ou "batch".
+    - task: a tarefa alterada.
+    - column: a coluna onde a tarefa ficou (ou de onde foi removida).
+    - from_column: a coluna de origem, num "move".
+    - before: id da tarefa antes da qual foi inserida, num "add" ou "move".
+    - changes: valores anteriores dos campos alterados, num "update"; num "move" ou "remove", a posição
+      anterior ("before": id da tarefa que vinha a seguir) e, num "move", o "status_since" anterior.
+    - events: as alterações agrupadas, num "batch" (ver Board.batch); 'task' e 'column' são None.
+    """
+    def __init__(self, kind: str, task: Task, column: str, from_column: str = None, before: str = None, changes: dict = None, events: list = None):
+        self.kind = kind
+        self.task = task
+        self.column = column
+        self.from_column = from_column
+        self.before = before
+        self.changes = changes or {}
+        self.events = events or []
+
+    def flatten(self):
+        """
+        Devolve as alterações simples contidas no evento (o próprio evento, se não for um "batch").
+        """
+        return self.events if self.kind == "batch" else [self]
+
+    def columns(self):
+        """
+        Nomes das colunas afetadas pelo evento.
+        """
+        names = set()
+        for event in self.flatten():
+            names.add(event.column)
+            if event.from_column:
+                names.add(event.from_column)
+        return names
+
+class Board:
+
+    """
+    Representa o Kanban board.
+    Todas as alterações passam pelos métodos do quadro, que as comunicam aos observadores
+    (interface, persistência, alertas) através de objetos BoardEvent.
+    """
+    EDITABLE_FIELDS = ("title", "description", "priority", "deadline")
+
+    def __init__(self):
+        
+        # Adiciona um dicionário para armazenar as colunas
+        self.columns = {
+            "Para fazer": Column("Para fazer"),
+            "Em Progresso": Column("Em Progresso"),
+            "Completo": Column("Completo"),
+            "Arquivado": Column("Arquivado")
+        }
+        self.tasks = {}  # Índice id -> tarefa de todas as colunas
+        self._listeners = []
+        self._batch = None  # Alterações acumuladas dentro de um 'batch'
+
+    # Adiciona um método para registar um observador das alterações do quadro
+    def subscribe(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    # Adiciona um método para remover um observador
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, event: BoardEvent):
+        if self._batch is not None:
+            self._batch.append(event)
+            return
+        for listener in list(self._listeners):
+            listener(event)
+
+    # Adiciona um método para agrupar várias alterações numa só
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa as alterações feitas dentro do bloco 'with' num único evento "batch", comunicado
+        no fim: os observadores gravam e redesenham uma só vez. Blocos encadeados juntam-se ao exterior.
+        Se o bloco falhar a meio, as alterações já feitas são comunicadas na mesma.
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = []
+        try:
+            yield self
+        finally:
+            events, self._batch = self._batch, None
+            if len(events) == 1:
+                self._emit(events[0])
+            elif events:
+                self._emit(BoardEvent("batch", None, None, events=events))
+
+    # Adiciona um método para escolher tarefas por uma condição
+    def select(self, predicate, column_name: str = None) -> list:
+        """
+        Devolve os ids das tarefas (de uma coluna ou de todas) para as quais predicate(tarefa) é verdadeiro.
+        """
+        columns = [self.columns[column_name]] if column_name else self.columns.values()
+        return [task.id for column in columns for task in column.tasks if predicate(task)]
+
+    def _selection(self, tasks) -> list:
+        # Aceita ids ou uma condição sobre as tarefas
+        if callable(tasks):
+            return self.select(tasks)
+        return list(tasks)
+
+    # Adiciona um método para mover várias tarefas de uma vez
+    def move_tasks(self, tasks, to_column: str) -> int:
+        """
+        Move para o fim de 'to_column' as tarefas indicadas (ids ou condição), mantendo a ordem entre elas.
+        Devolve o número de tarefas movidas.
+        """
+        moved = 0
+        with self.batch():
+            for task_id in self._selection(tasks):
+                task = self.tasks.get(task_id)
+                if task is not None and task.status != to_column and self.move_task(task_id, to_column):
+                    moved += 1
+        return moved
+
+    # Adiciona um método para arquivar várias tarefas de uma vez
+    def archive_tasks(self, tasks=None) -> int:
+        """
+        Arquiva as tarefas indicadas (por omissão, todas as da coluna "Completo").
+        """
+        if tasks is None:
+            tasks = [task.id for task in self.columns["Completo"].tasks]
+        return self.move_tasks(tasks, "Arquivado")
+
+    # Adiciona um método para alterar várias tarefas de uma vez
+    def update_tasks(self, tasks, **fields) -> int:
+        """
+        Altera os mesmos campos (por exemplo, a prioridade) em todas as tarefas indicadas.
+        Devolve o número de tarefas alteradas.
+        """
+        updated = 0
+        with self.batch():
+            for task_id in self._selection(tasks):
+                if self.update_task(task_id, **fields):
+                    updated += 1
+        return updated
+
+    # Adiciona um método para remover várias tarefas de uma vez
+    def remove_tasks(self, tasks) -> int:
+        removed = 0
+        with self.batch():
+            for task_id in self._selection(tasks):
+                if self.remove_task(task_id) is not None:
+                    removed += 1
+        return removed
+    
+    # Adiciona um método para adicionar uma tarefa ao quadro
+    def add_task(self, task: Task, column_name: str = "Para fazer", before: str = None):
+        self.columns[column_name].add_task(task, before)
+        self.tasks[task.id] = task
+        self._emit(BoardEvent("add", task, column_name, before=before))
+
+    # Adiciona um método para obter uma tarefa pelo id
+    def get_task(self, task_id: str) -> Task:
+        return self.tasks.get(task_id)
+
+    # Adiciona um método para mover uma tarefa entre colunas (ou reordená-la na mesma coluna)
+    def move_task(self, task_id: str, to_column: str, before: str = None, since: date = None) -> bool:
+        """
+        Move a tarefa para 'to_column' (antes da tarefa 'before', ou no fim). Ao mudar de coluna,
+        'status_since' passa a ser 'since' (por omissão, hoje). Um 'before' que não está na coluna
+        coloca a tarefa no fim; 'before' igual à própria tarefa deixa-a no mesmo lugar (como no SQLite).
+        """
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        if to_column not in self.columns:
+            print(f"Erro: A coluna '{to_column}' não existe.")
+            return False
+        from_column = task.status
+        changes = {"before": self.columns[from_column].tasks.next_id(task_id), "status_since": task.status_since}
+        if before == task_id:
+            before = changes["before"] if from_column == to_column else None
+        self.columns[from_column].remove_task(task_id)
+        self.columns[to_column].add_task(task, before)
+        if from_column != to_column:
+            task.status_since = since or today()
+        self._emit(BoardEvent("move", task, to_column, from_column=from_column, before=before, changes=changes))
+        return True
+
+    # Adiciona um método para alterar os campos de uma tarefa
+    def update_task(self, task_id: str, **fields) -> bool:
+        """
+        Altera os campos indicados (title, description, priority, deadline) de uma tarefa.
+        Só é comunicada uma alteração se algum valor mudou.
+        """
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        changes = {}
+        for name, value in fields.items():
+            if name not in self.EDITABLE_FIELDS:
+                raise ValueError(f"Campo desconhecido: {name}")
+            if getattr(task, name) != value:
+                changes[name] = getattr(task, name)
+                setattr(task, name, value)
+        if changes:
+            self._emit(BoardEvent("update", task, task.status, changes=changes))
+        return bool(changes)
+
+    # Adiciona um método para remover uma tarefa do quadro
+    def remove_task(self, task_id: str) -> Task:
+        task = self.tasks.pop(task_id, None)
+        if task is not None:
+            column = self.columns[task.status]
+            changes = {"before": column.tasks.next_id(task_id)}
+            column.remove_task(task_id)
+            self._emit(BoardEvent("remove", task, task.status, changes=changes))
+        return task
+
+    def to_dict(self):
+        return {column_name: [task.to_dict() for task in column.tasks] for column_name, column in self.columns.items()}
+
+    @staticmethod
+    def from_dict(data):
+        board = Board()
+        for column_name in board.columns:
+            for task_data in data.get(column_name, []):
+                board.add_task(Task.from_dict(task_data), column_name)
+        return board
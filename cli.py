@@ -0,0 +1,194 @@
+"""
+Linha de comandos do quadro Kanban (sem interface gráfica): importação e exportação de tarefas em CSV ou NDJSON.
+
+    python cli.py import tickets.csv --board kanban_board.json
+    python cli.py export - --board kanban_board.db --status "Em Progresso" --format ndjson
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from datetime import date
+
+from board import Board, Task, PRIORITY_RANK, parse_day
+from search import tokenize
+from storage import open_storage
+
+# Campos de cada tarefa, com os mesmos nomes do JSON do quadro (Task.to_dict)
+FIELDS = ["id", "Titulo", "Descrição", "Estado", "Prioridade", "deadline", "Desde"]
+COLUMNS = list(Board().columns)
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+def detect_format(path: str, requested: str = None) -> str:
+    if requested:
+        return requested
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise SystemExit(f"❌ Formato desconhecido para '{path}': indique --format csv ou --format ndjson.")
+    return FORMATS[extension]
+
+def open_text(path: str, mode: str):
+    """
+    Abre o ficheiro (ou a entrada/saída padrão para "-") em UTF-8.
+    """
+    if path == "-":
+        stream = sys.stdin if mode == "r" else sys.stdout
+        stream.reconfigure(encoding="utf-8", newline="")
+        return contextlib.nullcontext(stream)  # Não fecha a entrada/saída padrão
+    return open(path, mode, encoding="utf-8", newline="")
+
+def read_rows(file, file_format: str):
+    """
+    Gera (dicionário, None) para cada tarefa do ficheiro, ou (None, erro) para uma linha inválida,
+    sem ler o ficheiro por inteiro.
+    """
+    if file_format == "csv":
+        for row in csv.DictReader(file):
+            yield row, None
+        return
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield None, f"linha {line_number}: JSON inválido ({e})"
+
+def parse_date(text: str) -> date:
+    """
+    Aceita datas ISO ("2025-01-31") ou no formato do quadro ("01/31/25").
+    """
+    try:
+        return parse_day(text)
+    except ValueError:
+        pass
+    value = Task.parse_deadline(text)
+    if value is None:
+        raise ValueError(f"data inválida: '{text}'")
+    return value
+
+def check_priority(priority):
+    """
+    Lança ValueError se a prioridade não for uma das do quadro (as mesmas aceites pela API).
+    """
+    if not isinstance(priority, str) or priority not in PRIORITY_RANK:
+        raise ValueError(f"prioridade inválida: {priority!r} (use {', '.join(PRIORITY_RANK)})")
+
+def import_record(data: dict, default_column: str) -> dict:
+    """
+    Converte uma tarefa importada no registo "add" do quadro. Uma tarefa com um id que já exista
+    no quadro é atualizada (ver BoardStorage.apply).
+    """
+    title = (data.get("Titulo") or "").strip()
+    if not title:
+        raise ValueError("falta o título ('Titulo')")
+    column_name = data.get("Estado") or default_column
+    if column_name not in COLUMNS:
+        raise ValueError(f"coluna desconhecida: '{column_name}'")
+    priority = data.get("Prioridade") or "Médio"
+    check_priority(priority)
+    deadline = data.get("deadline")
+    task = Task(title, data.get("Descrição") or "", priority,
+                parse_date(deadline) if deadline else None, data.get("id") or None)
+    since = data.get("Desde")
+    task.status_since = parse_day(since) if since else date.today()
+    task.status = column_name
+    return {"op": "add", "column": column_name, "task": task.to_dict(), "before": None}
+
+# Adiciona um novo comando para importar tarefas
+def import_tasks(args) -> int:
+    """
+    Acrescenta as tarefas ao quadro como registos, em lotes de --batch-size, sem carregar o quadro
+    nem o ficheiro importado para memória. A aplicação compacta o journal na próxima gravação.
+    """
+    file_format = detect_format(args.file, args.format)
+    storage = open_storage(args.board)
+    storage.open_append()
+    imported = errors = 0
+    try:
+        with open_text(args.file, "r") as file:
+            for number, (data, error) in enumerate(read_rows(file, file_format), 1):
+                if error is None:
+                    try:
+                        storage.append(import_record(data, args.column))
+                        imported += 1
+                        if imported % args.batch_size == 0:
+                            storage.flush()
+                            print(f"⏳ {imported} tarefas importadas...", file=sys.stderr)
+                        continue
+                    except (ValueError, TypeError, AttributeError) as e:
+                        error = f"tarefa {number}: {e}"
+                errors += 1
+                print(f"⚠️ Ignorada: {error}", file=sys.stderr)
+    finally:
+        storage.close()
+    print(f"✅ {imported} tarefa(s) importada(s) para '{args.board}'" + (f", {errors} ignorada(s)." if errors else "."), file=sys.stderr)
+    return 1 if errors and not imported else 0
+
+# Adiciona um novo comando para exportar (ou consultar) tarefas
+def export_tasks(args) -> int:
+    """
+    Escreve as tarefas que cumprem os filtros à medida que são lidas do quadro.
+    """
+    file_format = detect_format(args.file, args.format)
+    terms = tokenize(args.text)
+    storage = open_storage(args.board)
+    exported = 0
+    try:
+        tasks = storage.iter_tasks(args.status, args.priority, args.deadline_from, args.deadline_to)
+        with open_text(args.file, "w") as file:
+            writer = csv.DictWriter(file, FIELDS) if file_format == "csv" else None
+            if writer is not None:
+                writer.writeheader()
+            for task in tasks:
+                if terms:
+                    words = tokenize(f"{task.title} {task.description}")
+                    if not all(any(word.startswith(term) for word in words) for term in terms):
+                        continue
+                if writer is not None:
+                    writer.writerow(task.to_dict())
+                else:
+                    file.write(json.dumps(task.to_dict(), ensure_ascii=False) + "\n")
+                exported += 1
+    except FileNotFoundError:
+        print(f"❌ Quadro não encontrado: '{args.board}'", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # A saída foi fechada (por exemplo, "| head"): termina sem erro e sem escrever mais nada
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    finally:
+        storage.close()
+    print(f"✅ {exported} tarefa(s) exportada(s).", file=sys.stderr)
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Kanban Board (linha de comandos)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Importa tarefas de um ficheiro CSV ou NDJSON")
+    importer.add_argument("file", help="Ficheiro a importar (.csv, .ndjson ou - para a entrada padrão)")
+    importer.add_argument("--column", default=COLUMNS[0], choices=COLUMNS, help="Coluna das tarefas sem 'Estado'")
+    importer.add_argument("--batch-size", type=int, default=1000, help="Tarefas gravadas de cada vez")
+    importer.set_defaults(handler=import_tasks)
+
+    exporter = commands.add_parser("export", help="Exporta (ou filtra) as tarefas para CSV ou NDJSON")
+    exporter.add_argument("file", help="Ficheiro a criar (.csv, .ndjson ou - para a saída padrão)")
+    exporter.add_argument("--status", choices=COLUMNS, help="Só as tarefas desta coluna")
+    exporter.add_argument("--priority", choices=["Baixo", "Médio", "Alta"], help="Só as tarefas com esta prioridade")
+    exporter.add_argument("--deadline-from", type=parse_date, metavar="DATA", help="Prazo a partir de (AAAA-MM-DD)")
+    exporter.add_argument("--deadline-to", type=parse_date, metavar="DATA", help="Prazo até (AAAA-MM-DD)")
+    exporter.add_argument("--text", default="", help="Palavras (ou início de palavras) do título ou da descrição")
+    exporter.set_defaults(handler=export_tasks)
+
+    for command in (importer, exporter):
+        command.add_argument("--board", default="kanban_board.json", help="Ficheiro do quadro (.json ou .db)")
+        command.add_argument("--format", choices=["csv", "ndjson"], help="Formato (por omissão, pela extensão do ficheiro)")
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
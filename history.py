@@ -0,0 +1,213 @@
+"""
+Histórico de alterações do quadro Kanban para desfazer e refazer.
+"""
+from collections import deque
+from contextlib import contextmanager
+
+class Command:
+    """
+    Alteração reversível do quadro, criada a partir de um BoardEvent. 'undo' e 'redo' passam pelos
+    métodos do Board, pelo que a interface, a gravação e os índices só atualizam a tarefa e as colunas
+    envolvidas. Se a tarefa já não estiver no estado esperado (por exemplo, foi removida por outra
+    instância), o comando não faz nada.
+    """
+    size = 1
+
+    def __init__(self, task, column: str):
+        self.task = task
+        self.column = column
+
+    @staticmethod
+    def from_event(event):
+        if event.kind == "batch":
+            return BatchCommand([Command.from_event(sub_event) for sub_event in event.events])
+        return COMMANDS[event.kind](event)
+
+    def undo(self, board):
+        raise NotImplementedError
+
+    def redo(self, board):
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return f"'{self.task.title}'"
+
+class AddCommand(Command):
+    def __init__(self, event):
+        super().__init__(event.task, event.column)
+        self.before = event.before
+
+    def undo(self, board):
+        if board.get_task(self.task.id) is not None:
+            board.remove_task(self.task.id)
+
+    def redo(self, board):
+        if board.get_task(self.task.id) is None:
+            board.add_task(self.task, self.column, self.before)
+
+    def describe(self):
+        return f"adicionar '{self.task.title}'"
+
+class RemoveCommand(Command):
+    def __init__(self, event):
+        super().__init__(event.task, event.column)
+        self.before = event.changes.get("before")
+
+    def undo(self, board):
+        if board.get_task(self.task.id) is None:
+            board.add_task(self.task, self.column, self.before)
+
+    def redo(self, board):
+        if board.get_task(self.task.id) is not None:
+            board.remove_task(self.task.id)
+
+    def describe(self):
+        return f"remover '{self.task.title}'"
+
+class MoveCommand(Command):
+    def __init__(self, event):
+        super().__init__(event.task, event.column)
+        self.before = event.before
+        self.from_column = event.from_column
+        self.from_before = event.changes.get("before")
+        self.from_since = event.changes.get("status_since")
+        self.since = event.task.status_since
+
+    def undo(self, board):
+        if board.get_task(self.task.id) is not None:
+            board.move_task(self.task.id, self.from_column, self.from_before, self.from_since)
+
+    def redo(self, board):
+        if board.get_task(self.task.id) is not None:
+            board.move_task(self.task.id, self.column, self.before, self.since)
+
+    def describe(self):
+        return f"mover '{self.task.title}' para \"{self.column}\""
+
+class UpdateCommand(Command):
+    """
+    Edição de campos (título, descrição, prioridade ou prazo): guarda só os valores alterados.
+    """
+    def __init__(self, event):
+        super().__init__(event.task, event.column)
+        self.old = dict(event.changes)
+        self.new = {name: getattr(event.task, name) for name in event.changes}
+
+    def undo(self, board):
+        board.update_task(self.task.id, **self.old)
+
+    def redo(self, board):
+        board.update_task(self.task.id, **self.new)
+
+    def describe(self):
+        return f"editar '{self.task.title}'"
+
+class BatchCommand(Command):
+    """
+    Alterações feitas em lote (Board.batch): desfeitas pela ordem inversa, num só lote.
+    """
+    def __init__(self, commands):
+        self.commands = commands
+        self.size = sum(command.size for command in commands)
+
+    def undo(self, board):
+        with board.batch():
+            for command in reversed(self.commands):
+                command.undo(board)
+
+    def redo(self, board):
+        with board.batch():
+            for command in self.commands:
+                command.redo(board)
+
+    def describe(self):
+        if len(self.commands) == 1:
+            return self.commands[0].describe()
+        return f"{len(self.commands)} alterações"
+
+COMMANDS = {"add": AddCommand, "remove": RemoveCommand, "move": MoveCommand, "update": UpdateCommand}
+
+class UndoHistory:
+    """
+    Histórico limitado das alterações do quadro (observador do Board), para desfazer e refazer.
+
+    O histórico guarda no máximo 'max_changes' alterações simples (um lote conta todas as suas
+    alterações): as mais antigas são esquecidas, pelo que a memória usada não depende do tamanho
+    do quadro. As alterações feitas dentro de 'paused' (por exemplo, as de outras instâncias ou da
+    API) não entram no histórico.
+    """
+    def __init__(self, max_changes: int = 1000):
+        self.max_changes = max_changes
+        self.done = deque()
+        self.undone = []
+        self.size = 0
+        self.board = None
+        self._paused = 0
+
+    # Adiciona um novo método para começar a seguir um quadro (com um histórico vazio)
+    def attach(self, board):
+        if self.board is not None:
+            self.board.unsubscribe(self.on_board_event)
+        self.board = board
+        self.clear()
+        board.subscribe(self.on_board_event)
+
+    def clear(self):
+        self.done.clear()
+        self.undone = []
+        self.size = 0
+
+    @contextmanager
+    def paused(self):
+        """
+        Não regista as alterações feitas dentro do bloco 'with'.
+        """
+        self._paused += 1
+        try:
+            yield self
+        finally:
+            self._paused -= 1
+
+    def on_board_event(self, event):
+        if self._paused:
+            return
+        command = Command.from_event(event)
+        self.undone = []
+        if command.size > self.max_changes:
+            self.clear()  # Alteração demasiado grande para guardar: as anteriores já não podem ser desfeitas
+            return
+        self.done.append(command)
+        self.size += command.size
+        while self.size > self.max_changes:
+            self.size -= self.done.popleft().size
+
+    def can_undo(self) -> bool:
+        return bool(self.done)
+
+    def can_redo(self) -> bool:
+        return bool(self.undone)
+
+    # Adiciona um novo método para desfazer a última alteração
+    def undo(self):
+        """
+        Desfaz a última alteração registada e devolve-a (ou None se não houver nenhuma).
+        """
+        if not self.done:
+            return None
+        command = self.done.pop()
+        self.size -= command.size
+        with self.paused():
+            command.undo(self.board)
+        self.undone.append(command)
+        return command
+
+    # Adiciona um novo método para refazer a última alteração desfeita
+    def redo(self):
+        if not self.undone:
+            return None
+        command = self.undone.pop()
+        with self.paused():
+            command.redo(self.board)
+        self.done.append(command)
+        self.size += command.size
+        return command
@@ -0,0 +1,167 @@
+"""
+Medição de tempos dos pontos críticos da aplicação (sobreposição de desempenho e trace).
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+class Stat:
+    """
+    Estatística acumulada de um ponto medido: número de chamadas, tempo total, máximo e último (segundos).
+    """
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        self.last = duration
+        if duration > self.max:
+            self.max = duration
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+class Instrumentation:
+    """
+    Temporizadores e contadores dos pontos críticos (desenho das colunas, gravação, carregamento,
+    alertas, arrasto...).
+
+    Desligada por omissão: cada ponto medido só verifica 'enabled' e chama a função original.
+    Ligada, acumula estatísticas por nome (Stat) e guarda os últimos 'max_events' eventos para
+    exportar no formato Chrome trace (chrome://tracing ou https://ui.perfetto.dev).
+    Pode ser usada a partir de várias threads (por exemplo, a gravação e os alertas).
+    """
+    def __init__(self, max_events: int = 100000):
+        self.enabled = False
+        self.stats = {}    # nome -> Stat
+        self.counters = {}  # nome -> último valor
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.counters.clear()
+            self.events.clear()
+            self._origin = time.perf_counter()
+
+    # Adiciona um novo método para registar a duração de um ponto medido
+    def record(self, name: str, start: float, end: float):
+        """
+        Regista um intervalo medido com time.perf_counter().
+        """
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = Stat()
+            stat.add(end - start)
+            self.events.append(("X", name, start, end - start, threading.get_ident()))
+
+    # Adiciona um novo método para registar o valor de um contador
+    def count(self, name: str, value):
+        """
+        Regista o valor atual de um contador (por exemplo, o atraso do ciclo do Tk ou o número de widgets).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = value
+            self.events.append(("C", name, time.perf_counter(), value, threading.get_ident()))
+
+    def span(self, name: str):
+        """
+        Mede o bloco 'with' com o nome indicado.
+        """
+        return _Span(self, name) if self.enabled else _NO_SPAN
+
+    def timed(self, name: str = None):
+        """
+        Decorador que mede cada chamada da função (por omissão, com o nome qualificado da função).
+        """
+        def decorate(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, start, time.perf_counter())
+            return wrapper
+        return decorate
+
+    def snapshot(self):
+        """
+        Devolve uma cópia de (estatísticas, contadores), ordenadas pelo tempo total.
+        """
+        with self._lock:
+            stats = sorted(((name, stat.count, stat.total, stat.average, stat.max, stat.last)
+                            for name, stat in self.stats.items()), key=lambda item: item[2], reverse=True)
+            return stats, dict(self.counters)
+
+    # Adiciona um novo método para exportar os eventos no formato Chrome trace
+    def export_chrome_trace(self, path: str) -> int:
+        """
+        Grava os eventos registados em JSON (Trace Event Format). Devolve o número de eventos gravados.
+        """
+        with self._lock:
+            events, origin = list(self.events), self._origin
+        pid = os.getpid()
+        trace = []
+        for phase, name, start, value, thread_id in events:
+            event = {"name": name, "ph": phase, "ts": round((start - origin) * 1e6, 1), "pid": pid, "tid": thread_id}
+            if phase == "X":
+                event["dur"] = round(value * 1e6, 1)
+            else:
+                event["args"] = {"valor": value}
+            trace.append(event)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
+        return len(trace)
+
+class _Span:
+    __slots__ = ("instrumentation", "name", "start")
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.record(self.name, self.start, time.perf_counter())
+        return False
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+# Instância partilhada pela aplicação
+instruments = Instrumentation()
+timed = instruments.timed
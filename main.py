@@ -1,189 +1,574 @@
+import time
+STARTED = time.perf_counter()  # Início do arranque, medido antes de qualquer outro import (--profile-startup)
+
+import argparse
 import tkinter as tk
-from tkinter import ttk, messagebox, font, Text, Menu
-import json
-from ttkthemes import ThemedTk
-from tkcalendar import DateEntry # Biblioteca para calendário // pip install tkcalendar
-from datetime import datetime # Biblioteca para data e hora // pip install datetime
-from plyer import notification # Biblioteca para notificações // pip install plyer
-
-class Task:
+from tkinter import ttk, messagebox, filedialog, font, Text, Menu
+import queue
+import threading
+from datetime import datetime, date, timedelta # Biblioteca para data e hora // pip install datetime
+
+from board import Board, Task, SortedTasks, SORT_KEYS
+from storage import BoardStorage, migrate_board
+from alerts import TaskAlert
+from search import TaskIndex
+from workspace import Workspace
+from archive import TaskArchive
+from metrics import FlowMetrics
+from history import UndoHistory
+from api import BoardAPI
+from instrumentation import instruments, timed
+
+# ttkthemes, tkcalendar e plyer são importados só quando são precisos (ou em segundo plano
+# depois de a janela aparecer), para não atrasarem o arranque.
+THEME = "arc"
+DEFERRED_IMPORTS = ["ttkthemes", "tkcalendar", "plyer"]
+
+# Filtros da barra de pesquisa: opção "todas" e intervalos de prazo (data de hoje -> (de, até))
+SEARCH_ALL = "Todas"
+SORT_MANUAL = "Ordem do quadro"  # Sem ordenação: as tarefas aparecem pela ordem da coluna
+DEADLINE_FILTERS = {
+    "Qualquer prazo": lambda today: (None, None),
+    "Atrasadas": lambda today: (date.min, today - timedelta(days=1)),
+    "Próximos 7 dias": lambda today: (today, today + timedelta(days=7)),
+    "Próximos 30 dias": lambda today: (today, today + timedelta(days=30)),
+}
+
+# Arquivo frio: espera depois de uma tarefa chegar ao "Arquivado"/"Completo" e intervalo entre verificações (ms)
+ARCHIVE_DELAY = 5000
+ARCHIVE_INTERVAL = 3600 * 1000
+ARCHIVE_BROWSER_LIMIT = 500  # Linhas mostradas no navegador do arquivo
+UNDO_LIMIT = 1000  # Alterações guardadas para desfazer (um lote conta todas as suas alterações)
+METRICS_SAVE_INTERVAL = 60 * 1000  # Intervalo para gravar as métricas de fluxo (se mudaram)
+METRICS_DAYS = 30  # Dias mostrados na janela de métricas
+REMOTE_POLL_MS = 500  # Intervalo para aplicar as alterações de outras instâncias no mesmo quadro
+API_POLL_MS = 20  # Intervalo para executar os pedidos da API local no ciclo do Tk
+API_BUDGET = 0.02  # Tempo máximo (segundos) gasto com pedidos da API em cada passagem
+
+class StartupProfile:
     """
-    Representa uma tarefa no quadro Kanban.
+    Regista os tempos do arranque da aplicação (--profile-startup), a contar do início do main.py.
     """
-    def __init__(self, title: str, description: str, priority: str = "Médio", deadline: str = None):
-        self.title = title
-        self.description = description
-        self.status = "Para fazer"
-        self.priority = priority
-        self.deadline = deadline
-
-    def __str__(self):
-        deadline_info = f" (Deadline: {self.deadline})" if self.deadline else ""
-        return f"{self.title} - {self.description} [Priority: {self.priority}]{deadline_info}"
-
-    def to_dict(self): # Adiciona um método para converter a tarefa em um dicionário
-        return {
-            "Titulo": self.title,
-            "Descrição": self.description,
-            "Estado": self.status,
-            "Prioridade": self.priority,
-            "deadline": datetime.strptime(self.deadline, "%m/%d/%y").strftime("%m/%d/%y") if self.deadline else None
-        }
+    def __init__(self, started: float = STARTED):
+        self.started = started
+        self.marks = []
 
-    @staticmethod
-    def from_dict(data):
-        return Task(data["Titulo"], data["Descrição"], data["Prioridade"], data.get("deadline"))
-    
-    def get_deadline_date(self):
-        """
-        Converte a string 'deadline' para um objeto datetime.date.
-        Retorna None se a conversão falhar.
-        """
-        if not self.deadline:
-            return None
-        try:
-            return datetime.strptime(self.deadline, "%m/%d/%y").date()  # Corrige o erro de conversão
-        except ValueError:
-            print(f"⚠️ Erro ao processar a data da tarefa '{self.title}': {self.deadline}")
-            return None
+    def mark(self, name: str):
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self):
+        print("⏱️ Tempos de arranque:")
+        previous = self.started
+        for name, moment in sorted(self.marks, key=lambda mark: mark[1]):
+            print(f"   {name:<32} {(moment - self.started) * 1000:9.1f} ms  (+{(moment - previous) * 1000:.1f} ms)")
+            previous = moment
 
-class Column:
+class PerformanceMonitor:
     """
-    Representa a coluna no quadro Kanban.
+    Sobreposição de desempenho (F12) e exportação do trace (Ctrl+T).
+
+    Enquanto a medição está ligada, mede o atraso do ciclo de eventos do Tk (quanto um after()
+    de LAG_PROBE_MS chega atrasado) e, com a sobreposição visível, mostra os tempos dos pontos
+    medidos (ver instrumentation.py) e o número de cartões criados por coluna. Desligada, não
+    agenda nada e os pontos medidos só verificam instruments.enabled.
     """
-    def __init__(self, name: str):
-        self.name = name
-        self.tasks = []
-
-    # Adiciona um método para adicionar uma tarefa à coluna
-    def add_task(self, task: Task):
-        self.tasks.append(task)
-
-    # Adiciona um método para remover uma tarefa da coluna
-    def remove_task(self, task_title: str) -> Task:
-        for task in self.tasks:
-            if task.title == task_title:
-                self.tasks.remove(task)
-                return task
-        return None
+    LAG_PROBE_MS = 100
+    REFRESH_MS = 500
+    ROWS = 12  # Pontos medidos mostrados (os de maior tempo total)
+
+    def __init__(self, app, trace_path: str = None):
+        self.app = app
+        self.trace_path = trace_path  # --trace: medição ligada desde o arranque e trace gravado ao fechar
+        self.label = None
+        self.probe_job = None
+        self.refresh_job = None
+        self.lag_max = 0.0
+        app.root.bind("<F12>", self.toggle)
+        app.root.bind("<Control-t>", self.export_trace)
+        if trace_path:
+            self.start()
+
+    def start(self):
+        instruments.enable()
+        if self.probe_job is None:
+            self.schedule_probe()
+
+    def stop(self):
+        if self.trace_path:
+            return  # Continua a medir até a aplicação fechar
+        instruments.enable(False)
+        if self.probe_job is not None:
+            self.app.root.after_cancel(self.probe_job)
+            self.probe_job = None
+
+    def schedule_probe(self):
+        expected = time.perf_counter() + self.LAG_PROBE_MS / 1000
+        self.probe_job = self.app.root.after(self.LAG_PROBE_MS, lambda: self.probe(expected))
+
+    def probe(self, expected: float):
+        lag = max(time.perf_counter() - expected, 0.0) * 1000
+        self.lag_max = max(self.lag_max, lag)
+        instruments.count("atraso do ciclo Tk (ms)", round(lag, 1))
+        self.schedule_probe()
+
+    # Adiciona um novo método para mostrar ou esconder a sobreposição de desempenho
+    def toggle(self, event=None):
+        if self.label is None:
+            self.start()
+            self.label = tk.Label(self.app.root, font=("Courier", 9), justify="left", anchor="nw",
+                                  background="#1e1e1e", foreground="#7CFC00", padx=8, pady=6)
+            self.label.place(relx=1.0, rely=0.0, x=-10, y=10, anchor="ne")
+            self.refresh()
+        else:
+            self.app.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+            self.label.destroy()
+            self.label = None
+            self.stop()
+
+    def refresh(self):
+        views = self.app.column_views
+        for column_name, view in views.items():
+            instruments.count(f"cartões: {column_name}", len(view.visible) + len(view.pool))
+        stats, counters = instruments.snapshot()
+        lines = [f"{'ponto medido':<34}{'n':>7}{'média':>9}{'máx':>9}{'total':>10}"]
+        for name, count, total, average, maximum, last in stats[:self.ROWS]:
+            lines.append(f"{name[-34:]:<34}{count:>7}{average * 1000:>7.2f}ms{maximum * 1000:>7.1f}ms{total * 1000:>8.0f}ms")
+        lines.append("")
+        lines.append(f"atraso do ciclo Tk: {counters.get('atraso do ciclo Tk (ms)', 0):.1f} ms (máx {self.lag_max:.1f} ms)")
+        lines.append("cartões: " + "  ".join(f"{column_name} {len(view.visible)}/{len(view.visible) + len(view.pool)}"
+                                             for column_name, view in views.items()))
+        lines.append(f"tarefas no quadro: {len(self.app.board.tasks)}    F12 esconder · Ctrl+T exportar trace")
+        self.label.configure(text="\n".join(lines))
+        self.label.lift()
+        self.refresh_job = self.app.root.after(self.REFRESH_MS, self.refresh)
+
+    # Adiciona um novo método para exportar o trace (Chrome trace JSON)
+    def export_trace(self, event=None, path: str = None):
+        if not instruments.enabled and not instruments.events:
+            self.app.status_label.configure(text="Ative a medição (F12) antes de exportar o trace.")
+            return
+        path = path or filedialog.asksaveasfilename(title="Exportar trace", defaultextension=".json",
+                                                    initialfile="kanban_trace.json", filetypes=[("Chrome trace", "*.json")])
+        if not path:
+            return
+        try:
+            count = instruments.export_chrome_trace(path)
+            print(f"📈 Trace exportado: {count} eventos em '{path}'.")
+        except Exception as e:
+            print(f"❌ Erro ao exportar o trace: {e}")
 
-class Board:
+def priority_color(priority: str) -> str:
+    return "#FF0000" if priority == "Alta" else "#b3b300" if priority == "Médio" else "#FFEA00" if priority == "Baixo" else "#008000"
 
+class TaskCard:
     """
-    Representa o Kanban board.
+    Representa o cartão (widgets) de uma tarefa numa coluna.
+    O cartão é reutilizado para outras tarefas à medida que a coluna é percorrida,
+    e guarda o último estado desenhado para só reconfigurar os widgets que mudaram.
     """
-    def __init__(self):
-        
-        # Adiciona um dicionário para armazenar as colunas
-        self.columns = {
-            "Para fazer": Column("Para fazer"),
-            "Em Progresso": Column("Em Progresso"),
-            "Completo": Column("Completo"),
-            "Arquivado": Column("Arquivado")
-        }
-    
-    # Adiciona um método para adicionar uma tarefa ao quadro
-    def add_task(self, task: Task):
-        self.columns["Para fazer"].add_task(task)
-
-    # Adiciona um método para mover uma tarefa entre colunas
-    def move_task(self, task_title: str, from_column: str, to_column: str) -> bool:
-        if from_column in self.columns and to_column in self.columns:
-            task_to_move = self.columns[from_column].remove_task(task_title)
-            if task_to_move:
-                task_to_move.status = to_column
-                self.columns[to_column].add_task(task_to_move)
-                return True
-        return False
-
-        print(f"Erro: Uma das colunas '{from_column}' ou '{to_column}' não existe.")
-        return False
+    DESCRIPTION_LIMIT = 140  # Caracteres da descrição mostrados no cartão (o texto completo está na edição)
+
+    def __init__(self, app, view):
+        self.task_id = None
+        self.state = None
+
+        self.frame = ttk.Frame(view.canvas, relief=tk.RAISED, padding=5, style="Card.TFrame")
+        self.title_label = ttk.Label(self.frame, font=("Helvetica", 14, "bold"), foreground="#333333")
+        self.title_label.pack(anchor="w")
+        self.desc_label = ttk.Label(self.frame, font=("Helvetica", 10), foreground="#555555", wraplength=250, justify="left")
+        self.desc_label.pack(anchor="w", pady=(0, 5))
+        self.priority_label = ttk.Label(self.frame, font=("Helvetica", 9, "italic"))
+        self.priority_label.pack(anchor="w")
+        self.deadline_label = ttk.Label(self.frame, font=("Helvetica", 9, "italic"), foreground="#777777")
+        self.window = view.canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+
+        # Os eventos resolvem a tarefa pelo id no momento do clique, porque o cartão é reutilizado
+        for widget in [self.frame, self.title_label, self.desc_label]:
+            widget.bind("<ButtonPress-1>", lambda event: app.start_drag(event, self.task_id))
+            widget.bind("<B1-Motion>", app.drag_motion)
+            widget.bind("<ButtonRelease-1>", app.drop_task)
+
+        # Ctrl+clique seleciona várias tarefas (para as ações em lote do menu de contexto)
+        for widget in [self.frame, self.title_label, self.desc_label, self.priority_label, self.deadline_label]:
+            widget.bind("<Control-Button-1>", lambda event: app.toggle_selection(self.task_id))
+
+        # Adiciona eventos de clique duplo para editar a tarefa
+        self.frame.bind("<Double-Button-1>", lambda event: app.edit_task_window(self.task))
+        self.frame.bind("<Button-3>", lambda event: app.show_context_menu(event, self.task))
+
+        for widget in [self.frame, self.title_label, self.desc_label, self.priority_label, self.deadline_label]:
+            view.bind_scroll(widget)
+
+        self.app = app
+
+    @property
+    def task(self):
+        return self.app.board.get_task(self.task_id)
+
+    def assign(self, task):
+        """
+        Associa o cartão a uma tarefa e desenha-a.
+        """
+        if task.id != self.task_id:
+            self.task_id = task.id
+        self.render(task)
 
+    def render(self, task):
+        """
+        Atualiza os widgets do cartão se os dados da tarefa mudaram.
+        """
+        selected = task.id in self.app.selected
+        state = (task.title, task.description, task.priority, task.deadline, selected)
+        if state == self.state:
+            return
+        old = self.state or (None, None, None, None, None)
+        self.state = state
+
+        if selected != old[4]:
+            self.frame.configure(relief=tk.SOLID if selected else tk.RAISED, borderwidth=3 if selected else 1)
+
+        if task.title != old[0]:
+            self.title_label.configure(text=task.title)
+        if task.description != old[1]:
+            description = task.description
+            if len(description) > self.DESCRIPTION_LIMIT:
+                description = description[:self.DESCRIPTION_LIMIT].rstrip() + "…"
+            self.desc_label.configure(text=description)
+        if task.priority != old[2]:
+            self.priority_label.configure(text=f"Prioridade: {task.priority}", foreground=priority_color(task.priority))
+        if task.deadline != old[3]:
+            if task.deadline:
+                self.deadline_label.configure(text=f"Deadline: {task.deadline}")
+                self.deadline_label.pack(anchor="w")
+            else:
+                self.deadline_label.pack_forget()
 
-    def to_dict(self):
-        return {column_name: [task.to_dict() for task in column.tasks] for column_name, column in self.columns.items()}
+class VirtualColumnView:
+    """
+    Vista de uma coluna com scroll que só cria widgets para os cartões visíveis.
 
-    @staticmethod
-    def from_dict(data):
-        board = Board()
-        for column_name, tasks in data.items():
-            for task_data in tasks:
-                board.columns[column_name].add_task(Task.from_dict(task_data))
-        return board
+    Cada cartão ocupa uma linha de altura fixa num Canvas. Apenas as tarefas dentro da
+    área visível (mais uma pequena margem) têm um TaskCard associado; ao fazer scroll,
+    os cartões que saem da área visível são reutilizados para as tarefas que entram.
 
-class TaskAlert: # Nova tarefa implementada para alerta de prazo
+    A coluna pode ser mostrada ordenada (ver SORT_KEYS): a vista mantém então um SortedTasks,
+    atualizado por 'track' a cada alteração, em vez de reordenar a coluna sempre que é desenhada.
     """
-    Representa a classe que gera o alerta em caso da tarefa(s) estar(em) a aproximar-se do deadline.
-    """
-    def __init__(self, board, days_before_alert=10): # Adiciona um novo parâmetro para definir os dias antes do alerta
-        self.board = board
-        self.days_before_alert = days_before_alert
-    
-    def load_tasks_from_json(self):
+    ROW_HEIGHT = 140  # Altura de cada cartão, incluindo o espaçamento
+    CARD_PADDING = 5
+    OVERSCAN = 3      # Cartões extra desenhados acima e abaixo da área visível
+
+    def __init__(self, app, parent, column_name: str):
+        self.app = app
+        self.column_name = column_name
+        self.visible = {}  # id da tarefa -> TaskCard desenhado
+        self.pool = []     # TaskCards livres para reutilizar
+        self.drop_marker = None  # Linha que indica onde a tarefa arrastada vai ficar
+        self.filtered = None     # Tarefas da coluna que correspondem à pesquisa (None: sem filtro)
+        self.sort_order = None   # Nome da ordenação (ver SORT_KEYS), ou None para a ordem da coluna
+        self.sorted = None       # SortedTasks da coluna, com uma ordenação escolhida
+
+        self.frame = ttk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, width=280, highlightthickness=0, borderwidth=0)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda event: self.render_visible(force=True))
+        self.bind_scroll(self.canvas)
+
+    @property
+    def tasks(self):
+        if self.filtered is not None:
+            return self.filtered
+        return self.ordered_tasks
+
+    @property
+    def ordered_tasks(self):
+        # Durante o carregamento, as tarefas entram na coluna sem eventos: a ordenação é refeita em attach_board
+        if self.sorted is not None and not self.app.loading:
+            return self.sorted
+        return self.app.board.columns[self.column_name].tasks
+
+    # Adiciona um novo método para escolher a ordenação da coluna
+    def set_sort(self, order: str = None):
+        self.sort_order = order if order in SORT_KEYS else None
+        self.rebuild_sort()
+        self.refresh()
+
+    def rebuild_sort(self):
         """
-        Lê o JSON e retorna uma lista de tarefas que possuem deadline.
+        Ordena a coluna de raiz (ao escolher a ordenação ou ao mudar de quadro).
         """
-        try:
-            with open("kanban_board.json", "r") as file:
-                data = json.load(file)
-                tasks_with_deadline = []
-
-                for column_tasks in data.values():  # Itera diretamente sobre os valores do JSON
-                    for task_data in column_tasks:
-                        task = Task.from_dict(task_data)
-                        if task.deadline:  # Só adiciona tarefas com prazo
-                            tasks_with_deadline.append(task)
-
-                return tasks_with_deadline  # Retorna apenas as tarefas relevantes
-        except FileNotFoundError:
-            print("⚠️ Arquivo JSON não encontrado.")
-            return []
-        except Exception as e:
-            print(f"❌ Erro ao carregar tarefas do JSON: {e}")
-            return []
+        column = self.app.board.columns[self.column_name]
+        self.sorted = SortedTasks(SORT_KEYS[self.sort_order], column.tasks) if self.sort_order else None
 
-    # Adiciona um novo método para verificar os prazos das tarefas
-    def check_deadlines(self):
+    # Adiciona um novo método para manter a coluna ordenada a cada alteração
+    def track(self, change) -> bool:
         """
-        Percorre todas as tarefas do quadro e verifica se alguma está próxima do prazo definido.
+        Atualiza a ordenação com uma alteração simples do quadro. Devolve True se uma tarefa editada
+        mudou de posição (e a coluna tem de ser redesenhada).
         """
-        today = datetime.today().date()  # Converte para 'date' corretamente
-        tasks_with_deadline = self.load_tasks_from_json()  # Carrega direto do JSON
+        if self.sorted is None:
+            return False
+        task = change.task
+        if change.kind == "update":
+            return ("priority" in change.changes or "deadline" in change.changes) and self.sorted.update(task)
+        if change.kind == "remove" or (change.kind == "move" and change.from_column == self.column_name != change.column):
+            self.sorted.discard(task.id)
+        elif change.column == self.column_name and task.id not in self.sorted:
+            self.sorted.add(task)
+        return False
 
-        for task in tasks_with_deadline:
-            deadline_date = task.get_deadline_date()  # Método que converte a string
+    def bind_scroll(self, widget):
+        widget.bind("<MouseWheel>", self.on_mousewheel)
+        widget.bind("<Button-4>", lambda event: self.scroll(-1))
+        widget.bind("<Button-5>", lambda event: self.scroll(1))
 
-            if deadline_date:
-                days_remaining = (deadline_date - today).days
+    def on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
 
-                print(f"🔍 Verificando: {task.title} (Prazo: {task.deadline}, Restam: {days_remaining} dias)")
+    def scroll(self, units):
+        self.canvas.yview_scroll(units, "units")
+        self.render_visible()
 
-                if 0 <= days_remaining <= self.days_before_alert:
-                    print(f"🚨 ALERTA: '{task.title}' está prestes a vencer!")
-                    self.show_alert(task.title, days_remaining)
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.render_visible()
 
-    # Adiciona um novo método para exibir o alerta
-    def show_alert(self, task_title, days_remaining):
+    def refresh(self):
+        """
+        Atualiza a vista depois de a coluna (ou a pesquisa) ter mudado.
+        Com uma pesquisa ativa, só as tarefas encontradas entram na vista.
         """
-        Exibe um alerta informando quantos dias faltam para o prazo da tarefa.
+        matches = self.app.search_matches
+        if matches is None:
+            self.filtered = None
+        else:
+            self.filtered = [task for task in self.ordered_tasks if task.id in matches]
+        height = len(self.tasks) * self.ROW_HEIGHT
+        self.canvas.configure(scrollregion=(0, 0, 0, height), yscrollincrement=self.ROW_HEIGHT // 4)
+        self.render_visible(force=True)
+
+    @timed()
+    def render_visible(self, force=False):
         """
-        message = f"A tarefa '{task_title}' está prestes a vencer! Faltam {days_remaining} dia(s)."
+        Associa cartões às tarefas visíveis, reutilizando os que saíram da área visível.
+        """
+        tasks = self.tasks
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), self.ROW_HEIGHT)
+        first = max(int(top // self.ROW_HEIGHT) - self.OVERSCAN, 0)
+        last = min(int(bottom // self.ROW_HEIGHT) + 1 + self.OVERSCAN, len(tasks))
+        window = tasks[first:last]
+        wanted = {task.id for task in window}
+
+        for task_id in [task_id for task_id in self.visible if task_id not in wanted]:
+            card = self.visible.pop(task_id)
+            self.canvas.itemconfigure(card.window, state="hidden")
+            self.pool.append(card)
+
+        width = max(self.canvas.winfo_width() - 2 * self.CARD_PADDING, 1)
+        for offset, task in enumerate(window):
+            card = self.visible.get(task.id)
+            if card is None:
+                card = self.pool.pop() if self.pool else TaskCard(self.app, self)
+                self.visible[task.id] = card
+                card.assign(task)
+                force = True
+            else:
+                card.render(task)
+            if force:
+                y = (first + offset) * self.ROW_HEIGHT + self.CARD_PADDING
+                self.canvas.coords(card.window, self.CARD_PADDING, y)
+                self.canvas.itemconfigure(card.window, state="normal", width=width, height=self.ROW_HEIGHT - 2 * self.CARD_PADDING)
+
+    def card_for(self, task_id):
+        return self.visible.get(task_id)
+
+    def drop_index(self, y_root: int) -> int:
+        """
+        Devolve a posição na coluna onde uma tarefa largada na coordenada (do ecrã) y_root fica.
+        """
+        y = self.canvas.canvasy(y_root - self.canvas.winfo_rooty())
+        return max(0, min(int((y + self.ROW_HEIGHT / 2) // self.ROW_HEIGHT), len(self.tasks)))
+
+    def show_drop_marker(self, index: int):
+        if self.sort_order is not None:
+            return  # Numa coluna ordenada, a posição da tarefa é dada pela ordenação
+        y = index * self.ROW_HEIGHT + 1
+        if self.drop_marker is None:
+            self.drop_marker = self.canvas.create_line(0, y, self.canvas.winfo_width(), y, fill="#3B82F6", width=3)
+        else:
+            self.canvas.coords(self.drop_marker, 0, y, self.canvas.winfo_width(), y)
+            self.canvas.itemconfigure(self.drop_marker, state="normal")
+        self.canvas.tag_raise(self.drop_marker)
+
+    def hide_drop_marker(self):
+        if self.drop_marker is not None:
+            self.canvas.itemconfigure(self.drop_marker, state="hidden")
+
+class DragEngine:
+    """
+    Arrasto de tarefas entre colunas (e dentro da mesma coluna, para as reordenar).
 
-        print(f"🔔 Tentando exibir notificação: {task_title} ({days_remaining} dias restantes)")
+    - O arrasto só começa quando o rato se afasta THRESHOLD píxeis do clique, por isso
+      cliques e duplos cliques não criam nada.
+    - A janela que segue o rato (ghost) é criada no primeiro arrasto e depois reutilizada.
+    - Os movimentos do rato são agrupados e aplicados no máximo uma vez por FRAME_MS.
+    - As áreas das colunas no ecrã ficam em cache até a janela mudar (<Configure>).
+    """
+    THRESHOLD = 5   # Píxeis que o rato tem de andar para começar o arrasto
+    FRAME_MS = 16   # Intervalo mínimo entre atualizações do ghost (~60 fps)
+
+    def __init__(self, app):
+        self.app = app
+        self.task_id = None
+        self.press = None        # Posição (x_root, y_root) do clique
+        self.pointer = None      # Última posição do rato ainda por aplicar
+        self.dragging = False
+        self.pending = None      # after() da próxima atualização
+        self.target = None       # (coluna, posição) onde a tarefa vai ser largada
+        self.ghost = None
+        self.bboxes = None       # Nome da coluna -> (x1, y1, x2, y2) no ecrã
+        app.root.bind("<Configure>", self.invalidate, add="+")
+
+    def invalidate(self, event=None):
+        self.bboxes = None
+
+    def column_at(self, x_root: int, y_root: int):
+        if self.bboxes is None:
+            self.bboxes = {}
+            for column_name, frame in self.app.column_frames.items():
+                x, y = frame.winfo_rootx(), frame.winfo_rooty()
+                self.bboxes[column_name] = (x, y, x + frame.winfo_width(), y + frame.winfo_height())
+        for column_name, (x1, y1, x2, y2) in self.bboxes.items():
+            if x1 <= x_root <= x2 and y1 <= y_root <= y2:
+                return column_name
+        return None
+
+    @timed()
+    def on_press(self, event, task_id):
+        self.cancel()
+        self.task_id = task_id
+        self.press = (event.x_root, event.y_root)
+
+    @timed()
+    def on_motion(self, event):
+        if self.press is None:
+            return
+        self.pointer = (event.x_root, event.y_root)
+        if not self.dragging:
+            if abs(event.x_root - self.press[0]) < self.THRESHOLD and abs(event.y_root - self.press[1]) < self.THRESHOLD:
+                return
+            if not self.start():
+                return
+        if self.pending is None:
+            self.pending = self.app.root.after(self.FRAME_MS, self.update)
+
+    @timed()
+    def on_release(self, event):
+        if self.dragging:
+            self.pointer = (event.x_root, event.y_root)
+            self.update()
+            task = self.app.board.get_task(self.task_id)
+            if task is not None and self.target is not None:
+                to_column, index = self.target
+                view = self.app.column_views[to_column]
+                tasks = view.tasks  # Só as tarefas visíveis, se houver pesquisa
+                if view.sort_order is not None:
+                    # Numa coluna ordenada, a tarefa vai para o fim da coluna e aparece no lugar dado pela ordenação
+                    before, unchanged = None, to_column == task.status
+                else:
+                    before = tasks[index].id if index < len(tasks) else None
+                    # Largar a tarefa no mesmo sítio não é uma alteração
+                    unchanged = to_column == task.status and (before == task.id or (index > 0 and tasks[index - 1].id == task.id))
+                if not unchanged:
+                    self.app.board.move_task(task.id, to_column, before)
+        self.cancel()
+
+    def start(self) -> bool:
+        """
+        Começa o arrasto: mostra o ghost com os dados da tarefa.
+        """
+        task = self.app.board.get_task(self.task_id)
+        if task is None or not self.app.board_ready():
+            self.cancel()
+            return False
+        if self.ghost is None:
+            self.create_ghost()
+        description = task.description
+        if len(description) > TaskCard.DESCRIPTION_LIMIT:
+            description = description[:TaskCard.DESCRIPTION_LIMIT].rstrip() + "…"
+        self.ghost_title.configure(text=task.title)
+        self.ghost_desc.configure(text=description)
+        self.ghost_priority.configure(text=f"Prioridade: {task.priority}", foreground=priority_color(task.priority))
+        if task.deadline:
+            self.ghost_deadline.configure(text=f"Deadline: {task.deadline}")
+            self.ghost_deadline.pack(anchor="w")
+        else:
+            self.ghost_deadline.pack_forget()
+        self.ghost.geometry(f"+{self.pointer[0]}+{self.pointer[1]}")
+        self.ghost.deiconify()
+        self.ghost.lift()
+        self.dragging = True
+        return True
+
+    def create_ghost(self):
+        self.ghost = tk.Toplevel(self.app.root)
+        self.ghost.withdraw()
+        self.ghost.overrideredirect(True)  # Remove bordas da janela
+        frame = ttk.Frame(self.ghost, relief=tk.RAISED, padding=5, borderwidth=2)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.ghost_title = ttk.Label(frame, font=("Helvetica", 14, "bold"), foreground="#333333")
+        self.ghost_title.pack(anchor="w")
+        self.ghost_desc = ttk.Label(frame, font=("Helvetica", 10), foreground="#555555", wraplength=250, justify="left")
+        self.ghost_desc.pack(anchor="w", pady=(0, 5))
+        self.ghost_priority = ttk.Label(frame, font=("Helvetica", 9, "italic"))
+        self.ghost_priority.pack(anchor="w")
+        self.ghost_deadline = ttk.Label(frame, font=("Helvetica", 9, "italic"), foreground="#777777")
+
+    @timed()
+    def update(self):
+        """
+        Aplica a última posição do rato: move o ghost e mostra onde a tarefa vai ficar.
+        """
+        self.pending = None
+        if not self.dragging or self.pointer is None:
+            return
+        x_root, y_root = self.pointer
+        self.ghost.geometry(f"+{x_root + 8}+{y_root + 8}")
+
+        column_name = self.column_at(x_root, y_root)
+        target = None
+        if column_name is not None:
+            target = (column_name, self.app.column_views[column_name].drop_index(y_root))
+        if target != self.target:
+            if self.target is not None and (target is None or target[0] != self.target[0]):
+                self.app.column_views[self.target[0]].hide_drop_marker()
+            if target is not None:
+                self.app.column_views[target[0]].show_drop_marker(target[1])
+            self.target = target
+
+    def cancel(self):
+        """
+        Termina o arrasto (largado ou interrompido) e esconde o ghost.
+        """
+        if self.pending is not None:
+            self.app.root.after_cancel(self.pending)
+            self.pending = None
+        if self.target is not None:
+            self.app.column_views[self.target[0]].hide_drop_marker()
+        if self.ghost is not None and self.dragging:
+            self.ghost.withdraw()
+        self.task_id = None
+        self.press = None
+        self.pointer = None
+        self.target = None
+        self.dragging = False
 
-        # Notificação nativa do Windows
-        try:
-            notification.notify(
-                title="Alerta de Prazo",
-                message=message,
-                app_name="Kanban Board",
-                timeout=10  # Duração da notificação em segundos
-            )
-            print("✅ Notificação enviada com sucesso.") # Confirmação de envio || Usado para debug e testes
-        except Exception as e:
-            print(f"❌ Erro ao exibir notificação: {e}") # Mensagem de erro || Usado para debug e testes
-            messagebox.showwarning("Alerta de Prazo", message)
-        
 class ui:
     # Adiciona um novo estilo para os widgets
     def setup_ui(self):
@@ -197,17 +582,37 @@ class ui:
         button_frame = ttk.Frame(top_frame)
         button_frame.grid(row=1, column=0, sticky="ew", columnspan=10, pady=10)
 
-        button_frame.columnconfigure((0, 1, 2), weight=1)
+        button_frame.columnconfigure((0, 1, 2, 3), weight=1)
 
         buttons = [
             ("Adicionar tarefa", self.add_task),
-            ("Carregar quadro", self.load_board)
+            ("Carregar quadro", self.load_board),
+            ("Arquivar completas", self.archive_completed),
+            ("Ver arquivo", self.archive_browser),
+            ("Métricas", self.metrics_view)
         ]
 
         # Adiciona botões ao quadro
         for i, (text, command) in enumerate(buttons):
             ttk.Button(button_frame, text=text, command=command).grid(row=0, column=i, padx=5, pady=5)
 
+        # Seletor do quadro ativo (quando o espaço de trabalho tem vários quadros)
+        column = len(buttons)
+        if len(self.workspace.entries) > 1:
+            ttk.Label(button_frame, text="Quadro:").grid(row=0, column=column, padx=(10, 2))
+            self.board_selector = ttk.Combobox(button_frame, values=self.workspace.names(), state="readonly", width=20)
+            self.board_selector.set(self.workspace.active)
+            self.board_selector.bind("<<ComboboxSelected>>", lambda event: self.switch_board(self.board_selector.get()))
+            self.board_selector.grid(row=0, column=column + 1, padx=5)
+            column += 2
+
+        # Estado e progresso do carregamento do quadro
+        self.status_label = ttk.Label(button_frame, text="", foreground="#777777")
+        self.status_label.grid(row=0, column=column, padx=10, sticky="w")
+        self.load_progress = ttk.Progressbar(button_frame, mode="determinate", length=200, maximum=100)
+        self.load_progress.grid(row=0, column=column + 1, padx=5)
+        self.load_progress.grid_remove()
+
         # Mostrar data e hora
         current_date = datetime.now().strftime("%d/%m/%Y")
         ttk.Label(top_frame, text=f"Data: \n{current_date}", font=("Arial", 12, "bold"), foreground="#4A4A4A").grid(row=1, column=10, padx=10, sticky="e")
@@ -217,7 +622,9 @@ class ui:
         self.board_frame = ttk.Frame(self.root)
         self.board_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
         self.board_frame.columnconfigure((0, 1, 2, 3), weight=1)
+        self.board_frame.rowconfigure(0, weight=1)
         self.column_frames = {}
+        self.column_views = {}  # Nome da coluna -> VirtualColumnView com os cartões
 
         # Cria um frame para cada coluna no quadro
         for column_name in self.board.columns:
@@ -228,65 +635,135 @@ class ui:
         # Adiciona os frames ao grid
         for i, (column_name, frame) in enumerate(self.column_frames.items()):
             frame.grid(row=0, column=i, sticky="nsew", padx=5, pady=5)
-            for column_name, frame in self.column_frames.items():
-                frame.column_name = column_name  # Atribui o nome da coluna ao frame          
-            
-                self.update_column_ui(column_name)
+            self.update_column_ui(column_name)
 
         top_frame.columnconfigure(0, weight=1)
         top_frame.columnconfigure(5, weight=1)
+        self.setup_search_bar(top_frame)
          
-    # Adiciona um novo método para atualizar a interface do utilizador
-    def update_column_ui(self, column_name: str):
+    # Adiciona um novo método para criar a barra de pesquisa e filtros
+    def setup_search_bar(self, parent):
         """
-        Atualiza a interface do utilizador para uma coluna específica.
+        Cria a barra de pesquisa: texto (título e descrição), prioridade, coluna e prazo.
         """
+        search_frame = ttk.Frame(parent)
+        search_frame.grid(row=2, column=0, columnspan=11, sticky="ew", pady=(0, 5))
+
+        ttk.Label(search_frame, text="Pesquisar:").pack(side=tk.LEFT, padx=5)
+        self.search_text = tk.StringVar()
+        self.search_text.trace_add("write", lambda *args: self.schedule_search())
+        ttk.Entry(search_frame, textvariable=self.search_text, width=40).pack(side=tk.LEFT, padx=5)
+
+        self.search_priority = ttk.Combobox(search_frame, values=[SEARCH_ALL, "Baixo", "Médio", "Alta"], state="readonly", width=10)
+        self.search_status = ttk.Combobox(search_frame, values=[SEARCH_ALL] + list(self.board.columns), state="readonly", width=14)
+        self.search_deadline = ttk.Combobox(search_frame, values=list(DEADLINE_FILTERS), state="readonly", width=16)
+        for label, combobox in [("Prioridade:", self.search_priority), ("Coluna:", self.search_status), ("Prazo:", self.search_deadline)]:
+            ttk.Label(search_frame, text=label).pack(side=tk.LEFT, padx=(10, 2))
+            combobox.current(0)
+            combobox.bind("<<ComboboxSelected>>", lambda event: self.schedule_search())
+            combobox.pack(side=tk.LEFT)
+
+        ttk.Button(search_frame, text="Limpar", command=self.clear_search).pack(side=tk.LEFT, padx=10)
+        self.search_label = ttk.Label(search_frame, text="", foreground="#777777")
+        self.search_label.pack(side=tk.LEFT, padx=5)
+
+    # Adiciona um novo método para ler os filtros da barra de pesquisa
+    def search_filters(self) -> dict:
+        priority = self.search_priority.get()
+        status = self.search_status.get()
+        deadline_from, deadline_to = DEADLINE_FILTERS[self.search_deadline.get()](date.today())
+        return {
+            "text": self.search_text.get().strip(),
+            "priority": None if priority == SEARCH_ALL else priority,
+            "status": None if status == SEARCH_ALL else status,
+            "deadline_from": deadline_from,
+            "deadline_to": deadline_to,
+        }
+
+    # Adiciona um novo método para pesquisar só depois de o utilizador parar de escrever
+    def schedule_search(self):
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(150, self.apply_search)
 
-        # Limpar o frame antes de adicionar novos widgets
-        column_frame = self.column_frames[column_name]
-        for widget in column_frame.winfo_children():
-            widget.destroy()
+    # Adiciona um novo método para aplicar a pesquisa às colunas
+    @timed()
+    def apply_search(self):
+        """
+        Pesquisa no índice e redesenha as colunas só com as tarefas encontradas.
+        """
+        self.search_job = None
+        filters = self.search_filters()
+        if any(value is not None and value != "" for value in filters.values()):
+            if not self.search_index.built:
+                # A pesquisa é repetida quando o índice ficar completo
+                self.search_label.configure(text="A indexar tarefas...")
+                self.build_search_index()
+                return
+            matches = self.search_index.search(**filters)
+            self.search_label.configure(text=f"{len(matches)} resultado(s)")
+        else:
+            self.search_label.configure(text="")
+            if self.search_matches is None:
+                return
+            matches = None
+        self.search_matches = matches
+        for column_name in self.board.columns:
+            self.update_column_ui(column_name)
 
-        ttk.Label(column_frame, text=column_name, font=("Arial", 16, "bold"), foreground="#4A4A4A").pack(pady=10)
+    # Adiciona um novo método para limpar a pesquisa
+    def clear_search(self):
+        self.search_text.set("")
+        for combobox in [self.search_priority, self.search_status, self.search_deadline]:
+            combobox.current(0)
+        self.apply_search()
 
-        task_container = ttk.Frame(column_frame)
-        task_container.pack(fill=tk.BOTH, expand=True)
+    # Adiciona um novo método para construir o índice de pesquisa aos poucos
+    def build_search_index(self):
+        """
+        Indexa as tarefas em fatias de alguns milissegundos no ciclo do Tk, sem bloquear a interface.
+        """
+        if self.search_build_job is not None:
+            return
 
-        # Adiciona uma tarefa ao quadro
-        for task in self.board.columns[column_name].tasks:
-            task_widget = ttk.Frame(task_container, relief=tk.RAISED, padding=5, style="Card.TFrame")
-            task_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        def step():
+            if self.search_index.build_step(time.perf_counter() + 0.02):
+                self.search_build_job = None
+                self.apply_search()
+            else:
+                self.search_build_job = self.root.after(10, step)
 
-            title_label = ttk.Label(task_widget, text=task.title, font=("Helvetica", 14, "bold"), foreground="#333333")
-            title_label.pack(anchor="w")
-            
-            desc_label = ttk.Label(task_widget, text=task.description, font=("Helvetica", 10), foreground="#555555", wraplength=250, justify="left")
-            desc_label.pack(anchor="w", pady=(0, 5))
+        self.search_build_job = self.root.after(0, step)
 
-            for label in [title_label, desc_label]:
-                label.bind("<ButtonPress-1>", lambda event, t=task, w=task_widget, c=column_name: self.start_drag(event, t, w, c))
-                label.bind("<B1-Motion>", self.drag_motion)
-                label.bind("<ButtonRelease-1>", self.drop_task)
+    # Adiciona um novo método para atualizar a interface do utilizador
+    @timed()
+    def update_column_ui(self, column_name: str):
+        """
+        Atualiza a interface do utilizador para uma coluna específica.
 
-          
-            priority_color = "#FF0000" if task.priority == "Alta" else "#b3b300" if task.priority == "Médio" else "#FFEA00" if task.priority == "Baixo" else "#008000"
-            ttk.Label(task_widget, text=f"Prioridade: {task.priority}", font=("Helvetica", 9, "italic"), foreground=priority_color).pack(anchor="w")
+        A coluna é desenhada por uma VirtualColumnView, que só cria e atualiza os cartões
+        das tarefas visíveis; os restantes são desenhados à medida que se faz scroll.
+        """
+        view = self.column_views.get(column_name)
+        if view is None:
+            column_frame = self.column_frames[column_name]
+            ttk.Label(column_frame, text=column_name, font=("Arial", 16, "bold"), foreground="#4A4A4A").pack(pady=(10, 2))
+            view = VirtualColumnView(self, column_frame, column_name)
+            sort_selector = ttk.Combobox(column_frame, values=[SORT_MANUAL, *SORT_KEYS], state="readonly", width=16)
+            sort_selector.set(SORT_MANUAL)
+            sort_selector.bind("<<ComboboxSelected>>", lambda event: view.set_sort(sort_selector.get()))
+            sort_selector.pack(pady=(0, 5))
+            view.frame.pack(fill=tk.BOTH, expand=True)
+            self.column_views[column_name] = view
+        view.refresh()
 
-            if task.deadline:
-                ttk.Label(task_widget, text=f"Deadline: {task.deadline}", font=("Helvetica", 9, "italic"), foreground="#777777").pack(anchor="w")
-
-            # Adiciona eventos de clique duplo para editar a tarefa
-            task_widget.bind("<ButtonPress-1>", lambda event, t=task, w=task_widget, c=column_name: self.start_drag(event, t, w, c))
-            task_widget.bind("<B1-Motion>", self.drag_motion)
-            task_widget.bind("<ButtonRelease-1>", self.drop_task)
-            task_widget.bind("<Double-Button-1>", lambda event, t=task: self.edit_task_window(t))
-            task_widget.bind("<Button-3>", lambda event, t=task: self.show_context_menu(event, t))
-            
     # Adiciona um novo método para adicionar uma nova tarefa
     def add_task(self):
         """
         Adiciona uma nova tarefa à coluna 'Para fazer'.
         """
+        if not self.board_ready():
+            return
         
         def newWindow():
             """
@@ -311,7 +788,7 @@ class ui:
             priority_combobox.pack(pady=5)
 
             ttk.Label(window, text="Deadline:").pack(pady=5)
-            deadline = DateEntry(window, width=20, background="blue", foreground="white", borderwidth=2)
+            deadline = self.date_entry(window)
             deadline.pack(pady=15)
 
             # Botão para salvar a tarefa
@@ -329,9 +806,7 @@ class ui:
                     return
 
                 new_task = Task(title, description, priority, deadline_date)
-                self.board.add_task(new_task)
-                self.update_column_ui("Para fazer")
-                self.auto_save_board()
+                self.board.add_task(new_task)  # A interface, a persistência e os alertas são atualizados pelo evento
 
                 # Fecha a janela após salvar a tarefa
                 window.destroy()
@@ -342,38 +817,523 @@ class ui:
         newWindow()
 
     # Adiciona um novo método para salvar o quadro automaticamente
-    def auto_save_board(self):
+    @timed()
+    def auto_save_board(self, event):
         """
-        Salva automaticamente as tarefas no ficheiro JSON.
+        Marca a alteração para ser gravada em segundo plano, compactando o journal quando necessário.
         """
         try:
-            with open("kanban_board.json", "w") as file:
-                json.dump(self.board.to_dict(), file, indent=4)
+            self.storage.append(BoardStorage.record_for(event), BoardStorage.undo_record_for(event))
+            if self.storage.should_compact():
+                self.storage.compact(self.board)
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao salvar quadro: {e}")
 
+    # Adiciona um novo método para reagir às alterações do quadro
+    @timed()
+    def on_board_event(self, event):
+        """
+        Atualiza só o que a alteração afetou (os cartões editados ou as colunas envolvidas) e grava-a.
+        Uma alteração em lote ("batch") é redesenhada e gravada uma só vez.
+        """
+        columns = set()
+        for change in event.flatten():
+            if change.kind == "update":
+                view = self.column_views[change.column]
+                card = view.card_for(change.task.id)
+                if card is not None:
+                    card.render(change.task)
+                if view.track(change):
+                    columns.add(change.column)  # A tarefa mudou de lugar na coluna ordenada
+            else:
+                for column_name in {change.column, change.from_column} - {None}:
+                    self.column_views[column_name].track(change)
+                columns.add(change.column)
+                if change.from_column:
+                    columns.add(change.from_column)
+                if change.kind == "remove":
+                    self.selected.discard(change.task.id)
+                elif change.kind == "move" and change.column in ("Arquivado", "Completo"):
+                    self.schedule_archive(ARCHIVE_DELAY)
+        for column_name in columns:
+            self.update_column_ui(column_name)
+        if self.search_matches is not None:
+            self.schedule_search()  # A tarefa alterada pode ter deixado (ou passado) a corresponder à pesquisa
+        self.auto_save_board(event)
+
+    # Adiciona um novo método para passar a usar um quadro (ao carregar)
+    def attach_board(self, board):
+        """
+        Substitui o quadro atual, ligando-lhe a interface, a persistência e os alertas.
+        """
+        self.board.unsubscribe(self.on_board_event)
+        self.board = board
+        self.board.subscribe(self.on_board_event)
+        self.selected = set()
+        self.workspace.attach(self.workspace.active, board)  # Alertas e limite de quadros em memória
+        self.search_index.rebuild(board)
+        if self.search_build_job is not None:
+            self.root.after_cancel(self.search_build_job)
+            self.search_build_job = None
+        self.build_search_index()  # Indexa em segundo plano, para a primeira pesquisa ser imediata
+        for column_name in board.columns:
+            self.column_views[column_name].rebuild_sort()
+            self.update_column_ui(column_name)
+        path = self.workspace.entries[self.workspace.active].path
+        self.archive = TaskArchive.for_board(path, **self.archive_options)
+        self.save_metrics()
+        if self.metrics is not None:
+            self.metrics.detach()  # Deixa de observar o quadro anterior (que pode continuar em memória)
+        self.metrics = FlowMetrics.for_board(path)
+        self.metrics.attach(board)
+        self.history.attach(board)  # Cada quadro carregado começa com o histórico vazio
+        self.schedule_archive(ARCHIVE_DELAY)  # Tira do quadro as tarefas arquivadas há muito tempo
+        self.storage.watch()  # Procura as alterações feitas por outras instâncias no mesmo quadro
+        if self.api is not None:
+            self.api.set_board(board)
+
+    # Adiciona um novo método para aplicar as alterações feitas por outras instâncias da aplicação
+    @timed()
+    def process_remote_changes(self):
+        """
+        Aplica ao quadro as alterações que outras instâncias gravaram no mesmo ficheiro (lidas em
+        segundo plano pelo armazenamento). Se o ficheiro mudou demasiado, o quadro é carregado de novo.
+        """
+        if not self.loading:
+            if self.storage.needs_reload:
+                print("🔄 O quadro foi alterado por outra instância: a carregar de novo.")
+                self.load_board()
+            else:
+                with self.history.paused():  # As alterações dos outros não se desfazem aqui
+                    count = self.storage.apply_remote(self.board)
+                if count:
+                    print(f"🔄 {count} alteração(ões) de outra instância aplicada(s).")
+                    self.status_label.configure(text=f"{count} alteração(ões) de outro utilizador")
+        self.root.after(REMOTE_POLL_MS, self.process_remote_changes)
+
+    # Adiciona um novo método para executar os pedidos da API local na thread do Tk
+    @timed()
+    def process_api_calls(self):
+        """
+        Executa os pedidos recebidos pela API (ver BoardAPI.run_on_board), no máximo durante API_BUDGET
+        segundos de cada vez, para a interface continuar a responder com muitos clientes.
+        Durante o carregamento de um quadro, os pedidos esperam.
+        """
+        if not self.loading:
+            deadline = time.perf_counter() + API_BUDGET
+            try:
+                with self.history.paused():
+                    while time.perf_counter() < deadline:
+                        self.api_calls.get_nowait()()
+            except queue.Empty:
+                pass
+        self.root.after(API_POLL_MS, self.process_api_calls)
+
+    # Adiciona um novo método para correr trabalho lento fora da thread do Tk
+    def run_in_background(self, work, done, name="Background"):
+        """
+        Corre work() numa thread separada e chama done(resultado, erro) no ciclo do Tk quando terminar.
+        """
+        outcome = {}
+
+        def run():
+            try:
+                outcome["result"] = work()
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+
+        def wait():
+            if thread.is_alive():
+                self.root.after(50, wait)
+            else:
+                done(outcome.get("result"), outcome.get("error"))
+
+        self.root.after(50, wait)
+
+    # Adiciona um novo método para agendar a passagem de tarefas para o arquivo
+    def schedule_archive(self, delay: int = ARCHIVE_INTERVAL):
+        if self.archive_job is not None:
+            self.root.after_cancel(self.archive_job)
+        self.archive_job = self.root.after(delay, self.compact_archive)
+
+    # Adiciona um novo método para passar as tarefas antigas para o arquivo
+    @timed()
+    def compact_archive(self):
+        """
+        Escreve no arquivo, em segundo plano, as tarefas que já devem sair do quadro (ver TaskArchive.candidates)
+        e depois remove-as do quadro num só lote. Verifica de novo ao fim de ARCHIVE_INTERVAL.
+        """
+        self.archive_job = None
+        if self.loading or self.archiving:
+            self.schedule_archive(ARCHIVE_DELAY)
+            return
+        tasks = self.archive.candidates(self.board)
+        if not tasks:
+            self.schedule_archive()
+            return
+        self.archiving = True
+        board, archive = self.board, self.archive
+        entries = [(task.to_dict(), task.status) for task in tasks]
+        self.run_in_background(lambda: archive.append(entries),
+                               lambda result, error: self.finish_archive(board, archive, entries, error),
+                               name="ArchiveWriter")
+
+    # Adiciona um novo método para tirar do quadro as tarefas já escritas no arquivo
+    def finish_archive(self, board, archive, entries, error=None):
+        """
+        Remove do quadro as tarefas arquivadas. As que foram alteradas (ou removidas) enquanto o arquivo
+        era escrito, ou que pertencem a um quadro que deixou de estar ativo, ficam no quadro e são
+        escondidas do arquivo.
+        """
+        self.archiving = False
+        self.schedule_archive()
+        if error is not None:
+            print(f"❌ Erro ao escrever o arquivo: {error}")
+            return
+        archived, kept = [], []
+        for data, column_name in entries:
+            task = board.tasks.get(data["id"])
+            if board is self.board and not self.loading and task is not None and task.status == column_name and task.to_dict() == data:
+                archived.append(data["id"])
+            else:
+                kept.append(data["id"])
+        if archived:
+            with self.history.paused():  # Repor do arquivo é feito no navegador do arquivo
+                board.remove_tasks(archived)
+            self.status_label.configure(text=f"{len(archived)} tarefa(s) passaram para o arquivo")
+            print(f"📦 {len(archived)} tarefa(s) passaram para o arquivo '{archive.path}'.")
+        if kept:
+            try:
+                archive.restore(kept)
+            except Exception as e:
+                print(f"❌ Erro ao escrever o arquivo: {e}")
+
+    # Adiciona um novo método para consultar o arquivo
+    def archive_browser(self):
+        """
+        Abre uma janela para pesquisar as tarefas do arquivo e repô-las no quadro.
+        O arquivo só é lido (em segundo plano) quando a janela é aberta ou a pesquisa muda.
+        """
+        if not self.board_ready():
+            return
+        archive = self.archive
+        window = tk.Toplevel(self.root)
+        window.title("Arquivo")
+        window.geometry("700x450")
+
+        search_frame = ttk.Frame(window)
+        search_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(search_frame, text="Pesquisar:").pack(side=tk.LEFT)
+        search_entry = ttk.Entry(search_frame, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        status = ttk.Label(search_frame, text="", foreground="#777777")
+        status.pack(side=tk.LEFT, padx=5)
+
+        columns = ("Titulo", "Prioridade", "Coluna", "Arquivada")
+        tree = ttk.Treeview(window, columns=columns, show="headings", selectmode="extended")
+        for name, heading, width in zip(columns, ("Título", "Prioridade", "Coluna", "Arquivada em"), (320, 90, 110, 110)):
+            tree.heading(name, text=heading)
+            tree.column(name, width=width)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        records = {}
+
+        def show(found, error):
+            if not tree.winfo_exists():
+                return
+            if error is not None:
+                status.configure(text=f"Erro ao ler o arquivo: {error}")
+                return
+            tree.delete(*tree.get_children())
+            records.clear()
+            for record in found:
+                data = record["task"]
+                records[data["id"]] = record
+                tree.insert("", tk.END, iid=data["id"], values=(data["Titulo"], data["Prioridade"], record["column"], record["archived"]))
+            status.configure(text=f"{len(found)} tarefa(s)" + (" (primeiras)" if len(found) >= ARCHIVE_BROWSER_LIMIT else ""))
+
+        def search(event=None):
+            status.configure(text="A ler o arquivo...")
+            text = search_entry.get()
+            self.run_in_background(lambda: archive.search(text, ARCHIVE_BROWSER_LIMIT), show, name="ArchiveSearch")
+
+        def restore():
+            selected = [records[task_id] for task_id in tree.selection()]
+            if selected and self.restore_archived(archive, selected):
+                for record in selected:
+                    tree.delete(record["task"]["id"])
+                status.configure(text=f"{len(selected)} tarefa(s) repostas no quadro")
+
+        search_entry.bind("<Return>", search)
+        ttk.Button(search_frame, text="Pesquisar", command=search).pack(side=tk.LEFT)
+        ttk.Button(window, text="Repor no quadro", command=restore).pack(pady=10)
+        search()
+
+    def editing_text(self) -> bool:
+        """
+        Indica se o foco está num campo de texto ou noutra janela (por exemplo, a pesquisa ou o
+        diálogo de uma tarefa): aí, Ctrl+Z e Ctrl+Y não alteram o quadro.
+        """
+        try:
+            widget = self.root.focus_get()
+        except KeyError:
+            return True  # Foco numa janela interna do Tk (por exemplo, a lista de uma Combobox)
+        if widget is None:
+            return False
+        return isinstance(widget, (tk.Entry, ttk.Entry, Text, tk.Spinbox)) or widget.winfo_toplevel() is not self.root
+
+    # Adiciona um novo método para desfazer a última alteração (Ctrl+Z)
+    def undo(self, event=None):
+        if event is not None and self.editing_text():
+            return
+        if not self.board_ready():
+            return
+        command = self.history.undo()
+        self.status_label.configure(text=f"Desfeito: {command.describe()}" if command else "Nada para desfazer")
+
+    # Adiciona um novo método para refazer a última alteração desfeita (Ctrl+Y ou Ctrl+Shift+Z)
+    def redo(self, event=None):
+        if event is not None and self.editing_text():
+            return
+        if not self.board_ready():
+            return
+        command = self.history.redo()
+        self.status_label.configure(text=f"Refeito: {command.describe()}" if command else "Nada para refazer")
+
+    # Adiciona um novo método para gravar as métricas de fluxo do quadro ativo
+    def save_metrics(self):
+        if self.metrics is None:
+            return
+        try:
+            self.metrics.save()
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar as métricas de fluxo: {e}")
+
+    def save_metrics_periodically(self):
+        self.save_metrics()
+        self.root.after(METRICS_SAVE_INTERVAL, self.save_metrics_periodically)
+
+    # Adiciona um novo método para mostrar as métricas de fluxo do quadro
+    def metrics_view(self):
+        """
+        Abre uma janela com o resumo das métricas (tempo de ciclo, throughput, tarefas por coluna),
+        o fluxo cumulativo dos últimos METRICS_DAYS dias e o histograma dos tempos de ciclo.
+        """
+        if not self.board_ready() or self.metrics is None:
+            return
+        metrics = self.metrics
+        summary = metrics.summary()
+        window = tk.Toplevel(self.root)
+        window.title("Métricas de fluxo")
+        window.geometry("700x500")
+
+        def days(value):
+            return "-" if value is None else f"{value:.1f} dias" if isinstance(value, float) else f"{value} dias"
+
+        lines = [
+            f"Tempo de ciclo ({summary['cycle_count']} tarefas): média {days(summary['cycle_average'])}, "
+            f"mediana {days(summary['cycle_50'])}, 85% até {days(summary['cycle_85'])}",
+            f"Concluídas: hoje {summary['throughput_today']}, últimos 7 dias {summary['throughput_7']}, "
+            f"últimos 30 dias {summary['throughput_30']}",
+            "Em curso: " + ", ".join(f"{name} {count}" for name, count in summary["columns"].items()),
+        ]
+        ttk.Label(window, text="\n".join(lines), justify=tk.LEFT).pack(anchor="w", padx=10, pady=10)
+
+        column_names = list(self.board.columns)
+        columns = ("Dia", *column_names, "Concluídas")
+        tree = ttk.Treeview(window, columns=columns, show="headings", height=12)
+        for name in columns:
+            tree.heading(name, text=name)
+            tree.column(name, width=90, anchor="center")
+        first = date.today() - timedelta(days=METRICS_DAYS - 1)
+        for day, counts, throughput in metrics.daily_rows(first):
+            tree.insert("", 0, values=(day.strftime("%d/%m"), *(counts.get(name, 0) for name in column_names), throughput))
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        histogram = ", ".join(f"{'≥' if length == metrics.MAX_CYCLE_DAYS else ''}{length}d: {count}"
+                              for length, count in sorted(metrics.cycle_bins.items()))
+        ttk.Label(window, text=f"Histograma do tempo de ciclo: {histogram or '-'}", wraplength=660,
+                  justify=tk.LEFT).pack(anchor="w", padx=10, pady=5)
+
+        def export():
+            path = filedialog.asksaveasfilename(parent=window, defaultextension=".csv",
+                                                filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+            if not path:
+                return
+            try:
+                metrics.export(path, column_names)
+            except OSError as e:
+                messagebox.showerror("Erro", f"Erro ao exportar as métricas: {e}", parent=window)
+
+        ttk.Button(window, text="Exportar...", command=export).pack(pady=10)
+
+    # Adiciona um novo método para repor tarefas do arquivo no quadro
+    def restore_archived(self, archive, records) -> bool:
+        """
+        Repõe as tarefas na coluna "Completo" (a contar de hoje, para não voltarem logo ao arquivo).
+        Só depois de o quadro ser gravado é que as tarefas são escondidas do arquivo.
+        """
+        if not self.board_ready() or archive is not self.archive:
+            return False
+        with self.history.paused(), self.board.batch():
+            for record in records:
+                task = Task.from_dict(record["task"])
+                task.status_since = date.today()
+                if task.id not in self.board.tasks:
+                    self.board.add_task(task, "Completo")
+        try:
+            self.storage.flush()
+            archive.restore([record["task"]["id"] for record in records])
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao repor tarefas do arquivo: {e}")
+            return False
+        return True
+
+    # Adiciona um novo método para mudar de quadro no espaço de trabalho
+    def switch_board(self, name: str):
+        """
+        Mostra outro quadro. Se ainda estiver em memória é mostrado de imediato, senão é carregado.
+        As colunas (e os seus cartões) são as mesmas para todos os quadros.
+        """
+        if name == self.workspace.active:
+            return
+        if not self.board_ready():
+            self.board_selector.set(self.workspace.active)
+            return
+        board = self.workspace.activate(name)
+        self.storage = self.workspace.storage(name)
+        self.root.title(f"Kanban Board - {name}")
+        if board is not None:
+            self.attach_board(board)
+        else:
+            self.load_board()
+
     # Adiciona um novo método para carregar o quadro a partir do ficheiro JSON
+    @timed()
     def load_board(self):
         """
-        Carrega o quadro a partir do ficheiro JSON.
+        Carrega o quadro a partir do ficheiro, em segundo plano.
+
+        As tarefas são lidas numa thread separada e acrescentadas ao quadro em lotes pelo ciclo
+        do Tk, começando pelas colunas ativas; o "Arquivado" é carregado no fim. A janela fica
+        utilizável de imediato e o progresso é mostrado no topo. Até o carregamento terminar,
+        o quadro só pode ser consultado.
+        """
+        if self.loading:
+            return
+        self.loading = True
+        self.board.unsubscribe(self.on_board_event)
+        self.board = Board()  # Ainda sem observadores: as tarefas carregadas não são gravadas de novo
+        for column_name in self.board.columns:
+            self.update_column_ui(column_name)
+        self.show_load_progress(0.0)
+
+        load_queue = queue.Queue()
+
+        def read_board():
+            try:
+                for column_name, tasks, progress in self.storage.stream():
+                    load_queue.put(("tasks", column_name, tasks, progress))
+                load_queue.put(("done", None, None, 1.0))
+            except FileNotFoundError:
+                load_queue.put(("missing", None, None, 1.0))
+            except Exception as e:
+                load_queue.put(("error", None, e, 1.0))
+
+        threading.Thread(target=read_board, name="BoardLoader", daemon=True).start()
+        self.root.after(0, lambda: self.process_load_queue(load_queue))
+
+    # Adiciona um novo método para acrescentar ao quadro as tarefas lidas em segundo plano
+    @timed()
+    def process_load_queue(self, load_queue):
+        """
+        Acrescenta ao quadro os lotes de tarefas já lidos, sem ocupar o ciclo do Tk mais do que alguns milissegundos.
         """
+        board = self.board
+        touched = set()
+        time_limit = time.perf_counter() + 0.02
         try:
-            with open("kanban_board.json", "r") as file:
-                data = json.load(file)
-                self.board = Board.from_dict(data)
-                for column_name in self.board.columns:
+            while time.perf_counter() < time_limit:
+                kind, column_name, payload, progress = load_queue.get_nowait()
+                if kind == "tasks":
+                    for task in payload:
+                        board.add_task(task, column_name)
+                    touched.add(column_name)
+                    self.show_load_progress(progress, len(board.tasks))
+                    continue
+                for column_name in touched:
                     self.update_column_ui(column_name)
-        except FileNotFoundError:
+                self.finish_load(kind, payload)
+                return
+        except queue.Empty:
+            pass
+        for column_name in touched:
+            self.update_column_ui(column_name)
+        self.root.after(10, lambda: self.process_load_queue(load_queue))
+
+    # Adiciona um novo método para concluir o carregamento do quadro
+    @timed()
+    def finish_load(self, kind, error=None):
+        """
+        Termina o carregamento: reaplica o journal e liga a interface, a persistência e os alertas ao quadro.
+        """
+        self.loading = False
+        self.show_load_progress(None)
+        if kind == "done":
+            self.storage.finish_stream(self.board)
+            self.attach_board(self.board)
+        elif kind == "missing":
             messagebox.showinfo("Quadro não carregdo", "Quadro não encontrado ou ficheiro json não existe. A criar um novo quadro...")
-            self.board = Board()
-        except Exception as e:
+            self.attach_board(Board())
+        else:
+            print(f"❌ Erro ao ler o quadro: {error}")
             messagebox.showerror("Erro", f"Erro ao ler o quadro: Verifique o ficheiro JSON.")
+            self.attach_board(Board())
+        if getattr(self, "profile", None):
+            self.profile.mark(f"quadro carregado ({len(self.board.tasks)} tarefas)")
+            self.finish_profile()
+
+    # Adiciona um novo método para mostrar o progresso do carregamento
+    def show_load_progress(self, progress, task_count=0):
+        """
+        Mostra o progresso do carregamento no topo da janela (None esconde-o).
+        """
+        if progress is None:
+            self.load_progress.grid_remove()
+            self.status_label.configure(text="")
+            return
+        self.load_progress.grid()
+        self.load_progress["value"] = progress * 100
+        self.status_label.configure(text=f"A carregar quadro... {task_count} tarefas")
+
+    # Adiciona um novo método para impedir alterações enquanto o quadro carrega
+    def board_ready(self) -> bool:
+        """
+        Indica se o quadro já pode ser alterado (não está a meio de um carregamento).
+        """
+        if self.loading:
+            self.status_label.configure(text="Aguarde: o quadro ainda está a carregar.")
+            return False
+        return True
+
+    # Adiciona um novo método para criar o calendário de escolha do prazo
+    def date_entry(self, parent):
+        """
+        Cria o campo de data com calendário. O tkcalendar só é importado na primeira vez
+        (normalmente já foi carregado em segundo plano depois do arranque).
+        """
+        from tkcalendar import DateEntry # Biblioteca para calendário // pip install tkcalendar
+        return DateEntry(parent, width=20, background="blue", foreground="white", borderwidth=2)
 
     # Adiciona um novo método para editar uma tarefa
     def edit_task_window(self, task):
         """
         Abre uma janela para editar uma tarefa.
         """
+        if not self.board_ready():
+            return
         edit_window = tk.Toplevel(self.root)
         edit_window.title("Editar Tarefa")
         edit_window.geometry("500x500")
@@ -394,7 +1354,7 @@ class ui:
         priority_combobox.set(task.priority)
 
         ttk.Label(edit_window, text="Deadline:").pack(pady=5)
-        deadline = DateEntry(edit_window, width=20, background="blue", foreground="white", borderwidth=2)
+        deadline = self.date_entry(edit_window)
         deadline.pack(pady=15)
 
         save_button = ttk.Button(edit_window, text="Salvar Alterações", command=lambda: self.save_task_changes(task, title_entry, description_text, priority_combobox, deadline, edit_window))
@@ -405,17 +1365,16 @@ class ui:
         """
         Salva as alterações feitas na tarefa.
         """
-        task.title = title_entry.get().strip()
-        task.description = description_text.get(1.0, tk.END).strip()
-        task.priority = priority_combobox.get().strip()
-        task.deadline = deadline.get()
+        changes = {
+            "title": title_entry.get().strip(),
+            "description": description_text.get(1.0, tk.END).strip(),
+            "priority": priority_combobox.get().strip(),
+            "deadline": deadline.get()
+        }
         window.destroy()
-        self.update_column_ui(task.status)
 
-        # Salvar automaticamente após a alteração da tarefa e reler o quadro
-        self.auto_save_board()
-        self.load_board()
-        self.schedule_alerts()
+        # O cartão, a persistência e os alertas são atualizados pelo evento do quadro
+        self.board.update_task(task.id, **changes)
 
     # Adiciona um novo método para definir a prioridade de uma tarefa
     def set_task_priority(self, task):
@@ -439,13 +1398,9 @@ class ui:
         """
         Salva a nova prioridade para uma tarefa.
         """
-        task.priority = priority_combobox.get().strip()
+        priority = priority_combobox.get().strip()
         window.destroy()
-        self.update_column_ui(task.status)
-
-        # Salvar automaticamente após a alteração da prioridade
-        self.auto_save_board()
-        self.load_board()
+        self.board.update_task(task.id, priority=priority)
     
     # Adiciona um novo método para definir o prazo de uma tarefa
     def set_task_deadline(self, task):
@@ -457,7 +1412,7 @@ class ui:
         deadline_window.geometry("300x150")
 
         ttk.Label(deadline_window, text="Selecionar prazo:").pack(pady=10)
-        deadline = DateEntry(deadline_window, width=20, background="blue", foreground="white", borderwidth=2)
+        deadline = self.date_entry(deadline_window)
         deadline.pack(padx=10)
 
         set_button = ttk.Button(deadline_window, text="Definir", command=lambda: self.save_task_deadline(task, deadline, deadline_window))
@@ -468,35 +1423,92 @@ class ui:
         """
         Salva o novo prazo para uma tarefa.
         """
-        task.deadline = deadline.get()
+        deadline_date = deadline.get()
         window.destroy()
-        self.update_column_ui(task.status)
-
-        # Salvar automaticamente após a alteração do prazo
-        self.auto_save_board()
-        self.load_board()
+        self.board.update_task(task.id, deadline=deadline_date)
 
     # Adiciona um novo método para remover uma tarefa
     def remove_task(self, task):
         """
         Remove a tarefa do quadro.
         """
-        self.board.columns[task.status].remove_task(task.title)
-        self.update_column_ui(task.status)
-
-        # Salvar automaticamente após remover a tarefa
-        self.auto_save_board()
+        self.board.remove_task(task.id)  # A coluna, a persistência e os alertas são atualizados pelo evento
     
+    # Adiciona um novo método para selecionar (ou desselecionar) uma tarefa
+    def toggle_selection(self, task_id):
+        if task_id in self.selected:
+            self.selected.discard(task_id)
+        else:
+            self.selected.add(task_id)
+        self.render_selection([task_id])
+
+    # Adiciona um novo método para limpar a seleção
+    def clear_selection(self):
+        task_ids, self.selected = list(self.selected), set()
+        self.render_selection(task_ids)
+
+    def render_selection(self, task_ids):
+        # Só os cartões visíveis das tarefas indicadas são redesenhados
+        for task_id in task_ids:
+            task = self.board.get_task(task_id)
+            if task is None:
+                continue
+            card = self.column_views[task.status].card_for(task_id)
+            if card is not None:
+                card.render(task)
+        count = len(self.selected)
+        self.status_label.configure(text=f"{count} tarefa(s) selecionada(s)" if count else "")
+
+    # Adiciona um novo método para executar uma ação em lote sobre as tarefas selecionadas
+    def apply_to_selection(self, action, *args, **fields):
+        """
+        Aplica uma operação em lote do quadro (move_tasks, update_tasks, remove_tasks...) às tarefas
+        selecionadas: é gravada e redesenhada uma só vez.
+        """
+        if not self.board_ready():
+            return
+        task_ids = list(self.selected)
+        self.clear_selection()
+        count = action(task_ids, *args, **fields)
+        self.status_label.configure(text=f"{count} tarefa(s) alterada(s)")
+
+    # Adiciona um novo método para arquivar todas as tarefas completas
+    def archive_completed(self):
+        if not self.board_ready():
+            return
+        count = len(self.board.columns["Completo"].tasks)
+        if count and messagebox.askyesno("Arquivar completas", f"Arquivar {count} tarefa(s) completa(s)?"):
+            self.board.archive_tasks()
+            self.status_label.configure(text=f"{count} tarefa(s) arquivada(s)")
+
     # Adiciona um novo método para exibir o menu de contexto
     def show_context_menu(self, event, task):
         """
         Mostra o menu de contexto ao clicar com o botão direito do rato para editar, definir prioridade ou remover uma tarefa.
+        Se houver tarefas selecionadas (Ctrl+clique), mostra também as ações em lote.
         """
+        if not self.board_ready():
+            return
         context_menu = Menu(self.root, tearoff=0)
         context_menu.add_command(label="Editar", command=lambda: self.edit_task_window(task))
         context_menu.add_command(label="Definir Prioridade", command=lambda: self.set_task_priority(task))
         context_menu.add_command(label="Remover", command=lambda: self.remove_task(task))
         context_menu.add_command(label="Definir Prazo", command=lambda: self.set_task_deadline(task))
+
+        if self.selected:
+            context_menu.add_separator()
+            move_menu = Menu(context_menu, tearoff=0)
+            for column_name in self.board.columns:
+                move_menu.add_command(label=column_name, command=lambda column_name=column_name: self.apply_to_selection(self.board.move_tasks, column_name))
+            priority_menu = Menu(context_menu, tearoff=0)
+            for priority in ["Baixo", "Médio", "Alta"]:
+                priority_menu.add_command(label=priority, command=lambda priority=priority: self.apply_to_selection(self.board.update_tasks, priority=priority))
+            count = len(self.selected)
+            context_menu.add_cascade(label=f"Mover seleção ({count})", menu=move_menu)
+            context_menu.add_cascade(label=f"Prioridade da seleção ({count})", menu=priority_menu)
+            context_menu.add_command(label=f"Arquivar seleção ({count})", command=lambda: self.apply_to_selection(self.board.archive_tasks))
+            context_menu.add_command(label=f"Remover seleção ({count})", command=lambda: self.apply_to_selection(self.board.remove_tasks))
+            context_menu.add_command(label="Limpar seleção", command=self.clear_selection)
         context_menu.post(event.x_root, event.y_root)
 
     # Adiciona um novo método para executar a aplicação
@@ -512,132 +1524,197 @@ class KanbanApp(ui, TaskAlert):
     """
     
     # Adiciona um novo método construtor
-    def __init__(self):
+    def __init__(self, board_paths="kanban_board.json", profile: StartupProfile = None, max_loaded: int = 3, max_tasks: int = None,
+                 archive_after: int = 7, archive_completed_after: int = None, trace_path: str = None, api_address: dict = None):
+        self.profile = profile
+        self.mark_startup("módulos importados")
         self.board = Board()
-        self.root = ThemedTk(theme="arc")
+        self.root = tk.Tk()  # O tema é aplicado depois de a janela aparecer (ver apply_theme)
         self.root.title("Kanban Board")
 
         self.root.geometry("1200x800")
         self.root.rowconfigure(1, weight=1)
         self.root.columnconfigure(0, weight=1)
 
-        self.dragged_task = None
-        self.dragged_task_widget = None
-        self.from_column = None
-        self.clone_widget = None
+        self.loading = False
         self.alert_system = TaskAlert(self.board)
+        self.search_index = TaskIndex(self.board)
+        self.search_matches = None  # Ids encontrados pela pesquisa ativa (None: sem pesquisa)
+        self.selected = set()  # Ids das tarefas selecionadas com Ctrl+clique
+        self.search_job = None
+        self.search_build_job = None
+        self.archive_options = {"archive_after": archive_after, "completed_after": archive_completed_after}
+        self.archive = None  # Arquivo frio do quadro ativo (ligado em attach_board)
+        self.archive_job = None
+        self.archiving = False
+        self.metrics = None  # Métricas de fluxo do quadro ativo (ligadas em attach_board)
+        self.history = UndoHistory(UNDO_LIMIT)
+        self.api = None  # API local (--api-port / --api-socket), ligada depois de criada a interface
+        self.api_calls = queue.Queue()  # Pedidos da API à espera de correr na thread do Tk
+
+        # Quadros abertos (JSON por omissão, SQLite para ficheiros .db); só o ativo é editado
+        if isinstance(board_paths, str):
+            board_paths = [board_paths]
+        self.workspace = Workspace(board_paths, max_loaded, max_tasks, alerts=self.alert_system)
+        self.storage = self.workspace.storage(self.workspace.active)
+        if len(self.workspace.entries) > 1:
+            self.root.title(f"Kanban Board - {self.workspace.active}")
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         ui.setup_ui(self)
+        self.drag = DragEngine(self)
+        self.monitor = PerformanceMonitor(self, trace_path)
+        self.root.bind("<Control-z>", self.undo)
+        self.root.bind("<Control-y>", self.redo)
+        self.root.bind("<Control-Z>", self.redo)  # Ctrl+Shift+Z
+        self.mark_startup("interface criada")
+        if api_address:
+            self.api = BoardAPI(self.board, dispatch=self.api_calls.put)
+            self.api.start_in_thread(**api_address)
+            self.process_api_calls()
         ui.load_board(self)  # Load board automatically on startup
-        self.schedule_alerts()
+        self.alert_system.start()
+        self.process_alerts()
+        self.process_remote_changes()
+        self.root.after(METRICS_SAVE_INTERVAL, self.save_metrics_periodically)
+        self.root.after_idle(self.on_first_idle)
+
+    # Adiciona um novo método para registar um passo do arranque
+    def mark_startup(self, name: str):
+        if self.profile:
+            self.profile.mark(name)
+
+    # Adiciona um novo método para terminar o arranque depois de a janela ser desenhada
+    def on_first_idle(self):
+        """
+        Corre quando a janela já foi desenhada: aplica o tema e carrega em segundo plano
+        as bibliotecas que só são precisas mais tarde (calendário e notificações).
+        """
+        self.mark_startup("janela visível")
+        self.apply_theme()
+        self.warm_up = threading.Thread(target=self.warm_up_imports, name="WarmUp", daemon=True)
+        self.warm_up.start()
+        if len(self.workspace.entries) > 1:
+            # Os prazos dos outros quadros são lidos sem os carregar na interface
+            threading.Thread(target=self.workspace.scan_deadlines, name="DeadlineScan", daemon=True).start()
+
+    # Adiciona um novo método para aplicar o tema da janela
+    def apply_theme(self):
+        try:
+            from ttkthemes import ThemedStyle # Biblioteca de temas // pip install ttkthemes
+            ThemedStyle(self.root).set_theme(THEME)
+        except Exception as e:
+            print(f"⚠️ Não foi possível aplicar o tema '{THEME}': {e}")
+        self.mark_startup("tema aplicado")
+
+    # Adiciona um novo método para importar as bibliotecas adiadas fora da thread do Tk
+    def warm_up_imports(self):
+        """
+        Importa em segundo plano os módulos adiados, para o primeiro diálogo ou alerta não esperar por eles.
+        """
+        for name in DEFERRED_IMPORTS:
+            try:
+                __import__(name)
+            except Exception as e:
+                print(f"⚠️ Não foi possível carregar '{name}': {e}")
+            self.mark_startup(f"{name} importado")
+
+    # Adiciona um novo método para mostrar os tempos de arranque e fechar (--profile-startup)
+    def finish_profile(self):
+        """
+        Espera que o quadro e os imports em segundo plano terminem, mostra os tempos e fecha a aplicação.
+        """
+        warm_up = getattr(self, "warm_up", None)
+        if self.loading or warm_up is None or warm_up.is_alive():
+            self.root.after(50, self.finish_profile)
+            return
+        self.profile.report()
+        self.on_close()
+
+    # Adiciona um novo método para fechar a aplicação gravando as alterações pendentes
+    def on_close(self):
+        """
+        Grava imediatamente as alterações pendentes antes de fechar a janela.
+        """
+        self.alert_system.stop()
+        if self.api is not None:
+            self.api.stop()
+        self.workspace.close()
+        self.save_metrics()
+        if self.monitor.trace_path:
+            self.monitor.export_trace(path=self.monitor.trace_path)
+        self.root.destroy()
 
     # Adiciona um novo método para agendar alertas, verificando os prazos das tarefas || Complementar ao método TaskAlert
     def schedule_alerts(self):
         """
-        Agendar alertas para verificar os prazos das tarefas.
+        Pede à thread de alertas uma nova verificação dos prazos das tarefas.
+        """
+        self.alert_system.request_check()
+
+    # Adiciona um novo método para mostrar os alertas produzidos pela thread de verificação
+    def process_alerts(self):
+        """
+        Mostra na thread do Tk os avisos enviados pela verificação de prazos.
         """
-        print("Verificando deadlines...") # Mensagem de debug || Usado para debug e testes
         try:
-            self.alert_system.check_deadlines()
-            print("Verificação datas efetuada com sucesso.") # Mensagem de debug onde é possivel verificar se a verificação foi efetuada com sucesso || Usado para debug e testes
-        except Exception as e:
-            print(f"Erro na verificação: {e}") # Mensagem de erro || Usado para debug e testes
-        self.root.after(60000, self.schedule_alerts)
+            while True:
+                title, message = self.alert_system.results.get_nowait()
+                messagebox.showwarning(title, message)
+        except queue.Empty:
+            pass
+        self.root.after(500, self.process_alerts)
     
     # Adiciona um novo método para iniciar o arrasto de uma tarefa
-    def start_drag(self, event, task, task_widget, from_column):
-            """
-            Inicia o arrasto da tarefa e armazena a referência.
-            """
-
-            self.dragged_task = task
-            self.dragged_task_widget = event.widget
-            self.from_column = from_column  # Armazena a coluna original
-
-            # Criar um clone da tarefa visualmente
-            self.clone_widget = tk.Toplevel(self.root)
-            self.clone_widget.overrideredirect(True)  # Remove bordas da janela
-            
-            # Criar um Frame dentro do clone para parecer uma tarefa real
-            clone_frame = ttk.Frame(self.clone_widget, relief=tk.RAISED, padding=5, borderwidth=2)
-            clone_frame.pack(fill=tk.BOTH, expand=True)
-        
-            # Título da tarefa
-            ttk.Label(clone_frame, text=task.title, font=("Helvetica", 14, "bold"), foreground="#333333").pack(anchor="w")
-        
-            # Descrição da tarefa (sem cortes)
-            desc_label = ttk.Label(clone_frame, text=task.description, font=("Helvetica", 10), foreground="#555555", wraplength=250, justify="left")
-            desc_label.pack(anchor="w", pady=(0, 5))
-        
-            # Cor da prioridade
-            priority_color = "#FF0000" if task.priority == "Alta" else "#b3b300" if task.priority == "Médio" else "#FFEA00" if task.priority == "Baixo" else "#008000"
-            ttk.Label(clone_frame, text=f"Prioridade: {task.priority}", font=("Helvetica", 9, "italic"), foreground=priority_color).pack(anchor="w")
-        
-            if task.deadline:
-                ttk.Label(clone_frame, text=f"Deadline: {task.deadline}", font=("Helvetica", 9, "italic"), foreground="#777777").pack(anchor="w")
-        
-            # Atualizar layout antes de definir a geometria
-            self.clone_widget.update_idletasks()
-        
-            # Definir tamanho dinâmico com base no conteúdo
-            width = clone_frame.winfo_reqwidth()
-            height = clone_frame.winfo_reqheight()
-            self.clone_widget.geometry(f"{width}x{height}+{event.x_root}+{event.y_root}")
-        
-            # Ligar eventos para mover o clone com o rato
-            self.clone_widget.bind("<B1-Motion>", self.drag_motion)
+    def start_drag(self, event, task_id):
+        """
+        Regista o clique numa tarefa; o arrasto só começa quando o rato se mover (ver DragEngine).
+        """
+        self.drag.on_press(event, task_id)
 
-    # Adiciona um novo método para mover o clone da tarefa
+    # Adiciona um novo método para mover o ghost da tarefa
     def drag_motion(self, event):
-            """
-            Destaca a coluna ao passar sobre ela.
-            """
-            if self.clone_widget:
-            # Sincronizar a posição do clone com o mouse
-                width = self.clone_widget.winfo_width()
-                height = self.clone_widget.winfo_height()
-                self.clone_widget.geometry(f"{width}x{height}+{event.x_root}+{event.y_root}")
-
-    # Adiciona um novo método para soltar a tarefa
-    def drop_task(self, event):
         """
-        Solta a tarefa na nova coluna e atualiza o quadro.
+        Move o ghost e destaca a posição onde a tarefa vai ficar.
         """
-        # Detectar qual coluna está sob o cursor
-        for column_name, frame in self.column_frames.items():
-            if self.is_cursor_in_frame(event, frame):
-                to_column = column_name
-                break
-
-        if self.dragged_task and to_column:
-            # Verificar se a tarefa está sendo movida para uma nova coluna
-            if self.from_column and self.from_column != to_column:
-                self.board.move_task(self.dragged_task.title, self.from_column, to_column)
-                self.update_column_ui(self.from_column)
-                self.update_column_ui(to_column)
+        self.drag.on_motion(event)
 
-        # Destruir o clone visual
-        if self.clone_widget:
-            self.clone_widget.destroy()
-            self.clone_widget = None
-
-        # Limpar as referências internas
-        self.dragged_task = None
-        self.dragged_task_widget = None
-
-        # Salvar automaticamente após a alteração
-        self.auto_save_board()
-    
-    # Adiciona um novo método para verificar se o cursor está dentro do frame
-    def is_cursor_in_frame(self, event, frame):
+    # Adiciona um novo método para soltar a tarefa
+    def drop_task(self, event):
         """
-        Verifica se o cursor do rato está dentro do frame.
+        Solta a tarefa na coluna e posição sob o cursor e atualiza o quadro.
         """
-        x1, y1, x2, y2 = (frame.winfo_rootx(), frame.winfo_rooty(),
-                          frame.winfo_rootx() + frame.winfo_width(),
-                          frame.winfo_rooty() + frame.winfo_height())
-        return x1 <= event.x_root <= x2 and y1 <= event.y_root <= y2
+        self.drag.on_release(event)
 
 if __name__ == "__main__": # Adiciona um bloco de código para executar a aplicação diretamente
-    app = KanbanApp()
-    app.run()
+    parser = argparse.ArgumentParser(description="Kanban Board")
+    parser.add_argument("--board", action="append", help="Ficheiro do quadro (.json ou .db para SQLite); pode ser repetido para abrir vários quadros")
+    parser.add_argument("--workspace", metavar="PASTA", help="Abre todos os quadros (.json, .db) da pasta")
+    parser.add_argument("--max-loaded", type=int, default=3, help="Número máximo de quadros em memória (os restantes são libertados)")
+    parser.add_argument("--max-tasks", type=int, help="Número máximo de tarefas em memória, somando todos os quadros carregados")
+    parser.add_argument("--archive-after", type=int, default=7, metavar="DIAS", help="Dias no \"Arquivado\" até a tarefa passar para o arquivo comprimido")
+    parser.add_argument("--archive-completed-after", type=int, metavar="DIAS", help="Passa também para o arquivo as tarefas no \"Completo\" há mais de DIAS dias")
+    parser.add_argument("--migrate", nargs=2, metavar=("ORIGEM", "DESTINO"), help="Copia o quadro entre ficheiros/motores e termina")
+    parser.add_argument("--api-port", type=int, metavar="PORTA", help="Abre a API HTTP local do quadro nesta porta (só em 127.0.0.1)")
+    parser.add_argument("--api-socket", metavar="CAMINHO", help="Abre a API HTTP local do quadro num socket Unix")
+    parser.add_argument("--trace", metavar="FICHEIRO", help="Mede os pontos críticos desde o arranque e grava um Chrome trace ao fechar")
+    parser.add_argument("--profile-startup", action="store_true", help="Mostra os tempos do arranque e fecha depois de carregar o quadro")
+    args = parser.parse_args()
+
+    if args.migrate:
+        board = migrate_board(*args.migrate)
+        print(f"✅ Quadro migrado: {len(board.tasks)} tarefas de '{args.migrate[0]}' para '{args.migrate[1]}'.")
+    else:
+        board_paths = list(args.board or [])
+        if args.workspace:
+            board_paths += [entry.path for entry in Workspace.from_directory(args.workspace).entries.values()]
+        board_paths = list(dict.fromkeys(board_paths))  # Sem quadros repetidos
+        api_address = None
+        if args.api_socket:
+            api_address = {"socket_path": args.api_socket}
+        elif args.api_port is not None:
+            api_address = {"port": args.api_port}
+        app = KanbanApp(board_paths or "kanban_board.json", StartupProfile() if args.profile_startup else None,
+                        args.max_loaded, args.max_tasks, args.archive_after, args.archive_completed_after, args.trace, api_address)
+        app.run()
@@ -0,0 +1,239 @@
+"""
+Métricas de fluxo do quadro Kanban: fluxo cumulativo, throughput e tempo de ciclo.
+"""
+import csv
+import json
+import os
+from datetime import date, timedelta
+
+from board import parse_day
+
+START_COLUMN = "Em Progresso"  # O tempo de ciclo conta a partir da entrada nesta coluna
+DONE_COLUMN = "Completo"
+
+class FlowMetrics:
+    """
+    Agregados de fluxo mantidos à medida que o quadro muda (observador do Board), para os relatórios
+    não terem de percorrer o histórico:
+
+    - cumulative: dia -> tarefas por coluna no fim desse dia (fluxo cumulativo);
+    - throughput: dia -> tarefas que entraram em "Completo" nesse dia;
+    - cycle_bins: dias entre a entrada em "Em Progresso" e em "Completo" -> número de tarefas
+      (histograma, com o último intervalo a juntar as tarefas de MAX_CYCLE_DAYS ou mais dias).
+
+    As datas de cada transição são as de 'status_since' da tarefa, pelo que as alterações de outras
+    instâncias (ver BoardStorage.apply_remote) contam no dia em que foram feitas. Uma tarefa concluída
+    que volta a uma coluna anterior a "Completo" (reaberta, ou uma conclusão desfeita) deixa de contar
+    no throughput e no tempo de ciclo; passar para "Arquivado" e voltar não a conta outra vez.
+    Os agregados ficam em "quadro.flow.json", gravado por 'save'.
+    """
+    MAX_CYCLE_DAYS = 90
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.cumulative = {}
+        self.throughput = {}
+        self.cycle_bins = {}
+        self.cycle_count = 0
+        self.cycle_total = 0  # Soma dos tempos de ciclo (dias), para a média
+        self.started = {}  # id -> dia de entrada em "Em Progresso" das tarefas ainda não concluídas
+        self.done = {}     # id -> [dia da conclusão, dia de entrada em "Em Progresso"] das tarefas concluídas
+        self.board = None
+        self.dirty = False
+
+    # Adiciona um novo método para obter as métricas associadas ao ficheiro de um quadro
+    @classmethod
+    def for_board(cls, board_path: str):
+        """
+        As métricas de "quadro.json" (ou "quadro.db") ficam em "quadro.flow.json".
+        """
+        metrics = cls(os.path.splitext(board_path)[0] + ".flow.json")
+        try:
+            with open(metrics.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return metrics
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Métricas de fluxo ignoradas ({metrics.path}): {e}")
+            return metrics
+        metrics.cumulative = data.get("cumulative", {})
+        metrics.throughput = data.get("throughput", {})
+        metrics.cycle_bins = {int(days): count for days, count in data.get("cycle_bins", {}).items()}
+        metrics.cycle_count = sum(metrics.cycle_bins.values())
+        metrics.cycle_total = data.get("cycle_total", 0)
+        metrics.started = data.get("started", {})
+        metrics.done = data.get("done", {})
+        return metrics
+
+    def save(self):
+        """
+        Grava os agregados de forma atómica (ficheiro temporário + rename), se tiverem mudado.
+        """
+        if not self.dirty or self.path is None:
+            return
+        data = {"cumulative": self.cumulative, "throughput": self.throughput, "cycle_bins": self.cycle_bins,
+                "cycle_total": self.cycle_total, "started": self.started, "done": self.done}
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    # Adiciona um novo método para começar a seguir um quadro
+    def attach(self, board):
+        """
+        Regista as tarefas que já estão em "Em Progresso" (a contar de 'status_since') e a contagem atual
+        das colunas, e passa a observar o quadro.
+        """
+        self.detach()
+        self.board = board
+        for task in board.columns[START_COLUMN].tasks:
+            if task.id not in self.started and task.status_since is not None:
+                self.started[task.id] = task.status_since.isoformat()
+        self.record_counts(date.today())
+        board.subscribe(self.on_board_event)
+
+    def detach(self):
+        if self.board is not None:
+            self.board.unsubscribe(self.on_board_event)
+            self.board = None
+
+    def record_counts(self, day: date):
+        counts = {column_name: len(column.tasks) for column_name, column in self.board.columns.items()}
+        key = day.isoformat()
+        if self.cumulative.get(key) != counts:
+            self.cumulative[key] = counts
+            self.dirty = True
+
+    # Adiciona um novo método para atualizar os agregados com uma alteração do quadro
+    def on_board_event(self, event):
+        columns = list(self.board.columns)
+        open_columns = columns[:columns.index(DONE_COLUMN)]
+        for sub_event in event.flatten():
+            task = sub_event.task
+            if sub_event.kind == "remove":
+                self.started.pop(task.id, None)
+                self.done.pop(task.id, None)
+            elif sub_event.kind in ("add", "move") and sub_event.column != sub_event.from_column:
+                if sub_event.column in open_columns:
+                    self.reopen(task.id)
+                since = (task.status_since or date.today()).isoformat()
+                if sub_event.column == START_COLUMN:
+                    self.started.setdefault(task.id, since)
+                elif sub_event.column == DONE_COLUMN and sub_event.kind == "move" and task.id not in self.done:
+                    self.throughput[since] = self.throughput.get(since, 0) + 1
+                    started = self.started.pop(task.id, None)
+                    if started is not None:
+                        self.add_cycle_time((parse_day(since) - parse_day(started)).days)
+                    self.done[task.id] = [since, started]
+        self.record_counts(date.today())
+        self.dirty = True
+
+    def reopen(self, task_id: str):
+        """
+        Retira a conclusão de uma tarefa que voltou a uma coluna anterior a "Completo" (ou cuja
+        conclusão foi desfeita): o dia em que entrou em "Em Progresso" volta a contar.
+        """
+        entry = self.done.pop(task_id, None)
+        if entry is None:
+            return
+        day, started = entry
+        count = self.throughput.get(day, 0) - 1
+        if count > 0:
+            self.throughput[day] = count
+        else:
+            self.throughput.pop(day, None)
+        if started is not None:
+            self.add_cycle_time((parse_day(day) - parse_day(started)).days, -1)
+            self.started.setdefault(task_id, started)
+
+    def add_cycle_time(self, days: int, count: int = 1):
+        """
+        Conta (ou, com count=-1, deixa de contar) uma tarefa com um tempo de ciclo de 'days' dias.
+        """
+        days = max(days, 0)
+        self.cycle_total += days * count
+        self.cycle_count += count
+        days = min(days, self.MAX_CYCLE_DAYS)
+        self.cycle_bins[days] = self.cycle_bins.get(days, 0) + count
+        if self.cycle_bins[days] <= 0:
+            del self.cycle_bins[days]
+
+    def cycle_percentile(self, fraction: float):
+        """
+        Tempo de ciclo (dias) abaixo do qual estão 'fraction' das tarefas, ou None sem tarefas concluídas.
+        """
+        if not self.cycle_count:
+            return None
+        target = fraction * self.cycle_count
+        seen = 0
+        for days in sorted(self.cycle_bins):
+            seen += self.cycle_bins[days]
+            if seen >= target:
+                return days
+        return self.MAX_CYCLE_DAYS
+
+    def throughput_since(self, days: int, today: date = None) -> int:
+        today = today or date.today()
+        return sum(self.throughput.get((today - timedelta(days=offset)).isoformat(), 0) for offset in range(days))
+
+    # Adiciona um novo método para resumir as métricas
+    def summary(self, today: date = None) -> dict:
+        """
+        Devolve os números principais (sem percorrer o histórico nem as tarefas).
+        """
+        today = today or date.today()
+        return {
+            "columns": {column_name: len(column.tasks) for column_name, column in self.board.columns.items()},
+            "throughput_today": self.throughput.get(today.isoformat(), 0),
+            "throughput_7": self.throughput_since(7, today),
+            "throughput_30": self.throughput_since(30, today),
+            "cycle_count": self.cycle_count,
+            "cycle_average": self.cycle_total / self.cycle_count if self.cycle_count else None,
+            "cycle_50": self.cycle_percentile(0.5),
+            "cycle_85": self.cycle_percentile(0.85),
+        }
+
+    def daily_rows(self, first: date = None, last: date = None):
+        """
+        Gera (dia, contagens por coluna, throughput) por cada dia entre 'first' e 'last', repetindo
+        as contagens dos dias sem alterações.
+        """
+        if not self.cumulative:
+            return
+        days = sorted(self.cumulative)
+        first = first or parse_day(days[0])
+        last = last or date.today()
+        counts = {}
+        for key in days:
+            if parse_day(key) > first:
+                break
+            counts = self.cumulative[key]
+        day = first
+        while day <= last:
+            key = day.isoformat()
+            counts = self.cumulative.get(key, counts)
+            yield day, counts, self.throughput.get(key, 0)
+            day += timedelta(days=1)
+
+    # Adiciona um novo método para exportar as métricas
+    def export(self, path: str, columns):
+        """
+        Exporta as métricas: CSV com uma linha por dia (tarefas por coluna e concluídas), ou JSON
+        com o resumo diário e o histograma dos tempos de ciclo.
+        """
+        if path.lower().endswith(".json"):
+            data = {
+                "days": [dict(day=day.isoformat(), throughput=throughput, **counts)
+                         for day, counts, throughput in self.daily_rows()],
+                "cycle_time": {"bins": {str(days): count for days, count in sorted(self.cycle_bins.items())},
+                               "count": self.cycle_count, "total_days": self.cycle_total},
+            }
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False, indent=2)
+            return
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["Dia", *columns, "Concluídas"])
+            for day, counts, throughput in self.daily_rows():
+                writer.writerow([day.isoformat(), *(counts.get(column_name, 0) for column_name in columns), throughput])
@@ -0,0 +1,240 @@
+"""
+Pesquisa e filtros sobre as tarefas do quadro Kanban.
+"""
+import bisect
+import functools
+import re
+import time
+import unicodedata
+
+from board import Task
+from instrumentation import timed
+
+WORD = re.compile(r"\w+")
+
+@functools.lru_cache(maxsize=65536)
+def fold(word: str) -> str:
+    """
+    Remove os acentos de uma palavra ("relatório" -> "relatorio").
+    """
+    if word.isascii():
+        return word
+    word = unicodedata.normalize("NFKD", word)
+    return "".join(char for char in word if not unicodedata.combining(char))
+
+def tokenize(text: str) -> set:
+    """
+    Palavras do texto em minúsculas e sem acentos. Os acentos são removidos por palavra
+    (com cache), porque o vocabulário é muito menor do que o texto indexado.
+    """
+    return set(map(fold, WORD.findall(text.lower()))) if text else set()
+
+class TaskIndex:
+    """
+    Índice invertido (palavra -> ids) sobre o título e a descrição das tarefas, com índices
+    auxiliares por prioridade, estado (coluna) e prazo.
+
+    O índice é mantido a partir dos eventos do quadro, por isso cada pesquisa só percorre
+    os ids que correspondem, e não todas as tarefas. A construção inicial pode ser feita aos
+    poucos (build_step), para não bloquear a interface em quadros grandes; uma pesquisa feita
+    antes de o índice estar completo termina a construção primeiro.
+    Os termos da pesquisa são prefixos: "rel" encontra "relatório" e "relação".
+    """
+    def __init__(self, board):
+        self.board = board
+        self.built = False
+        self._pending = None  # Tarefas ainda por indexar durante a construção
+        self.board.subscribe(self.on_board_event)
+
+    # Adiciona um novo método para ligar o índice a outro quadro (ao carregar um quadro)
+    def rebuild(self, board=None):
+        """
+        Liga o índice ao quadro indicado. O conteúdo só é indexado na próxima pesquisa.
+        """
+        if board is not None:
+            self.board.unsubscribe(self.on_board_event)
+            self.board = board
+        self.board.subscribe(self.on_board_event)
+        self.built = False
+        self._pending = None
+
+    @property
+    def building(self) -> bool:
+        return self._pending is not None
+
+    def start_build(self):
+        """
+        Começa a construir o índice a partir das tarefas atuais do quadro (continua com build_step).
+        """
+        self._words = {}        # palavra -> ids das tarefas que a contêm
+        self._vocabulary = []   # palavras ordenadas, para pesquisar por prefixo
+        self._task_words = {}   # id -> palavras da tarefa (indica também se a tarefa já foi indexada)
+        self._by_priority = {}  # prioridade -> ids
+        self._by_status = {}    # coluna -> ids
+        self._by_deadline = {}  # prazo (date) -> ids
+        self._deadlines = []    # prazos ordenados, para pesquisar por intervalo
+        self._pending = list(self.board.tasks.values())
+        self._position = 0
+        self.built = False
+
+    @timed()
+    def build_step(self, time_limit: float = None) -> bool:
+        """
+        Indexa tarefas até ao instante time_limit (time.perf_counter(); None indexa todas).
+        Devolve True quando o índice fica completo.
+        """
+        if self._pending is None:
+            if self.built:
+                return True
+            self.start_build()
+        pending, tasks = self._pending, self.board.tasks
+        while self._position < len(pending):
+            end = min(self._position + 500, len(pending))
+            for task in pending[self._position:end]:
+                # Tarefas removidas ou já indexadas por um evento entretanto são ignoradas
+                if tasks.get(task.id) is task and task.id not in self._task_words:
+                    self._add(task)
+            self._position = end
+            if time_limit is not None and time.perf_counter() >= time_limit:
+                return False
+        self._vocabulary.sort()
+        self._deadlines.sort()
+        self._pending = None
+        self.built = True
+        return True
+
+    def build(self):
+        """
+        Constrói (ou reconstrói) o índice completo de uma vez.
+        """
+        self.start_build()
+        self.build_step()
+
+    def build_progress(self) -> float:
+        if self._pending is None:
+            return 1.0 if self.built else 0.0
+        return self._position / max(len(self._pending), 1)
+
+    # Adiciona um novo método para manter o índice a partir das alterações do quadro
+    def on_board_event(self, event):
+        if not self.built and not self.building:
+            return
+        for event in event.flatten():
+            self._apply(event)
+
+    def _apply(self, event):
+        task = event.task
+        if event.kind == "add":
+            self._add(task, keep_sorted=self.built)
+        elif task.id not in self._task_words:
+            return  # Ainda não indexada: será indexada mais tarde com os dados atuais
+        elif event.kind == "remove":
+            self._remove(task.id, task.status, task.priority, task.get_deadline_date())
+        elif event.kind == "move":
+            if event.from_column != event.column:
+                self._discard(self._by_status, event.from_column, task.id)
+                self._by_status.setdefault(event.column, set()).add(task.id)
+        elif event.kind == "update":
+            changes = event.changes
+            if "title" in changes or "description" in changes:
+                self._unindex_words(task.id)
+                self._index_words(task, keep_sorted=self.built)
+            if "priority" in changes:
+                self._discard(self._by_priority, changes["priority"], task.id)
+                self._by_priority.setdefault(task.priority, set()).add(task.id)
+            if "deadline" in changes:
+                old = Task.parse_deadline(changes["deadline"]) if changes["deadline"] else None
+                if old is not None:
+                    self._discard(self._by_deadline, old, task.id)
+                self._index_deadline(task, keep_sorted=self.built)
+
+    def _add(self, task, keep_sorted=False):
+        self._index_words(task, keep_sorted)
+        self._by_priority.setdefault(task.priority, set()).add(task.id)
+        self._by_status.setdefault(task.status, set()).add(task.id)
+        self._index_deadline(task, keep_sorted)
+
+    def _remove(self, task_id, status, priority, deadline_date):
+        self._unindex_words(task_id)
+        self._discard(self._by_priority, priority, task_id)
+        self._discard(self._by_status, status, task_id)
+        if deadline_date is not None:
+            self._discard(self._by_deadline, deadline_date, task_id)
+
+    def _index_words(self, task, keep_sorted):
+        words = tokenize(f"{task.title} {task.description}")
+        self._task_words[task.id] = words
+        for word in words:
+            ids = self._words.get(word)
+            if ids is None:
+                ids = self._words[word] = set()
+                if keep_sorted:
+                    bisect.insort(self._vocabulary, word)
+                else:
+                    self._vocabulary.append(word)
+            ids.add(task.id)
+
+    def _unindex_words(self, task_id):
+        # As palavras que ficam sem tarefas continuam no vocabulário (são ignoradas na pesquisa)
+        for word in self._task_words.pop(task_id, ()):
+            self._words[word].discard(task_id)
+
+    def _index_deadline(self, task, keep_sorted):
+        deadline_date = task.get_deadline_date()
+        if deadline_date is None:
+            return
+        ids = self._by_deadline.get(deadline_date)
+        if ids is None:
+            ids = self._by_deadline[deadline_date] = set()
+            if keep_sorted:
+                bisect.insort(self._deadlines, deadline_date)
+            else:
+                self._deadlines.append(deadline_date)
+        ids.add(task.id)
+
+    @staticmethod
+    def _discard(index, key, task_id):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(task_id)
+
+    def _prefix_ids(self, prefix: str) -> set:
+        """
+        Ids das tarefas com alguma palavra começada por 'prefix'.
+        """
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\U0010ffff")
+        sets = [self._words[word] for word in self._vocabulary[start:end]]
+        if len(sets) == 1:
+            return sets[0]
+        return set().union(*sets)
+
+    def _deadline_ids(self, deadline_from=None, deadline_to=None) -> set:
+        start = 0 if deadline_from is None else bisect.bisect_left(self._deadlines, deadline_from)
+        end = len(self._deadlines) if deadline_to is None else bisect.bisect_right(self._deadlines, deadline_to)
+        return set().union(*(self._by_deadline[day] for day in self._deadlines[start:end]))
+
+    # Adiciona um novo método para pesquisar tarefas
+    @timed()
+    def search(self, text: str = "", priority: str = None, status: str = None, deadline_from=None, deadline_to=None) -> set:
+        """
+        Devolve os ids das tarefas que contêm todas as palavras de 'text' (como prefixo)
+        e respeitam os filtros indicados (prioridade, coluna e intervalo de prazos, datetime.date).
+        Sem nenhum critério, devolve todas as tarefas.
+        """
+        if not self.built:
+            self.build_step()
+        candidates = []
+        for word in tokenize(text):
+            candidates.append(self._prefix_ids(word))
+        if priority is not None:
+            candidates.append(self._by_priority.get(priority, set()))
+        if status is not None:
+            candidates.append(self._by_status.get(status, set()))
+        if deadline_from is not None or deadline_to is not None:
+            candidates.append(self._deadline_ids(deadline_from, deadline_to))
+        if not candidates:
+            return set(self.board.tasks)
+        # Começa pelo conjunto mais pequeno para a interseção percorrer o mínimo de ids
+        candidates.sort(key=len)
+        return set(candidates[0]).intersection(*candidates[1:])
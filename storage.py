@@ -0,0 +1,1393 @@
+"""
+Persistência do quadro Kanban: journal JSON (motor por omissão) e SQLite.
+"""
+import json
+import math
+import os
+import queue
+import sqlite3
+import threading
+from datetime import date
+from fractions import Fraction
+
+from board import Board, BoardEvent, Task, parse_day
+from instrumentation import timed
+
+class FileLock:
+    """
+    Bloqueio exclusivo entre processos, sobre um ficheiro auxiliar (fcntl.flock, ou msvcrt no Windows).
+    É reentrante dentro do mesmo processo e pode ser usado por várias threads.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._file = open(self.path, "a+b")
+                if os.name == "nt":
+                    import msvcrt
+                    self._file.seek(0)
+                    while True:
+                        try:
+                            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            continue  # LK_LOCK desiste ao fim de 10 segundos: tenta de novo
+                else:
+                    import fcntl
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            if os.name == "nt":
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+        return False
+
+class BoardStorage:
+    """
+    Interface comum dos motores de persistência do quadro.
+
+    As alterações são entregues como registos (ver 'record_for') e não são escritas no momento:
+    o armazenamento fica marcado como alterado e uma thread de escrita grava os registos pendentes
+    no máximo uma vez por 'flush_interval' segundos. Edições seguidas da mesma tarefa dentro desse
+    intervalo são agrupadas num só registo.
+
+    Vários processos podem editar o mesmo quadro. Cada motor guarda as alterações numa sequência
+    única (o journal, ou a tabela 'changes' do SQLite) e, antes de gravar, lê as alterações que os
+    outros processos gravaram entretanto. Essas alterações (e as encontradas pela thread de
+    vigilância, ver 'watch') ficam na fila 'remote' até 'apply_remote' as aplicar ao quadro.
+    As alterações locais que na sequência ficam depois das alheias são desfeitas, as alheias aplicadas
+    e as locais refeitas por cima (rebase), de forma que todos os processos ficam com o quadro,
+    incluindo a ordem das tarefas em cada coluna, que resulta da ordem das alterações na sequência.
+
+    Cada motor implementa 'load', 'save_board', '_write_records' (que devolve as alterações alheias
+    lidas antes da escrita) e '_read_changes'.
+    """
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending = []  # Registos ainda não gravados
+        self._lock = threading.RLock()
+        self._dirty = threading.Event()
+        self._closing = threading.Event()
+        self._writer = None
+
+        self.remote = queue.Queue()  # (último número local já gravado, registos alheios) por aplicar
+        self.needs_reload = False    # O ficheiro mudou de forma que só um carregamento completo resolve
+        self._watcher = None
+        self._stop_watching = threading.Event()
+        self._replaying = False      # A aplicar alterações alheias: não são gravadas de novo
+        self._seq = 0                # Número da última alteração local
+        self._written_seq = 0        # Número da última alteração local já gravada
+        self._unsynced = []          # [número, registo, registo que o desfaz] das alterações locais recentes
+
+    @property
+    def dirty(self):
+        return bool(self._pending)
+
+    @staticmethod
+    def apply(board, record):
+        """
+        Aplica um registo ao quadro.
+        """
+        op = record["op"]
+        if op == "add":
+            task = Task.from_dict(record["task"])
+            existing = board.tasks.get(task.id)
+            if existing is None:
+                board.add_task(task, record["column"], record.get("before"))
+            else:
+                # A tarefa já existe (importada de novo, ou lida outra vez depois de uma recarga): é atualizada
+                board.update_task(task.id, **{name: getattr(task, name) for name in Board.EDITABLE_FIELDS})
+                if existing.status != record["column"]:
+                    board.move_task(task.id, record["column"], record.get("before"), task.status_since)
+        elif op == "move":
+            since = record.get("since")
+            board.move_task(record["id"], record["to"], record.get("before"), parse_day(since) if since else None)
+        elif op == "update":
+            updated = Task.from_dict(record["task"])
+            board.update_task(record["id"], **{name: getattr(updated, name) for name in Board.EDITABLE_FIELDS})
+        elif op == "remove":
+            board.remove_task(record["id"])
+        elif op == "batch":
+            with board.batch():
+                for sub_record in record["records"]:
+                    BoardStorage.apply(board, sub_record)
+
+    @staticmethod
+    def undo_record_for(event: BoardEvent):
+        """
+        Registo que desfaz a alteração (a partir dos valores anteriores guardados no evento).
+        """
+        task = event.task
+        if event.kind == "add":
+            return {"op": "remove", "id": task.id}
+        if event.kind == "move":
+            since = event.changes.get("status_since")
+            return {"op": "move", "id": task.id, "to": event.from_column, "before": event.changes.get("before"),
+                    "since": since.isoformat() if since else None}
+        if event.kind == "update":
+            old = Task.from_dict(task.to_dict())
+            for name, value in event.changes.items():
+                setattr(old, name, value)
+            return {"op": "update", "id": task.id, "task": old.to_dict()}
+        if event.kind == "batch":
+            return {"op": "batch", "records": [BoardStorage.undo_record_for(sub_event) for sub_event in reversed(event.events)]}
+        return {"op": "add", "column": event.column, "task": task.to_dict(), "before": event.changes.get("before")}
+
+    @staticmethod
+    def apply_undoable(board, record):
+        """
+        Aplica um registo ao quadro e devolve o registo que o desfaz (calculado a partir do estado
+        de cada tarefa antes de ser alterada).
+        """
+        undo = []
+        for sub_record in BoardStorage._flatten([record]):
+            task_id = sub_record.get("id") or sub_record["task"]["id"]
+            task = board.tasks.get(task_id)
+            if task is None:
+                BoardStorage.apply(board, sub_record)
+                undo.append({"op": "remove", "id": task_id})
+                continue
+            data, column_name = task.to_dict(), task.status
+            before = board.columns[column_name].tasks.next_id(task_id)
+            BoardStorage.apply(board, sub_record)
+            if board.tasks.get(task_id) is None:
+                undo.append({"op": "add", "column": column_name, "task": data, "before": before})
+                continue
+            undo.append({"op": "update", "id": task_id, "task": data})
+            if task.status != column_name or board.columns[column_name].tasks.next_id(task_id) != before:
+                undo.append({"op": "move", "id": task_id, "to": column_name, "before": before, "since": data["Desde"]})
+        return {"op": "batch", "records": undo[::-1]}
+
+    @staticmethod
+    def record_for(event: BoardEvent):
+        """
+        Converte uma alteração do quadro no registo correspondente.
+        """
+        if event.kind == "add":
+            return {"op": "add", "column": event.column, "task": event.task.to_dict(), "before": event.before}
+        if event.kind == "move":
+            since = event.task.status_since
+            return {"op": "move", "id": event.task.id, "to": event.column, "before": event.before,
+                    "since": since.isoformat() if since else None}
+        if event.kind == "update":
+            return {"op": "update", "id": event.task.id, "task": event.task.to_dict()}
+        if event.kind == "batch":
+            # Um só registo (uma linha do journal): ou é lido por inteiro ou é ignorado por inteiro
+            return {"op": "batch", "records": [BoardStorage.record_for(sub_event) for sub_event in event.events]}
+        return {"op": "remove", "id": event.task.id}
+
+    def load(self) -> Board:
+        """
+        Carrega o quadro. Lança FileNotFoundError se o quadro ainda não existir.
+        """
+        raise NotImplementedError
+
+    def save_board(self, board):
+        """
+        Grava o quadro completo (usado na migração entre motores).
+        """
+        raise NotImplementedError
+
+    def stream(self, batch_size: int = 500):
+        """
+        Lê o quadro aos poucos, gerando (coluna, [tarefas], progresso entre 0 e 1).
+        As colunas ativas são geradas antes do "Arquivado". Pode correr numa thread separada;
+        no fim, 'finish_stream' tem de ser chamado na thread que usa o quadro.
+        Lança FileNotFoundError se o quadro ainda não existir.
+        """
+        raise NotImplementedError
+
+    def finish_stream(self, board):
+        """
+        Completa um carregamento feito com 'stream' (por exemplo, reaplicando o journal).
+        """
+        pass
+
+    def deadline_tasks(self):
+        """
+        Devolve as tarefas com prazo, sem deixar o quadro em memória nem abrir o ficheiro para escrita
+        (usado para vigiar os prazos de quadros que não estão carregados).
+        Lança FileNotFoundError se o quadro ainda não existir.
+        """
+        raise NotImplementedError
+
+    def iter_tasks(self, status: str = None, priority: str = None, deadline_from=None, deadline_to=None):
+        """
+        Gera as tarefas que cumprem os filtros (coluna, prioridade e intervalo de prazos, datetime.date),
+        pela ordem do quadro, sem o carregar na aplicação. Lança FileNotFoundError se o quadro não existir.
+        """
+        raise NotImplementedError
+
+    def open_append(self):
+        """
+        Prepara o armazenamento para receber registos (append) sem carregar o quadro,
+        por exemplo para importar tarefas em memória constante.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def matches(task, status=None, priority=None, deadline_from=None, deadline_to=None) -> bool:
+        if status is not None and task.status != status:
+            return False
+        if priority is not None and task.priority != priority:
+            return False
+        if deadline_from is not None or deadline_to is not None:
+            deadline_date = task.get_deadline_date()
+            if deadline_date is None:
+                return False
+            if deadline_from is not None and deadline_date < deadline_from:
+                return False
+            if deadline_to is not None and deadline_date > deadline_to:
+                return False
+        return True
+
+    def _write_records(self, records) -> list:
+        """
+        Grava os registos e devolve os registos gravados por outros processos desde a última leitura.
+        """
+        raise NotImplementedError
+
+    def _read_changes(self) -> list:
+        """
+        Devolve os registos gravados por outros processos desde a última leitura.
+        """
+        return []
+
+    def _changed(self) -> bool:
+        """
+        Verificação rápida (por exemplo, pelo tamanho e data do ficheiro) de que pode haver alterações alheias.
+        """
+        return True
+
+    def _close_backend(self):
+        pass
+
+    def should_compact(self):
+        return False
+
+    def compact(self, board, background=True):
+        pass
+
+    def append(self, record, undo=None):
+        """
+        Marca o armazenamento como alterado com um novo registo; a gravação é feita pela thread de escrita.
+        'undo' (ver undo_record_for) permite refazer a alteração depois das alheias lidas mais tarde
+        (ver apply_remote); sem ele, o registo só é gravado.
+        """
+        if self._replaying:
+            return  # Alteração de outro processo, que já está gravada
+        with self._lock:
+            self._seq += 1
+            if undo is not None:
+                self._unsynced.append([self._seq, record, undo])
+            last = self._pending[-1] if self._pending else None
+            if last and record["op"] == "update" and last["op"] in ("add", "update") and last.get("id", last.get("task", {}).get("id")) == record["id"]:
+                # Agrupa edições seguidas da mesma tarefa num só registo
+                if last["op"] == "add":
+                    last["task"] = record["task"]
+                else:
+                    self._pending[-1] = record
+            else:
+                self._pending.append(record)
+                self._record_appended()
+        if self._writer is None or not self._writer.is_alive():
+            self._closing.clear()
+            self._writer = threading.Thread(target=self._run_writer, name=type(self).__name__, daemon=True)
+            self._writer.start()
+        self._dirty.set()
+
+    def _record_appended(self):
+        pass
+
+    def _run_writer(self):
+        while not self._closing.is_set():
+            self._dirty.wait()
+            if self._closing.is_set():
+                break
+            self._closing.wait(self.flush_interval)  # Agrupa as alterações feitas durante o intervalo
+            self._dirty.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Erro ao gravar o quadro: {e}")
+
+    @timed()
+    def flush(self):
+        """
+        Grava os registos pendentes.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            self._receive(self._write_records(self._pending))
+            self._written_seq = self._seq
+            self._pending = []
+
+    @staticmethod
+    def _flatten(records):
+        for record in records:
+            if record["op"] == "batch":
+                yield from BoardStorage._flatten(record["records"])
+            else:
+                yield record
+
+    def _receive(self, records):
+        if records:
+            # Os registos alheios lidos agora ficam antes das alterações locais ainda não gravadas
+            self.remote.put((self._written_seq, records))
+
+    # Adiciona um novo método para procurar alterações gravadas por outros processos
+    def poll(self):
+        with self._lock:
+            self._receive(self._read_changes())
+
+    # Adiciona um novo método para vigiar o ficheiro em segundo plano
+    def watch(self, interval: float = 1.0):
+        """
+        Inicia uma thread que procura alterações de outros processos a cada 'interval' segundos.
+        Termina com 'close'.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._run_watcher, args=(interval,), name=f"{type(self).__name__}Watcher", daemon=True)
+        self._watcher.start()
+
+    def _run_watcher(self, interval):
+        while not self._stop_watching.wait(interval):
+            try:
+                if self._changed():
+                    self.poll()
+            except Exception as e:
+                print(f"⚠️ Erro ao procurar alterações de outros processos: {e}")
+
+    # Adiciona um novo método para aplicar ao quadro as alterações de outros processos
+    def apply_remote(self, board) -> int:
+        """
+        Aplica ao quadro, num só lote, as alterações alheias em fila (na thread que usa o quadro).
+        As alterações locais posteriores na sequência são desfeitas antes e refeitas depois.
+        Devolve o número de alterações aplicadas.
+        """
+        applied = 0
+        self._replaying = True
+        try:
+            with board.batch():
+                while True:
+                    try:
+                        written_seq, records = self.remote.get_nowait()
+                    except queue.Empty:
+                        break
+                    with self._lock:
+                        local = [entry for entry in self._unsynced if entry[0] > written_seq]
+                    for _, _, undo in reversed(local):
+                        self.apply(board, undo)
+                    for record in self._flatten(records):
+                        self.apply(board, record)
+                        applied += 1
+                    for entry in local:
+                        # Refeito sobre as alterações alheias, o registo pode ter outro efeito: o desfazer muda
+                        entry[2] = self.apply_undoable(board, entry[1])
+        finally:
+            self._replaying = False
+        with self._lock:
+            if self.remote.empty():
+                # As alterações já gravadas não podem estar depois de registos alheios ainda por ler
+                self._unsynced = [entry for entry in self._unsynced if entry[0] > self._written_seq]
+        return applied
+
+    def close(self):
+        """
+        Grava imediatamente os registos pendentes e fecha o armazenamento.
+        As alterações alheias ainda por aplicar são descartadas (um novo carregamento já as inclui).
+        """
+        self._stop_watching.set()
+        self._closing.set()
+        self._dirty.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        self._dirty.clear()
+        with self._lock:
+            if self._pending:
+                self.flush()
+            self._close_backend()
+            self.remote = queue.Queue()
+
+class BoardJournal(BoardStorage):
+    """
+    Persistência incremental do quadro em JSON (motor por omissão).
+
+    Cada alteração é acrescentada ao journal como um registo JSON compacto (uma linha),
+    de forma que o custo de guardar é proporcional à alteração e não ao tamanho do quadro.
+    Periodicamente o journal é compactado, em segundo plano, num snapshot completo
+    (o ficheiro JSON do quadro). Ao carregar, o snapshot é lido e o journal é reaplicado.
+
+    Vários processos podem usar o mesmo quadro (por exemplo, numa pasta partilhada): o journal só é
+    lido e escrito com o bloqueio do ficheiro ".lock" e cada processo lembra-se de até onde já o leu,
+    para ler só as linhas novas dos outros. Ao compactar, o journal anterior fica como ".old" até à
+    compactação seguinte, para que os outros processos possam acabar de o ler.
+    """
+    def __init__(self, snapshot_path: str = "kanban_board.json", compact_every: int = 500, flush_interval: float = 1.0):
+        super().__init__(snapshot_path, flush_interval)
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.splitext(snapshot_path)[0] + ".journal"
+        self.file_lock = FileLock(os.path.splitext(snapshot_path)[0] + ".lock")
+        self.compact_every = compact_every
+        self.generation = 0            # Geração do journal atual
+        self.snapshot_generation = 0   # Geração do snapshot lido
+        self.pending_records = 0  # Registos desde o último snapshot
+        self._offset = 0          # Bytes do journal atual já lidos (ou escritos) por este processo
+        self._stat = None         # (tamanho, data, inode) do journal na última verificação
+        self._compaction = None
+
+    @property
+    def old_journal_path(self):
+        return self.journal_path + ".old"
+
+    @classmethod
+    def read(cls, snapshot_path: str = "kanban_board.json"):
+        """
+        Lê o snapshot e reaplica o journal, devolvendo o quadro e a geração do snapshot.
+        Lança FileNotFoundError se não existir nem snapshot nem journal.
+        """
+        journal = cls(snapshot_path)
+        board = journal._read_board()
+        return board, journal.snapshot_generation
+
+    def _read_board(self):
+        """
+        Lê o snapshot e os journals (com o bloqueio) e fica pronto para ler as linhas seguintes do journal.
+        """
+        with self.file_lock:
+            board = Board()
+            found = False
+            self.snapshot_generation = 0
+            try:
+                with open(self.snapshot_path, "r") as file:
+                    data = json.load(file)
+                    board = Board.from_dict(data)
+                    self.snapshot_generation = data.get("_journal", 0)
+                    found = True
+            except FileNotFoundError:
+                pass
+
+            records, journal_found = self._read_journals()
+            if not (found or journal_found):
+                raise FileNotFoundError(self.snapshot_path)
+            for record in records:
+                self.apply(board, record)
+        return board
+
+    @staticmethod
+    def _header(path):
+        """
+        Devolve (geração, tamanho do cabeçalho em bytes) do journal, ou (None, 0) se não existir.
+        """
+        try:
+            with open(path, "rb") as file:
+                line = file.readline()
+        except FileNotFoundError:
+            return None, 0
+        try:
+            return json.loads(line).get("gen", 0), len(line)
+        except ValueError:
+            return None, 0
+
+    @staticmethod
+    def _read_lines(path, offset):
+        """
+        Lê os registos do journal a partir de 'offset' (em bytes), devolvendo-os com a posição seguinte.
+        Uma última linha sem fim de linha (ainda a ser escrita, ou interrompida) não é lida.
+        """
+        records = []
+        try:
+            with open(path, "rb") as file:
+                file.seek(offset)
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        print(f"⚠️ Registo incompleto ignorado no journal: {path}")
+        except FileNotFoundError:
+            pass
+        return records, offset
+
+    def _covers_snapshot(self, old_generation, generation) -> bool:
+        """
+        Indica se os journals existentes têm todos os registos posteriores ao snapshot lido.
+        """
+        snapshot = self.snapshot_generation
+        if generation is None or generation == snapshot:
+            return True
+        return generation == snapshot + 1 and old_generation == snapshot
+
+    def _read_journals(self):
+        """
+        Lê os registos dos ficheiros de journal cuja geração não esteja já incluída no snapshot.
+        O journal antigo só tem registos por aplicar se uma compactação foi interrompida ou ainda
+        está a gravar o snapshot. Tem de ser chamado com o bloqueio.
+        """
+        records, found = [], False
+        self.generation, self._offset = self.snapshot_generation, 0
+        old_generation = self._header(self.old_journal_path)[0]
+        for path in (self.old_journal_path, self.journal_path):
+            generation, header_length = self._header(path)
+            if generation is None or generation < self.snapshot_generation:
+                continue
+            found = True
+            lines, offset = self._read_lines(path, header_length)
+            records.extend(lines)
+            if path == self.journal_path:
+                self.generation, self._offset = generation, offset
+        if not self._covers_snapshot(old_generation, self._header(self.journal_path)[0]):
+            print(f"⚠️ O snapshot foi substituído durante a leitura: o quadro vai ser carregado de novo ({self.snapshot_path})")
+            self.needs_reload = True
+        self.pending_records = len(records)
+        return records, found
+
+    def _read_changes(self):
+        """
+        Lê as linhas que os outros processos acrescentaram ao journal desde a última leitura,
+        incluindo o fim do journal anterior se entretanto outro processo o compactou.
+        """
+        with self.file_lock:
+            generation, header_length = self._header(self.journal_path)
+            if generation is None or self.needs_reload:
+                return []
+            if generation == self.generation:
+                records, self._offset = self._read_lines(self.journal_path, self._offset)
+            elif self._header(self.old_journal_path)[0] == self.generation:
+                records, _ = self._read_lines(self.old_journal_path, self._offset)
+                more, self._offset = self._read_lines(self.journal_path, header_length)
+                records.extend(more)
+                self.generation = generation
+                self.pending_records = 0
+            else:
+                # O journal foi compactado mais de uma vez desde a última leitura
+                self.needs_reload = True
+                return []
+        self.pending_records += len(records)
+        return records
+
+    def _changed(self):
+        try:
+            stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return False
+        current = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        changed, self._stat = current != self._stat, current
+        return changed
+
+    def load(self):
+        """
+        Carrega o quadro (snapshot + journal) e prepara o journal para novas alterações.
+        """
+        self.close()
+        self.needs_reload = False
+        try:
+            board = self._read_board()
+        except FileNotFoundError:
+            self._open(reset=True)
+            raise
+        if self.snapshot_generation < self.generation:
+            # Recupera de uma compactação interrompida antes de aceitar novos registos
+            self.compact(board, background=False)
+        else:
+            self._open()
+        return board
+
+    def save_board(self, board):
+        self.close()
+        self.compact(board, background=False)
+
+    def deadline_tasks(self):
+        board, _ = self.read(self.snapshot_path)
+        return [task for task in board.tasks.values() if task.get_deadline_date() is not None]
+
+    def iter_tasks(self, status: str = None, priority: str = None, deadline_from=None, deadline_to=None):
+        """
+        Percorre o snapshot em lotes (ver stream_snapshot), sem criar o quadro. As tarefas alteradas
+        pelo journal são colocadas no lugar que teriam no quadro carregado (ver JournalOverlay), pelo
+        que a memória usada depende do tamanho do journal e não do número de tarefas.
+        """
+        if not (os.path.exists(self.snapshot_path) or os.path.exists(self.journal_path)):
+            raise FileNotFoundError(self.snapshot_path)  # Sem criar o ficheiro do bloqueio
+        return self._iter_tasks(status, priority, deadline_from, deadline_to)
+
+    def _iter_tasks(self, status, priority, deadline_from, deadline_to):
+        snapshot = None
+        try:
+            with self.file_lock:
+                # O snapshot fica aberto: uma compactação de outro processo substitui o ficheiro, não o altera
+                try:
+                    snapshot = open(self.snapshot_path, "r")
+                except FileNotFoundError:
+                    pass
+                self.snapshot_generation = 0
+                if snapshot is not None:
+                    for key, value, _ in stream_snapshot(self.snapshot_path, file=snapshot):
+                        if key == "_journal":
+                            self.snapshot_generation = value
+                            break
+                records, found = self._read_journals()
+                if snapshot is None and not found:
+                    raise FileNotFoundError(self.snapshot_path)
+            overlay = JournalOverlay(records)
+            if snapshot is not None and overlay.ids:
+                overlay.read_snapshot(stream_snapshot(self.snapshot_path, file=snapshot))
+            overlay.replay()
+            columns = [status] if status is not None else list(Board().columns)
+            items = stream_snapshot(self.snapshot_path, file=snapshot) if snapshot is not None else ()
+            for task in overlay.merge(items, columns):
+                if self.matches(task, None, priority, deadline_from, deadline_to):
+                    yield task
+        finally:
+            if snapshot is not None:
+                snapshot.close()
+
+    def open_append(self):
+        """
+        Continua o journal atual a partir do fim (as linhas já existentes não são lidas).
+        """
+        self.close()
+        with self.file_lock:
+            generation, _ = self._header(self.journal_path)
+            if generation is None:
+                self.generation = self._snapshot_generation_in_file()
+                self._open(reset=True)
+            else:
+                self.generation = generation
+                self._offset = os.path.getsize(self.journal_path)
+
+    def _snapshot_generation_in_file(self) -> int:
+        """
+        Geração gravada no snapshot (percorre o ficheiro se estiver no fim, como nos snapshots antigos).
+        """
+        try:
+            for key, value, _ in stream_snapshot(self.snapshot_path):
+                if key == "_journal":
+                    return value
+        except FileNotFoundError:
+            pass
+        return 0
+
+    def stream(self, batch_size: int = 500):
+        """
+        Lê o snapshot de forma incremental, criando as tarefas à medida que são lidas.
+        O snapshot é escrito pela ordem das colunas do quadro, pelo que o "Arquivado" vem no fim.
+        """
+        self.close()
+        self.needs_reload = False
+        self.snapshot_generation = 0
+        self._stream_records = []
+        found = os.path.exists(self.snapshot_path)
+        if found:
+            for column_name, items, progress in stream_snapshot(self.snapshot_path, batch_size):
+                if column_name == "_journal":
+                    self.snapshot_generation = items
+                elif column_name in Board().columns:
+                    yield column_name, [Task.from_dict(task_data) for task_data in items], progress
+        with self.file_lock:
+            self._stream_records, journal_found = self._read_journals()
+        if not (found or journal_found):
+            self._open(reset=True)
+            raise FileNotFoundError(self.snapshot_path)
+
+    def finish_stream(self, board):
+        for record in self._stream_records:
+            self.apply(board, record)
+        self._stream_records = []
+        if self.snapshot_generation < self.generation and not self.needs_reload:
+            # Recupera de uma compactação interrompida antes de aceitar novos registos
+            self.compact(board, background=False)
+        else:
+            self._open()
+
+    def _open(self, reset=False):
+        """
+        Cria o journal com a geração atual se ainda não existir (ou se 'reset').
+        """
+        with self.file_lock:
+            if reset or self._header(self.journal_path)[0] is None:
+                header = (json.dumps({"gen": self.generation}) + "\n").encode("utf-8")
+                with open(self.journal_path, "wb") as file:
+                    file.write(header)
+                self._offset = len(header)
+                self.pending_records = 0
+
+    def _record_appended(self):
+        self.pending_records += 1
+
+    def _write_records(self, records):
+        with self.file_lock:
+            foreign = self._read_changes()
+            self._append_lines(records)
+        return foreign
+
+    def _append_lines(self, records):
+        """
+        Acrescenta os registos ao journal (com o bloqueio), depois das linhas já lidas.
+        """
+        self._open()
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode("utf-8")
+        with open(self.journal_path, "r+b") as file:
+            end = file.seek(0, os.SEEK_END)
+            file.seek(end - 1)
+            if file.read(1) != b"\n":
+                file.write(b"\n")  # Termina a linha deixada a meio por uma escrita interrompida
+            file.write(data)
+            file.flush()
+            self._offset = file.tell()
+
+    def should_compact(self):
+        compacting = self._compaction is not None and self._compaction.is_alive()
+        return self.pending_records >= self.compact_every and not compacting
+
+    def _snapshot_on_disk(self):
+        """
+        Geração do snapshot gravado (lida do início do ficheiro), ou None se não for possível sabê-la.
+        """
+        try:
+            for key, value, _ in stream_snapshot(self.snapshot_path):
+                return value if key == "_journal" else None
+        except (OSError, ValueError):
+            return None
+        return None
+
+    def compact(self, board, background=True):
+        """
+        Escreve um snapshot completo do quadro e inicia um journal novo.
+        A serialização do snapshot para disco é feita numa thread separada.
+
+        Em segundo plano, a compactação é adiada (devolve False) se houver alterações de outros
+        processos ainda por aplicar ao quadro ou se o snapshot da compactação anterior ainda não
+        foi gravado. Com background=False (ao carregar ou migrar) as alterações alheias são
+        aplicadas ao quadro e o snapshot é gravado de imediato.
+        """
+        if self._compaction is not None:
+            self._compaction.join()
+
+        with self._lock, self.file_lock:
+            foreign = self._read_changes()
+            if background:
+                snapshot_generation = self._snapshot_on_disk()
+                previous_pending = snapshot_generation is not None and snapshot_generation < self.generation
+                if foreign or not self.remote.empty() or self.needs_reload or previous_pending:
+                    self._receive(foreign)
+                    return False
+            else:
+                for record in foreign:
+                    self.apply(board, record)
+            if self._pending:
+                # Os outros processos leem estes registos do journal anterior
+                self._append_lines(self._pending)
+                self._written_seq = self._seq
+                self._pending = []
+
+            self.generation += 1
+            data = {"_journal": self.generation}
+            data.update(board.to_dict())
+
+            if os.path.exists(self.journal_path):
+                os.replace(self.journal_path, self.old_journal_path)
+            self._open(reset=True)
+            if not background:
+                self._write_snapshot(data)
+
+        if background:
+            self._compaction = threading.Thread(target=self._write_snapshot, args=(data,), daemon=True)
+            self._compaction.start()
+        return True
+
+    @timed()
+    def _write_snapshot(self, data):
+        """
+        Grava o snapshot de forma atómica (ficheiro temporário + rename), com o bloqueio.
+        Não grava se entretanto outros processos compactaram o journal mais de uma vez.
+        """
+        temp_path = self.snapshot_path + ".tmp"
+        try:
+            with self.file_lock:
+                generation = data["_journal"]
+                if generation not in (self._header(self.journal_path)[0], self._header(self.old_journal_path)[0]):
+                    return
+                with open(temp_path, "w") as file:
+                    dump_snapshot(data, file)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temp_path, self.snapshot_path)
+                self.snapshot_generation = generation
+        except Exception as e:
+            print(f"❌ Erro ao compactar o journal: {e}")
+
+    def _close_backend(self):
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+class SQLiteStorage(BoardStorage):
+    """
+    Persistência do quadro numa base de dados SQLite, indicada para quadros muito grandes.
+
+    Cada tarefa é uma linha da tabela 'tasks', pelo que gravar uma alteração é um upsert
+    ou update de uma só linha. A ordem dentro de cada coluna é guardada numa posição real,
+    de forma que inserir ou mover uma tarefa só altera essa tarefa. Há índices por coluna
+    (estado), prioridade e prazo para as consultas em 'query'.
+
+    Cada gravação acrescenta também os registos à tabela 'changes', pela ordem em que foram
+    gravados por todos os processos; é daí que cada processo lê as alterações dos outros.
+    Só são guardadas as últimas CHANGES_KEPT alterações.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            column_name TEXT NOT NULL,
+            position REAL NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            priority TEXT,
+            deadline TEXT,
+            deadline_date TEXT,
+            status_since TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_column ON tasks (column_name, position);
+        CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+        CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks (deadline_date);
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            record TEXT NOT NULL
+        );
+    """
+    CHANGES_KEPT = 10000
+    COLUMNS = "id, column_name, position, title, description, priority, deadline, deadline_date, status_since"
+
+    def __init__(self, path: str = "kanban_board.db", flush_interval: float = 1.0):
+        super().__init__(path, flush_interval)
+        self._connection = None
+        self._last_change = 0  # Última alteração da tabela 'changes' já lida ou gravada
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(self.SCHEMA)
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(tasks)")]
+            if "status_since" not in columns:
+                # Bases de dados criadas antes de existir a coluna
+                self._connection.execute("ALTER TABLE tasks ADD COLUMN status_since TEXT")
+        return self._connection
+
+    @staticmethod
+    def _row(task, column_name, position):
+        deadline_date = task.get_deadline_date()
+        return (task.id, column_name, position, task.title, task.description, task.priority,
+                task.deadline, deadline_date.isoformat() if deadline_date else None,
+                task.status_since.isoformat() if task.status_since else None)
+
+    @staticmethod
+    def _task(row):
+        task = Task(row[3], row[4], row[5], row[6], row[0])
+        task.status = row[1]
+        task.status_since = parse_day(row[8]) if row[8] else None
+        return task
+
+    def load(self):
+        """
+        Carrega o quadro a partir da base de dados (criando-a se não existir).
+        """
+        self.close()
+        self.needs_reload = False
+        exists = os.path.exists(self.path)
+        connection = self._connect()
+        if not exists:
+            raise FileNotFoundError(self.path)
+        self._last_change = self._latest_change(connection)
+        board = Board()
+        for row in connection.execute(f"SELECT {self.COLUMNS} FROM tasks ORDER BY column_name, position"):
+            if row[1] in board.columns:
+                board.add_task(self._task(row), row[1])
+        return board
+
+    def stream(self, batch_size: int = 500):
+        """
+        Lê as tarefas coluna a coluna (o "Arquivado" no fim), em lotes.
+        """
+        self.close()
+        self.needs_reload = False
+        exists = os.path.exists(self.path)
+        with self._lock:
+            connection = self._connect()
+        if not exists:
+            raise FileNotFoundError(self.path)
+        with self._lock:
+            # As alterações gravadas durante a leitura são lidas outra vez depois (e aplicadas por id)
+            self._last_change = self._latest_change(connection)
+            total = connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] or 1
+        loaded = 0
+        for column_name in Board().columns:
+            with self._lock:
+                cursor = connection.execute(f"SELECT {self.COLUMNS} FROM tasks WHERE column_name = ? ORDER BY position", (column_name,))
+                rows = cursor.fetchmany(batch_size)
+            while rows:
+                loaded += len(rows)
+                yield column_name, [self._task(row) for row in rows], loaded / total
+                with self._lock:
+                    rows = cursor.fetchmany(batch_size)
+
+    def query(self, status: str = None, priority: str = None, deadline_from=None, deadline_to=None):
+        """
+        Devolve as tarefas que cumprem os filtros, usando os índices da tabela.
+        As datas dos filtros são objetos datetime.date.
+        """
+        return list(self.iter_query(status, priority, deadline_from, deadline_to))
+
+    def iter_tasks(self, status: str = None, priority: str = None, deadline_from=None, deadline_to=None):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(self.path)
+        columns = [status] if status is not None else list(Board().columns)
+        return (task for column_name in columns for task in self.iter_query(column_name, priority, deadline_from, deadline_to))
+
+    def iter_query(self, status: str = None, priority: str = None, deadline_from=None, deadline_to=None, batch_size: int = 500):
+        """
+        Como 'query', mas lê as linhas em lotes à medida que as tarefas são consumidas.
+        """
+        conditions, parameters = [], []
+        if status:
+            conditions.append("column_name = ?")
+            parameters.append(status)
+        if priority:
+            conditions.append("priority = ?")
+            parameters.append(priority)
+        if deadline_from:
+            conditions.append("deadline_date >= ?")
+            parameters.append(deadline_from.isoformat())
+        if deadline_to:
+            conditions.append("deadline_date <= ?")
+            parameters.append(deadline_to.isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            cursor = self._connect().execute(f"SELECT {self.COLUMNS} FROM tasks {where} ORDER BY column_name, position", parameters)
+            rows = cursor.fetchmany(batch_size)
+        while rows:
+            for row in rows:
+                yield self._task(row)
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+
+    def open_append(self):
+        self.close()
+        with self._lock:
+            self._last_change = self._latest_change(self._connect())
+
+    def deadline_tasks(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(self.path)
+        return self.query(deadline_from=date.min)
+
+    def save_board(self, board):
+        self.close()
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM tasks")
+            connection.executemany(
+                f"INSERT INTO tasks ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._row(task, column_name, float(position))
+                 for column_name, column in board.columns.items()
+                 for position, task in enumerate(column.tasks)))
+            self._last_change = self._latest_change(connection)
+
+    def _position(self, connection, column_name, before):
+        """
+        Calcula a posição de uma tarefa inserida no fim da coluna ou antes da tarefa 'before'.
+        """
+        row = connection.execute("SELECT position FROM tasks WHERE id = ? AND column_name = ?", (before, column_name)).fetchone() if before else None
+        if row is None:
+            last = connection.execute("SELECT MAX(position) FROM tasks WHERE column_name = ?", (column_name,)).fetchone()[0]
+            return (last or 0.0) + 1.0
+        previous = connection.execute("SELECT MAX(position) FROM tasks WHERE column_name = ? AND position < ?", (column_name, row[0])).fetchone()[0]
+        previous = row[0] - 2.0 if previous is None else previous
+        if row[0] - previous < 1e-9:
+            # Sem espaço entre as posições vizinhas: renumera a coluna
+            self._renumber(connection, column_name)
+            return self._position(connection, column_name, before)
+        return (previous + row[0]) / 2
+
+    @staticmethod
+    def _renumber(connection, column_name):
+        ids = [row[0] for row in connection.execute("SELECT id FROM tasks WHERE column_name = ? ORDER BY position", (column_name,))]
+        connection.executemany("UPDATE tasks SET position = ? WHERE id = ?", ((float(i), task_id) for i, task_id in enumerate(ids)))
+
+    @staticmethod
+    def _latest_change(connection):
+        return connection.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def _changes_since(self, connection):
+        """
+        Devolve (registos gravados por outros processos desde a última leitura, número da última alteração).
+        """
+        rows = connection.execute("SELECT seq, record FROM changes WHERE seq > ? ORDER BY seq", (self._last_change,)).fetchall()
+        if rows and rows[0][0] != self._last_change + 1:
+            # As alterações por ler já foram apagadas da tabela
+            self.needs_reload = True
+            return [], rows[-1][0]
+        return [json.loads(row[1]) for row in rows], rows[-1][0] if rows else self._last_change
+
+    def _read_changes(self):
+        if self.needs_reload:
+            return []
+        records, self._last_change = self._changes_since(self._connect())
+        return records
+
+    def _write_records(self, records):
+        connection = self._connect()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")  # Bloqueia a escrita até gravar, para ler e escrever pela mesma ordem
+            foreign, last_change = self._changes_since(connection)
+            for record in records:
+                self._write_record(connection, record)
+            connection.executemany("INSERT INTO changes (record) VALUES (?)",
+                                   ((json.dumps(record, separators=(",", ":")),) for record in records))
+            last_change = self._latest_change(connection)
+            connection.execute("DELETE FROM changes WHERE seq <= ?", (last_change - self.CHANGES_KEPT,))
+        self._last_change = last_change
+        return foreign
+
+    def _write_record(self, connection, record):
+        op = record["op"]
+        if op == "add":
+            task = Task.from_dict(record["task"])
+            existing = connection.execute("SELECT column_name FROM tasks WHERE id = ?", (task.id,)).fetchone()
+            if existing is not None and existing[0] == record["column"]:
+                self._update_fields(connection, task)  # Tarefa já existente (importada de novo): só muda os campos
+                return
+            if task.status_since is None:
+                task.status_since = date.today()
+            position = self._position(connection, record["column"], record.get("before"))
+            connection.execute(f"INSERT OR REPLACE INTO tasks ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                               self._row(task, record["column"], position))
+        elif op == "move":
+            position = self._position(connection, record["to"], record.get("before"))
+            connection.execute("UPDATE tasks SET column_name = ?, position = ?, status_since = COALESCE(?, status_since) WHERE id = ?",
+                               (record["to"], position, record.get("since"), record["id"]))
+        elif op == "update":
+            self._update_fields(connection, Task.from_dict(record["task"]), record["id"])
+        elif op == "remove":
+            connection.execute("DELETE FROM tasks WHERE id = ?", (record["id"],))
+        elif op == "batch":
+            for sub_record in record["records"]:
+                self._write_record(connection, sub_record)
+
+    def _update_fields(self, connection, task, task_id=None):
+        row = self._row(task, None, None)
+        connection.execute("UPDATE tasks SET title = ?, description = ?, priority = ?, deadline = ?, deadline_date = ? WHERE id = ?",
+                           row[3:8] + (task_id or task.id,))
+
+    def _close_backend(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+# Adiciona uma função para gravar um snapshot JSON rapidamente
+def dump_snapshot(data: dict, file):
+    """
+    Grava o snapshot com uma tarefa por linha. Cada tarefa é serializada pelo codificador em C
+    do módulo json (o 'indent' obriga a usar a versão em Python, muito mais lenta).
+    """
+    file.write("{\n")
+    for i, (key, value) in enumerate(data.items()):
+        separator = ",\n" if i < len(data) - 1 else "\n"
+        if isinstance(value, list):
+            items = ",\n        ".join(json.dumps(item) for item in value)
+            file.write(f"    {json.dumps(key)}: [\n        {items}\n    ]{separator}" if value else f"    {json.dumps(key)}: []{separator}")
+        else:
+            file.write(f"    {json.dumps(key)}: {json.dumps(value)}{separator}")
+    file.write("}\n")
+
+# Adiciona uma função para ler um snapshot JSON de forma incremental
+def stream_snapshot(path: str, batch_size: int = 500, chunk_size: int = 1 << 16, file=None):
+    """
+    Lê um snapshot {"coluna": [tarefas...], ...} sem carregar o ficheiro inteiro para memória,
+    gerando (chave, [dicionários das tarefas], progresso) em lotes de 'batch_size'.
+    Para chaves cujo valor não é uma lista (metadados), gera (chave, valor, progresso).
+    Com 'file' (o snapshot já aberto), lê-o desde o início sem o fechar.
+    """
+    if file is None:
+        with open(path, "r") as file:
+            yield from stream_snapshot(path, batch_size, chunk_size, file)
+        return
+    decoder = json.JSONDecoder()
+    file.seek(0)
+    size = max(os.fstat(file.fileno()).st_size, 1)
+    state = {"buffer": "", "pos": 0, "read": 0, "eof": False}
+
+    def more():
+        chunk = file.read(chunk_size)
+        if not chunk:
+            state["eof"] = True
+            return False
+        state["read"] += len(chunk)
+        state["buffer"] = state["buffer"][state["pos"]:] + chunk
+        state["pos"] = 0
+        return True
+
+    def peek():
+        while True:
+            buffer, pos = state["buffer"], state["pos"]
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            state["pos"] = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not more():
+                return ""
+
+    def expect(char):
+        if peek() != char:
+            raise ValueError(f"JSON inválido: esperado '{char}' em {path}")
+        state["pos"] += 1
+
+    def value():
+        while True:
+            try:
+                result, end = decoder.raw_decode(state["buffer"], state["pos"])
+                # Um número no fim do buffer pode estar incompleto
+                if end < len(state["buffer"]) or state["eof"] or not isinstance(result, (int, float)):
+                    state["pos"] = end
+                    return result
+            except json.JSONDecodeError:
+                if state["eof"]:
+                    raise
+            more()
+
+    expect("{")
+    while True:
+        char = peek()
+        if char == "}" or not char:
+            return
+        if char == ",":
+            state["pos"] += 1
+            continue
+        key = value()
+        expect(":")
+        if peek() != "[":
+            yield key, value(), min(state["read"] / size, 1.0)
+            continue
+        state["pos"] += 1
+        batch = []
+        while True:
+            char = peek()
+            if char == "]":
+                state["pos"] += 1
+                break
+            if char == ",":
+                state["pos"] += 1
+                continue
+            batch.append(value())
+            if len(batch) >= batch_size:
+                yield key, batch, min(state["read"] / size, 1.0)
+                batch = []
+        yield key, batch, min(state["read"] / size, 1.0)
+
+class JournalOverlay:
+    """
+    Aplica os registos do journal a um snapshot lido em lotes, sem o carregar (ver BoardJournal.iter_tasks).
+
+    Só as tarefas referidas nos registos ficam em memória. As tarefas do snapshot que o journal não
+    altera mantêm a posição i da sua coluna; as alteradas recebem posições fracionárias entre elas,
+    calculadas como no Board (antes de 'before', ou no fim da coluna), e são intercaladas com as
+    restantes na segunda leitura do snapshot.
+    """
+    def __init__(self, records):
+        self.records = list(self._flatten(records))
+        self.ids = {record.get("id") or record["task"]["id"] for record in self.records}
+        self.anchors = {record["before"] for record in self.records if record.get("before")} - self.ids
+        self.fixed = {}      # id -> (coluna, posição) das tarefas de referência que o journal não altera
+        self.lengths = {}    # coluna -> número de tarefas no snapshot
+        self.vacated = {}    # coluna -> posições do snapshot ocupadas por tarefas alteradas
+        self.placed = {}     # id -> (coluna, posição) das tarefas alteradas que estão no quadro
+        self.data = {}       # id -> dicionário (Task.to_dict) das tarefas alteradas
+        self.ends = {}       # coluna -> última posição usada no fim da coluna
+
+    @staticmethod
+    def _flatten(records):
+        for record in records:
+            if record["op"] == "batch":
+                yield from JournalOverlay._flatten(record["records"])
+            else:
+                yield record
+
+    def read_snapshot(self, items):
+        """
+        Primeira leitura do snapshot: guarda a posição das tarefas referidas pelo journal.
+        """
+        for column_name, batch, _ in items:
+            if not isinstance(batch, list):
+                continue
+            index = self.lengths.get(column_name, 0)
+            for data in batch:
+                task_id = data.get("id")
+                if task_id in self.ids:
+                    self.placed[task_id] = (column_name, Fraction(index))
+                    self.data[task_id] = dict(data, Estado=column_name)
+                    self.vacated.setdefault(column_name, set()).add(index)
+                elif task_id in self.anchors:
+                    self.fixed[task_id] = (column_name, Fraction(index))
+                index += 1
+            self.lengths[column_name] = index
+
+    def _locate(self, task_id):
+        return self.placed.get(task_id) or self.fixed.get(task_id)
+
+    def _previous(self, column_name, position):
+        """
+        Maior posição ocupada na coluna antes de 'position' (-1 se não houver nenhuma).
+        """
+        best = Fraction(-1)
+        for other_column, other in self.placed.values():
+            if other_column == column_name and best < other < position:
+                best = other
+        vacated = self.vacated.get(column_name, ())
+        index = min(math.ceil(position) - 1, self.lengths.get(column_name, 0) - 1)
+        while index > best and index in vacated:
+            index -= 1
+        return max(best, Fraction(index))
+
+    def _insert(self, task_id, column_name, before):
+        target = self._locate(before) if before and before != task_id else None
+        if target is not None and target[0] == column_name:
+            position = (self._previous(column_name, target[1]) + target[1]) / 2
+        else:
+            end = self.ends.get(column_name, self.lengths.get(column_name, 0)) + 1
+            self.ends[column_name] = end
+            position = Fraction(end)
+        self.placed[task_id] = (column_name, position)
+        self.data[task_id]["Estado"] = column_name
+
+    def _move(self, task_id, column_name, before, since):
+        current_column, position = self.placed.pop(task_id)
+        if before == task_id and current_column == column_name:
+            self.placed[task_id] = (current_column, position)  # Fica no mesmo lugar (ver Board.move_task)
+            return
+        self._insert(task_id, column_name, before)
+        if current_column != column_name:
+            self.data[task_id]["Desde"] = since or date.today().isoformat()
+
+    def replay(self):
+        """
+        Aplica os registos pela ordem do journal, com as mesmas regras de BoardStorage.apply.
+        """
+        fields = ("Titulo", "Descrição", "Prioridade", "deadline")
+        for record in self.records:
+            op = record["op"]
+            if op == "add":
+                data = Task.from_dict(record["task"]).to_dict()
+                task_id = data["id"]
+                if task_id in self.placed:
+                    self.data[task_id].update({name: data[name] for name in fields})
+                    if self.placed[task_id][0] != record["column"]:
+                        self._move(task_id, record["column"], record.get("before"), data.get("Desde"))
+                else:
+                    self.data[task_id] = dict(data)
+                    self._insert(task_id, record["column"], record.get("before"))
+            elif record["id"] not in self.placed:
+                continue  # A tarefa já não existe (como no Board, o registo não tem efeito)
+            elif op == "move":
+                self._move(record["id"], record["to"], record.get("before"), record.get("since"))
+            elif op == "update":
+                data = Task.from_dict(record["task"]).to_dict()
+                self.data[record["id"]].update({name: data[name] for name in fields})
+            elif op == "remove":
+                del self.placed[record["id"]]
+
+    def _task(self, task_id):
+        task = Task.from_dict(self.data[task_id])
+        task.status = self.placed[task_id][0]
+        return task
+
+    def merge(self, items, columns):
+        """
+        Segunda leitura do snapshot: gera as tarefas das colunas indicadas pela ordem do quadro.
+        """
+        by_column = {column_name: [] for column_name in columns}
+        for task_id, (column_name, position) in self.placed.items():
+            if column_name in by_column:
+                by_column[column_name].append((position, task_id))
+        pending = {column_name: sorted(entries, reverse=True) for column_name, entries in by_column.items()}
+        index, current = 0, None
+        for column_name, batch, _ in items:
+            if column_name not in pending or not isinstance(batch, list):
+                continue
+            if column_name != current:
+                # As colunas anteriores já não têm mais tarefas do snapshot
+                for previous in columns[:columns.index(column_name)]:
+                    yield from self._drain(pending[previous])
+                index, current = 0, column_name
+            moved = pending[column_name]
+            for data in batch:
+                while moved and moved[-1][0] < index:
+                    yield self._task(moved.pop()[1])
+                index += 1
+                if data.get("id") in self.ids:
+                    continue
+                task = Task.from_dict(data)
+                task.status = column_name
+                yield task
+        for column_name in columns:
+            yield from self._drain(pending[column_name])
+
+    def _drain(self, moved):
+        while moved:
+            yield self._task(moved.pop()[1])
+
+# Adiciona uma função para escolher o motor de persistência pela extensão do ficheiro
+def open_storage(path: str) -> BoardStorage:
+    """
+    Devolve o armazenamento adequado ao ficheiro: SQLite para .db/.sqlite/.sqlite3, JSON nos restantes casos.
+    """
+    if os.path.splitext(path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteStorage(path)
+    return BoardJournal(path)
+
+# Adiciona uma função para migrar um quadro entre motores de persistência
+def migrate_board(source_path: str, target_path: str):
+    """
+    Copia o quadro de um ficheiro para outro (por exemplo, de JSON para SQLite ou vice-versa).
+    """
+    source = open_storage(source_path)
+    board = source.load()
+    source.close()
+    target = open_storage(target_path)
+    target.save_board(board)
+    target.close()
+    return board
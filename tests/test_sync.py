@@ -0,0 +1,111 @@
+"""
+Várias instâncias a editar o mesmo quadro ao mesmo tempo têm de ficar com o mesmo quadro.
+
+Cada processo faz alterações aleatórias (criar, mover antes de outra tarefa, editar e remover),
+grava-as em segundo plano e aplica as dos outros (ver BoardStorage.apply_remote). No fim, o quadro
+de cada processo, incluindo a ordem das tarefas em cada coluna, é comparado com o dos outros e com
+o quadro carregado de novo do ficheiro.
+"""
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from board import Board, Task
+from storage import BoardJournal, BoardStorage, open_storage
+
+PRIORITIES = ["Baixo", "Médio", "Alta"]
+PROCESSES = 3
+CHANGES = 120  # Alterações por processo
+
+def board_state(board):
+    """
+    Colunas do quadro, com as tarefas pela ordem em que aparecem.
+    """
+    return {column_name: [(task.id, task.title, task.priority, task.status_since) for task in column.tasks]
+            for column_name, column in board.columns.items()}
+
+def random_change(board, rng, name, step):
+    columns = list(board.columns)
+    ids = list(board.tasks)
+    before = rng.choice(ids) if ids and rng.random() < 0.6 else None
+    choice = rng.random()
+    if choice < 0.35 or not ids:
+        board.add_task(Task(f"{name}-{step}", "Descrição", rng.choice(PRIORITIES), None), rng.choice(columns[:2]), before)
+    elif choice < 0.65:
+        board.move_task(rng.choice(ids), rng.choice(columns), before)
+    elif choice < 0.75:
+        with board.batch():
+            for task_id in rng.sample(ids, min(3, len(ids))):
+                board.move_task(task_id, rng.choice(columns), before)
+    elif choice < 0.9:
+        board.update_task(rng.choice(ids), title=f"{name}-editada-{step}", priority=rng.choice(PRIORITIES))
+    else:
+        board.remove_task(rng.choice(ids))
+
+def worker(path, changes, seed, barrier, results):
+    rng = random.Random(seed)
+    storage = open_storage(path)
+    if isinstance(storage, BoardJournal):
+        storage.compact_every = 50  # Compactações frequentes, durante as alterações dos outros
+    try:
+        board = storage.load()
+    except FileNotFoundError:
+        board = Board()
+
+    def save(event):
+        storage.append(BoardStorage.record_for(event), BoardStorage.undo_record_for(event))
+        if storage.should_compact():
+            storage.compact(board)
+
+    board.subscribe(save)
+    storage.flush_interval = 0.01
+    storage.watch(0.02)
+    barrier.wait()
+    for step in range(changes):
+        random_change(board, rng, f"p{seed}", step)
+        if rng.random() < 0.3:
+            storage.apply_remote(board)
+        time.sleep(rng.random() * 0.004)
+    storage.flush()
+    barrier.wait()
+    # Espera que todos os processos gravem e leiam as alterações uns dos outros
+    for _ in range(5):
+        time.sleep(0.1)
+        storage.poll()
+        storage.apply_remote(board)
+        storage.flush()
+    barrier.wait()
+    time.sleep(0.2)
+    storage.poll()
+    storage.apply_remote(board)
+    results.put((seed, board_state(board), storage.needs_reload))
+    storage.close()
+
+@pytest.mark.parametrize("file_name", ["quadro.json", "quadro.db"])
+def test_instances_converge(tmp_path, file_name):
+    path = str(tmp_path / file_name)
+    barrier = multiprocessing.Barrier(PROCESSES)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=worker, args=(path, CHANGES, seed, barrier, results))
+                 for seed in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    states = [results.get(timeout=120) for _ in processes]
+    for process in processes:
+        process.join(timeout=30)
+
+    storage = open_storage(path)
+    expected = board_state(storage.load())
+    storage.close()
+    assert sum(len(column) for column in expected.values()) > 0
+    for seed, state, needs_reload in sorted(states):
+        if needs_reload:
+            continue  # O processo carregaria o quadro de novo: não há junção a comparar
+        for column_name in expected:
+            assert state[column_name] == expected[column_name], f"processo {seed}, coluna \"{column_name}\""
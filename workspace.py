@@ -0,0 +1,168 @@
+"""
+Espaço de trabalho com vários quadros Kanban, carregados a pedido.
+"""
+import os
+from collections import OrderedDict
+
+from board import Board
+from storage import open_storage
+
+BOARD_EXTENSIONS = (".json", ".db", ".sqlite", ".sqlite3")
+
+class BoardEntry:
+    """
+    Um quadro do espaço de trabalho: o ficheiro, o armazenamento aberto e o quadro (se estiver em memória).
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.storage = None
+        self.board = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.board is not None
+
+class Workspace:
+    """
+    Conjunto de quadros abertos pela aplicação.
+
+    Os quadros só são carregados quando são usados. Os que não estão ativos saem da memória
+    (o armazenamento é fechado, gravando o que estiver pendente, e as tarefas são libertadas)
+    quando há mais de 'max_loaded' quadros carregados ou mais de 'max_tasks' tarefas em memória,
+    começando pelo usado há mais tempo. Os prazos dos quadros que não estão em memória continuam
+    no índice partilhado do TaskAlert.
+    """
+    def __init__(self, paths, max_loaded: int = 3, max_tasks: int = None, alerts=None):
+        self.entries = OrderedDict()  # nome -> BoardEntry, do usado há mais tempo para o mais recente
+        for path in paths:
+            self.add(path)
+        self.max_loaded = max_loaded
+        self.max_tasks = max_tasks
+        self.alerts = alerts
+        self.active = next(iter(self.entries), None)
+
+    # Adiciona um novo método para criar o espaço de trabalho a partir de uma pasta
+    @classmethod
+    def from_directory(cls, directory: str, **options):
+        """
+        Abre todos os quadros (.json, .db, .sqlite) da pasta.
+        """
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                       if os.path.splitext(name)[1].lower() in BOARD_EXTENSIONS)
+        return cls(paths, **options)
+
+    def add(self, path: str) -> BoardEntry:
+        entry = BoardEntry(path)
+        if entry.name in self.entries:
+            raise ValueError(f"Já existe um quadro com o nome '{entry.name}' no espaço de trabalho.")
+        self.entries[entry.name] = entry
+        return entry
+
+    def names(self):
+        return sorted(self.entries)
+
+    def storage(self, name: str):
+        """
+        Devolve o armazenamento do quadro, abrindo-o se necessário.
+        """
+        entry = self.entries[name]
+        if entry.storage is None:
+            entry.storage = open_storage(entry.path)
+        return entry.storage
+
+    # Adiciona um novo método para escolher o quadro ativo
+    def activate(self, name: str):
+        """
+        Marca o quadro como ativo (o mais recente). Devolve o quadro se já estiver em memória, senão None.
+        """
+        self.active = name
+        self.entries.move_to_end(name)
+        return self.entries[name].board
+
+    # Adiciona um novo método para carregar um quadro de forma síncrona (sem interface gráfica)
+    def load(self, name: str):
+        board = self.activate(name)
+        if board is None:
+            try:
+                board = self.storage(name).load()
+            except FileNotFoundError:
+                board = Board()
+            self.attach(name, board)
+        return board
+
+    # Adiciona um novo método para registar um quadro carregado
+    def attach(self, name: str, board):
+        """
+        Regista o quadro carregado (por exemplo, aos poucos pela interface) e liberta os que excedem o limite.
+        """
+        entry = self.entries[name]
+        entry.board = board
+        self.entries.move_to_end(name)
+        if self.alerts is not None:
+            self.alerts.add_board(name, board)
+        self.evict()
+
+    def loaded_tasks(self) -> int:
+        return sum(len(entry.board.tasks) for entry in self.entries.values() if entry.loaded)
+
+    # Adiciona um novo método para libertar os quadros usados há mais tempo
+    def evict(self):
+        """
+        Liberta quadros (do usado há mais tempo para o mais recente, nunca o ativo) até cumprir os limites.
+        Devolve os nomes dos quadros libertados.
+        """
+        evicted = []
+        for name, entry in list(self.entries.items()):
+            loaded = [current for current in self.entries.values() if current.loaded]
+            over_boards = len(loaded) > self.max_loaded
+            over_tasks = self.max_tasks is not None and self.loaded_tasks() > self.max_tasks
+            if not (over_boards or over_tasks):
+                break
+            if entry.loaded and name != self.active:
+                self.release(name)
+                evicted.append(name)
+        return evicted
+
+    def release(self, name: str):
+        """
+        Tira o quadro da memória: grava o que estiver pendente e fecha o armazenamento.
+        Os prazos das suas tarefas continuam a ser vigiados.
+        """
+        entry = self.entries[name]
+        if entry.storage is not None:
+            entry.storage.close()
+            entry.storage = None
+        if self.alerts is not None:
+            self.alerts.detach_board(name)
+        entry.board = None
+        print(f"💤 Quadro '{name}' libertado da memória.")
+
+    # Adiciona um novo método para recolher os prazos dos quadros que não estão carregados
+    def scan_deadlines(self):
+        """
+        Lê os prazos dos quadros que não estão em memória e indexa-os no TaskAlert.
+        Pode correr numa thread separada: cada quadro é lido por um armazenamento próprio, só de leitura.
+        """
+        if self.alerts is None:
+            return
+        for name, entry in list(self.entries.items()):
+            if entry.loaded or name == self.active:
+                continue  # O quadro ativo é carregado (e indexado) pela aplicação
+            storage = open_storage(entry.path)
+            try:
+                self.alerts.index_tasks(name, storage.deadline_tasks())
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"⚠️ Não foi possível ler os prazos do quadro '{name}': {e}")
+            finally:
+                storage.close()
+
+    def close(self):
+        """
+        Grava as alterações pendentes de todos os quadros.
+        """
+        for entry in self.entries.values():
+            if entry.storage is not None:
+                entry.storage.close()